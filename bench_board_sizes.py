@@ -0,0 +1,59 @@
+# ==========================================
+# BENCHMARK UKURAN PAPAN (9x9, 16x16, 25x25)
+# Mengukur waktu generate dan solve solver bitmask N x N per ukuran kotak.
+# Contoh: python bench_board_sizes.py --boxes 3 4 5 --puzzles 5
+# ==========================================
+import argparse
+import random
+import time
+
+from sudoku_csp import generate_puzzle_n, solve_grid_n
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))
+    return values[k]
+
+def bench_box(box, puzzles, fill, deadline, seed):
+    rng = random.Random(seed)
+    size = box ** 4
+    gen_times, solve_times, removed = [], [], []
+    for _ in range(puzzles):
+        puzzle, solved, stats = generate_puzzle_n(box, removals=int(size * fill), deadline=deadline, rng=rng)
+        gen_times.append(stats['elapsed'])
+        removed.append(stats['removed'])
+        t0 = time.perf_counter()
+        sol = solve_grid_n(puzzle, box)
+        solve_times.append(time.perf_counter() - t0)
+        if sol != solved:
+            raise RuntimeError(f"solver returned a wrong solution for box={box}")
+    return {
+        'box': box,
+        'n': box * box,
+        'puzzles': puzzles,
+        'removed_avg': sum(removed) / len(removed),
+        'gen_p50': percentile(gen_times, 50),
+        'gen_max': max(gen_times),
+        'solve_p50': percentile(solve_times, 50),
+        'solve_max': max(solve_times),
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark generate/solve per ukuran papan")
+    ap.add_argument("--boxes", type=int, nargs="+", default=[3, 4, 5])
+    ap.add_argument("--puzzles", type=int, default=5)
+    ap.add_argument("--fill", type=float, default=0.5, help="fraksi sel yang dihapus")
+    ap.add_argument("--deadline", type=float, default=10.0)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'size':>7} {'removed':>8} {'gen p50':>9} {'gen max':>9} {'solve p50':>10} {'solve max':>10}")
+    for box in args.boxes:
+        r = bench_box(box, args.puzzles, args.fill, args.deadline, args.seed)
+        print(f"{r['n']:>3}x{r['n']:<3} {r['removed_avg']:>8.1f} {r['gen_p50']:>8.3f}s {r['gen_max']:>8.3f}s "
+              f"{r['solve_p50'] * 1000:>8.2f}ms {r['solve_max'] * 1000:>8.2f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# ==========================================
+# BENCHMARK LATENCY GENERATOR PER DIFFICULTY
+# Mengukur waktu generate puzzle seperti di start_game (Easy/Medium/Hard =
+# 30/45/55 removals; generator "id" = jalur puzzle_from_id): p50/p95/max,
+# pembagian waktu isi board penuh vs loop hapus + count_solutions, dan
+# removal yang tercapai dibanding target.
+# Contoh: python bench_generator.py --puzzles 50 --write-baseline gen_baseline.json
+#         python bench_generator.py --baseline gen_baseline.json
+#         python bench_generator.py --generator legacy --puzzles 10
+#         python bench_generator.py --generator legacy --tt
+# ==========================================
+import argparse
+import json
+import random
+import sys
+import time
+
+from sudoku_csp import generate_board, generate_puzzle, TranspositionTable, PUZZLE_ID_ATTEMPTS
+from bench_board_sizes import percentile
+
+DIFFICULTIES = {'Easy': 30, 'Medium': 45, 'Hard': 55}
+BASELINE_VERSION = 1
+
+def gen_board(removals, rng, deadline, tt=None):
+    _, _, stats = generate_board(removals, deadline=deadline, rng=rng)
+    return stats
+
+def gen_legacy(removals, rng, deadline, tt=None):
+    # generate_puzzle tanpa deadline; tt dipakai count_solutions saat uji unik
+    stats = {}
+    generate_puzzle(removals, stats=stats, rng=rng, tt=tt)
+    return stats
+
+def gen_id(removals, rng, deadline, tt=None):
+    # Jalur game (puzzle_from_id): batas percobaan, bukan deadline
+    _, _, stats = generate_board(removals, rng=random.Random(rng.getrandbits(40)), max_attempts=PUZZLE_ID_ATTEMPTS)
+    return stats
+
+GENERATORS = {'id': gen_id, 'board': gen_board, 'legacy': gen_legacy}
+
+def bench_difficulty(gen, removals, puzzles, seed, deadline, tt=None):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(puzzles):
+        t0 = time.perf_counter()
+        stats = gen(removals, rng, deadline, tt)
+        stats['wall'] = time.perf_counter() - t0
+        rows.append(stats)
+    walls = [s['wall'] for s in rows]
+    fill = sum(s['fill_time'] for s in rows)
+    removal = sum(s['removal_time'] for s in rows)
+    return {
+        'removals': removals,
+        'puzzles': puzzles,
+        'p50_ms': percentile(walls, 50) * 1000,
+        'p95_ms': percentile(walls, 95) * 1000,
+        'max_ms': max(walls) * 1000,
+        'fill_ms_avg': fill / puzzles * 1000,
+        'removal_ms_avg': removal / puzzles * 1000,
+        'fill_share': fill / (fill + removal) if fill + removal else 0.0,
+        'removed_avg': sum(s['removed'] for s in rows) / puzzles,
+        'target_hit_rate': sum(s['removed'] >= removals for s in rows) / puzzles,
+        'attempts_avg': sum(s['attempts'] for s in rows) / puzzles,
+        'timed_out': sum(bool(s['timed_out']) for s in rows),
+    }
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    # Regresi: p95 naik melebihi toleransi (dan minimal min_delta_ms, supaya
+    # noise di puzzle yang cuma belasan ms tidak dianggap regresi), atau
+    # removal rata-rata turun
+    problems = []
+    for name, cur in results['results'].items():
+        old = baseline.get('results', {}).get(name)
+        if old is None:
+            continue
+        if cur['p95_ms'] > max(old['p95_ms'] * (1 + tolerance), old['p95_ms'] + min_delta_ms):
+            problems.append(f"{name}: p95 {old['p95_ms']:.1f}ms -> {cur['p95_ms']:.1f}ms")
+        if cur['removed_avg'] < old['removed_avg'] - 0.5:
+            problems.append(f"{name}: removed {old['removed_avg']:.1f} -> {cur['removed_avg']:.1f}")
+    return problems
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark latency generate puzzle per difficulty")
+    ap.add_argument("--generator", default="id", choices=list(GENERATORS))
+    ap.add_argument("--difficulties", nargs="+", default=list(DIFFICULTIES), choices=list(DIFFICULTIES))
+    ap.add_argument("--puzzles", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--deadline", type=float, default=3.0, help="deadline untuk generator board")
+    ap.add_argument("--tt", action="store_true", help="pakai transposition table (generator legacy) dan cetak statistiknya")
+    ap.add_argument("--write-baseline", help="simpan hasil ke file baseline JSON")
+    ap.add_argument("--baseline", help="bandingkan dengan file baseline JSON")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="toleransi kenaikan latency p95")
+    ap.add_argument("--min-delta-ms", type=float, default=10.0, help="kenaikan p95 absolut minimum untuk regresi")
+    args = ap.parse_args()
+    if args.tt and args.generator != 'legacy':
+        ap.error("--tt only applies to --generator legacy")
+
+    results = {
+        'version': BASELINE_VERSION,
+        'generator': args.generator,
+        'seed': args.seed,
+        'deadline': args.deadline,
+        'tt': args.tt,
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'results': {},
+    }
+    gen = GENERATORS[args.generator]
+    print(f"{'difficulty':<10} {'target':>6} {'removed':>8} {'hit':>5} {'p50':>9} {'p95':>9} {'max':>9} {'fill':>8} {'removal':>9}")
+    for name in args.difficulties:
+        removals = DIFFICULTIES[name]
+        tt = TranspositionTable() if args.tt else None
+        r = bench_difficulty(gen, removals, args.puzzles, args.seed, args.deadline, tt)
+        results['results'][name] = r
+        print(f"{name:<10} {removals:>6} {r['removed_avg']:>8.1f} {r['target_hit_rate']:>5.0%} "
+              f"{r['p50_ms']:>7.1f}ms {r['p95_ms']:>7.1f}ms {r['max_ms']:>7.1f}ms "
+              f"{r['fill_ms_avg']:>6.2f}ms {r['removal_ms_avg']:>7.1f}ms")
+        if tt is not None:
+            print("  " + tt.report())
+
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.write_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('generator') != args.generator:
+            print(f"Warning: baseline was recorded with generator '{baseline.get('generator')}'")
+        problems = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if problems:
+            print("REGRESSION:")
+            for p in problems:
+                print("  " + p)
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# ==========================================
+# LOAD TEST SERVICE SOLVER (sudoku_server.py)
+# Beberapa koneksi paralel, masing-masing mengirim request secara pipelined
+# (maks --window request belum dijawab per koneksi). Melaporkan throughput,
+# latency p50/p95/p99/max dan jumlah respons per status (ok, busy,
+# deadline_exceeded, ...).
+# Contoh: python bench_server.py --spawn --workers 2 --op solve --requests 2000
+#         python bench_server.py --address unix:/tmp/sudoku.sock --op mix --connections 16
+#         python bench_server.py --address 127.0.0.1:8765 --op generate --requests 20
+# ==========================================
+import argparse
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from sudoku_csp import Board, solve_board
+from bench_solver import load_corpus
+from bench_board_sizes import percentile
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sudoku_server.py")
+MIX = ('solve', 'solve', 'count', 'validate', 'validate')
+
+def make_requests(op, puzzles):
+    # Generator request tanpa akhir (tanpa id, diisi saat kirim)
+    solutions = [solve_board(p).to_string() for p in puzzles] if op in ('validate', 'mix') else None
+    ops = itertools.cycle(MIX) if op == 'mix' else itertools.repeat(op)
+    difficulties = itertools.cycle(("Easy", "Medium", "Hard"))
+    for i in itertools.count():
+        name = next(ops)
+        k = i % len(puzzles)
+        if name == 'generate':
+            yield {'op': 'generate', 'difficulty': next(difficulties)}
+        elif name == 'validate':
+            yield {'op': 'validate', 'grid': solutions[k], 'puzzle': puzzles[k].to_string(),
+                   'hints': 1, 'mistakes': 2, 'elapsed': 300}
+        else:
+            yield {'op': name, 'puzzle': puzzles[k].to_string()}
+
+def connect(address):
+    if address.startswith("unix:"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address[5:])
+    else:
+        host, _, port = address.rpartition(":")
+        sock = socket.create_connection((host or "127.0.0.1", int(port)))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+def run_connection(address, requests, lock, total, window, deadline_ms, latencies, statuses):
+    # requests dibagi antar koneksi lewat lock; total[0] = sisa request
+    sock = connect(address)
+    reader = sock.makefile("rb")
+    sent = {}
+    next_id = itertools.count()
+    try:
+        while True:
+            lines = []
+            while len(sent) + len(lines) < window:
+                with lock:
+                    if total[0] == 0:
+                        break
+                    total[0] -= 1
+                    msg = dict(next(requests))
+                msg['id'] = next(next_id)
+                if deadline_ms is not None:
+                    msg['deadline_ms'] = deadline_ms
+                lines.append(json.dumps(msg).encode() + b"\n")
+                sent[msg['id']] = (msg['op'], time.perf_counter())
+            if lines:
+                sock.sendall(b"".join(lines))
+            if not sent:
+                return
+            line = reader.readline()
+            if not line:
+                raise ConnectionError("server closed the connection")
+            resp = json.loads(line)
+            op, t0 = sent.pop(resp['id'])
+            status = 'ok' if resp.get('ok') else resp.get('error', '?')
+            with lock:
+                latencies.setdefault(op, []).append(time.perf_counter() - t0)
+                statuses[(op, status)] += 1
+    finally:
+        reader.close()
+        sock.close()
+
+def wait_for_server(address, proc, timeout=30.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited during start-up")
+        try:
+            connect(address).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("server did not start in time")
+
+def main():
+    ap = argparse.ArgumentParser(description="Load test untuk sudoku_server.py")
+    ap.add_argument("--address", help="unix:/path atau host:port")
+    ap.add_argument("--spawn", action="store_true", help="jalankan server sendiri di Unix socket sementara")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker server untuk --spawn")
+    ap.add_argument("--op", default="solve", choices=['solve', 'count', 'validate', 'generate', 'mix'])
+    ap.add_argument("--corpus", default="easy")
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--connections", type=int, default=8)
+    ap.add_argument("--window", type=int, default=16, help="request belum dijawab maksimum per koneksi")
+    ap.add_argument("--deadline-ms", type=float)
+    ap.add_argument("--out", help="simpan hasil sebagai JSON")
+    args = ap.parse_args()
+    if not args.address and not args.spawn:
+        ap.error("either --address or --spawn is required")
+
+    proc = None
+    address = args.address
+    if args.spawn:
+        path = os.path.join(tempfile.mkdtemp(), "sudoku.sock")
+        address = "unix:" + path
+        proc = subprocess.Popen([sys.executable, SERVER_SCRIPT, "--socket", path, "--workers", str(args.workers)])
+        wait_for_server(address, proc)
+
+    try:
+        requests = make_requests(args.op, [Board.from_grid(g) for g in load_corpus(args.corpus)])
+        lock = threading.Lock()
+        total = [args.requests]
+        latencies = {}
+        statuses = Counter()
+        errors = []
+        def worker():
+            try:
+                run_connection(address, requests, lock, total, args.window, args.deadline_ms, latencies, statuses)
+            except (OSError, ConnectionError) as e:
+                errors.append(str(e))
+        threads = [threading.Thread(target=worker) for _ in range(args.connections)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(30)
+
+    done = sum(statuses.values())
+    all_lat = [v for lat in latencies.values() for v in lat]
+    ms = lambda v: v * 1000
+    summary = {
+        'op': args.op,
+        'requests': done,
+        'connections': args.connections,
+        'window': args.window,
+        'wall_s': wall,
+        'throughput_rps': done / wall if wall else 0.0,
+        'statuses': {f"{op}:{status}": n for (op, status), n in sorted(statuses.items())},
+        'client_errors': errors,
+        'latency': {op: {'p50_ms': ms(percentile(lat, 50)), 'p95_ms': ms(percentile(lat, 95)),
+                         'p99_ms': ms(percentile(lat, 99)), 'max_ms': ms(max(lat))}
+                    for op, lat in sorted(latencies.items())},
+    }
+    if all_lat:
+        summary['latency']['all'] = {'p50_ms': ms(percentile(all_lat, 50)), 'p95_ms': ms(percentile(all_lat, 95)),
+                                     'p99_ms': ms(percentile(all_lat, 99)), 'max_ms': ms(max(all_lat))}
+
+    print(f"{done} responses in {wall:.2f}s -> {summary['throughput_rps']:.1f} req/s "
+          f"({args.connections} connections x window {args.window})")
+    print(f"\n{'op':<10} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for op, r in summary['latency'].items():
+        print(f"{op:<10} {r['p50_ms']:>7.2f}ms {r['p95_ms']:>7.2f}ms {r['p99_ms']:>7.2f}ms {r['max_ms']:>7.2f}ms")
+    print("\nstatus:")
+    for k, n in summary['statuses'].items():
+        print(f"  {k:<28} {n}")
+    for e in errors:
+        print(f"client error: {e}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nResults written to {args.out}")
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ==========================================
+# BENCHMARK BATCH SOLVE: SHARED MEMORY VS POOL PICKLE
+# Puzzle dari korpus diulang sampai --puzzles papan, lalu dipecahkan
+# dengan ShmBatchSolver dan dengan pool.map biasa (grid list bersarang
+# di-pickle). Keduanya memakai solve_board dan jumlah worker yang sama, jadi
+# selisihnya adalah biaya kirim data. Melaporkan puzzle/detik (waktu terbaik
+# dari --repeat) dan byte yang di-pickle lewat batas proses.
+# Contoh: python bench_shm.py --puzzles 20000 --workers 4
+#         python bench_shm.py --corpus hard --puzzles 2000
+# ==========================================
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import time
+
+from sudoku_csp import Board
+from sudoku_shm import ShmBatchSolver, solve_batch_pickle, split_ranges, SHM_SOLVED
+from bench_solver import load_corpus
+
+def bench(fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, result
+
+def main():
+    ap = argparse.ArgumentParser(description="Shared memory vs pickle untuk batch solve multi-proses")
+    ap.add_argument("--corpus", default="easy")
+    ap.add_argument("--puzzles", type=int, default=10000)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", help="simpan hasil sebagai JSON")
+    args = ap.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    grids = [corpus[i % len(corpus)] for i in range(args.puzzles)]
+    boards = [Board.from_grid(g) for g in grids]
+    n = len(grids)
+
+    with ShmBatchSolver(args.workers) as solver:
+        solver.solve(boards[:1])  # buffer & worker siap sebelum diukur
+        shm_time, (shm_solutions, status) = bench(lambda: solver.solve(boards), args.repeat)
+    with multiprocessing.Pool(args.workers) as pool:
+        pool.map(abs, range(args.workers))  # worker siap sebelum diukur
+        pickle_time, pickle_solutions = bench(lambda: solve_batch_pickle(pool, grids, args.workers), args.repeat)
+
+    if [s.to_grid() if s else None for s in shm_solutions] != pickle_solutions:
+        raise SystemExit("shared-memory and pickle results differ")
+
+    # Perkiraan byte lewat pipe: argumen task + hasil, dalam format pickle
+    shm_bytes = sum(len(pickle.dumps(("psm_xxxxxxxx", n, s, e))) + len(pickle.dumps(e - s))
+                    for s, e in split_ranges(n, args.workers))
+    pickle_bytes = len(pickle.dumps(grids)) + len(pickle.dumps(pickle_solutions))
+
+    results = {
+        'corpus': args.corpus,
+        'puzzles': n,
+        'workers': args.workers,
+        'solved': sum(v == SHM_SOLVED for v in status),
+        'shm': {'seconds': shm_time, 'puzzles_per_s': n / shm_time, 'pickled_bytes': shm_bytes},
+        'pickle': {'seconds': pickle_time, 'puzzles_per_s': n / pickle_time, 'pickled_bytes': pickle_bytes},
+        'speedup': pickle_time / shm_time,
+    }
+    print(f"{n} puzzles ({args.corpus}), {args.workers} workers, best of {args.repeat}")
+    print(f"{'mode':<8} {'time':>9} {'puzzles/s':>11} {'pickled':>12}")
+    for mode in ('pickle', 'shm'):
+        r = results[mode]
+        print(f"{mode:<8} {r['seconds']:>8.3f}s {r['puzzles_per_s']:>11.0f} {r['pickled_bytes']:>10} B")
+    print(f"speedup: {results['speedup']:.2f}x")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# ==========================================
+# BENCHMARK SOLVER ATAS KORPUS PUZZLE (corpora/*.txt)
+# Menjalankan solve_grid dan count_solutions per korpus, lalu melaporkan
+# puzzle/detik, latency p50/p95/p99, node per puzzle dan memori puncak.
+# Hasil disimpan sebagai JSON; dengan --baseline run gagal (exit 1) kalau regresi.
+# Contoh: python bench_solver.py --out hasil.json
+#         python bench_solver.py --corpora easy hard minimal17 hardest
+#         python bench_solver.py --baseline hasil.json
+#         python bench_solver.py --ops solve solve-backjump
+#         python bench_solver.py --ops count count-alldiff-check count-alldiff-gac
+# ==========================================
+import argparse
+import functools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from sudoku_csp import Board, solve_grid, count_solutions
+from bench_board_sizes import percentile
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpora")
+CORPORA = ["easy", "hard", "minimal17", "hardest"]
+# minimal17 & hardest butuh beberapa menit dengan solver default, jadi opt-in
+DEFAULT_CORPORA = ["easy", "hard"]
+RESULTS_VERSION = 1
+
+def load_corpus(name):
+    # Satu puzzle per baris (81 karakter, '.' atau '0' = kosong), '#' = komentar
+    path = os.path.join(CORPUS_DIR, name + ".txt")
+    with open(path) as f:
+        lines = [line.strip() for line in f]
+    return [Board.from_string(line).to_grid() for line in lines if line and not line.startswith("#")]
+
+def run_solve(grid, **opts):
+    stats = {}
+    if solve_grid(grid, stats=stats, **opts) is None:
+        raise RuntimeError("solver found no solution for a corpus puzzle")
+    return stats['nodes']
+
+def run_count(grid, **opts):
+    stats = {}
+    if count_solutions(grid, max_count=2, stats=stats, **opts) != 1:
+        raise RuntimeError("corpus puzzle does not have a unique solution")
+    return stats['nodes']
+
+# Mode solver lain dibandingkan di korpus yang sama; default tetap solve/count
+OPS = {
+    'solve': run_solve,
+    'count': run_count,
+    'solve-backjump': functools.partial(run_solve, backjump=True),
+    'solve-alldiff-check': functools.partial(run_solve, alldiff='check'),
+    'solve-alldiff-gac': functools.partial(run_solve, alldiff='gac'),
+    'count-alldiff-check': functools.partial(run_count, alldiff='check'),
+    'count-alldiff-gac': functools.partial(run_count, alldiff='gac'),
+}
+DEFAULT_OPS = ['solve', 'count']
+
+def bench_op(fn, puzzles, mem_puzzles, repeat=1):
+    # Waktu per puzzle = minimum dari `repeat` kali jalan (kurangi noise)
+    times, nodes = [], []
+    for grid in puzzles:
+        best = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            n = fn(grid)
+            dt = time.perf_counter() - t0
+            best = dt if best is None else min(best, dt)
+        nodes.append(n)
+        times.append(best)
+    # Memori diukur di putaran terpisah: tracemalloc memperlambat eksekusi
+    peak = 0
+    for grid in puzzles[:mem_puzzles]:
+        tracemalloc.start()
+        fn(grid)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    total = sum(times)
+    return {
+        'puzzles': len(puzzles),
+        'total_s': total,
+        'puzzles_per_s': len(puzzles) / total if total else 0.0,
+        'p50_ms': percentile(times, 50) * 1000,
+        'p95_ms': percentile(times, 95) * 1000,
+        'p99_ms': percentile(times, 99) * 1000,
+        'max_ms': max(times) * 1000,
+        'nodes_avg': sum(nodes) / len(nodes),
+        'nodes_max': max(nodes),
+        'peak_mem_kb': peak / 1024,
+    }
+
+def compare(results, baseline, tolerance, node_tolerance):
+    # Daftar pesan regresi: latency p95 atau rata-rata node naik melebihi toleransi
+    problems = []
+    for key, cur in results['results'].items():
+        old = baseline.get('results', {}).get(key)
+        if old is None:
+            continue
+        if cur['p95_ms'] > old['p95_ms'] * (1 + tolerance):
+            problems.append(f"{key}: p95 {old['p95_ms']:.2f}ms -> {cur['p95_ms']:.2f}ms")
+        if cur['nodes_avg'] > old['nodes_avg'] * (1 + node_tolerance):
+            problems.append(f"{key}: nodes/puzzle {old['nodes_avg']:.1f} -> {cur['nodes_avg']:.1f}")
+    return problems
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark solve_grid/count_solutions atas korpus puzzle")
+    ap.add_argument("--corpora", nargs="+", default=DEFAULT_CORPORA, choices=CORPORA)
+    ap.add_argument("--ops", nargs="+", default=DEFAULT_OPS, choices=list(OPS))
+    ap.add_argument("--repeat", type=int, default=3, help="jalankan tiap puzzle n kali, ambil waktu minimum")
+    ap.add_argument("--mem-puzzles", type=int, default=3, help="jumlah puzzle per korpus untuk ukur memori")
+    ap.add_argument("--out", default="bench_solver_results.json")
+    ap.add_argument("--baseline", help="JSON hasil run sebelumnya untuk dibandingkan")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="toleransi kenaikan latency p95")
+    ap.add_argument("--node-tolerance", type=float, default=0.05, help="toleransi kenaikan node per puzzle")
+    args = ap.parse_args()
+
+    results = {
+        'version': RESULTS_VERSION,
+        'repeat': args.repeat,
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': {},
+    }
+    print(f"{'corpus/op':<26} {'n':>4} {'puz/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'nodes':>9} {'mem':>9}")
+    for name in args.corpora:
+        puzzles = load_corpus(name)
+        for op in args.ops:
+            r = bench_op(OPS[op], puzzles, args.mem_puzzles, args.repeat)
+            key = f"{name}/{op}"
+            results['results'][key] = r
+            print(f"{key:<26} {r['puzzles']:>4} {r['puzzles_per_s']:>9.1f} {r['p50_ms']:>7.2f}ms "
+                  f"{r['p95_ms']:>7.2f}ms {r['p99_ms']:>7.2f}ms {r['nodes_avg']:>9.1f} {r['peak_mem_kb']:>7.0f}KB")
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.tolerance, args.node_tolerance)
+        if problems:
+            print("REGRESSION:")
+            for p in problems:
+                print("  " + p)
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
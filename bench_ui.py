@@ -0,0 +1,182 @@
+# ==========================================
+# BENCHMARK FRAME TIME UI (HEADLESS)
+# Menjalankan jafar.py dengan driver video SDL "dummy" dan skenario event
+# yang di-script (klik menu, pilih sel, isi angka, salah, hint, undo, clear,
+# solve, back, selesaikan papan). Event lewat handle_event/draw_frame yang
+# sama dengan main(). Melaporkan persentil waktu frame dan waktu per fungsi draw.
+# Contoh: python bench_ui.py --rounds 3 --out ui_frames.json
+# ==========================================
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SUDOKU_LOG_LEVEL", "WARNING")
+
+import argparse
+import json
+import random
+import tempfile
+import time
+
+import pygame
+
+import jafar
+
+from bench_board_sizes import percentile
+
+# Fungsi yang diukur (waktu inklusif: draw_board sudah termasuk tombolnya)
+TIMED_FUNCS = ["draw_menu", "draw_board", "draw_interactive_button", "flash_wrong_cell",
+               "start_game", "solve_action", "provide_hint", "clear_action"]
+
+cursor = [(0, 0)]
+delayed_ms = [0]
+
+def install_hooks(func_stats):
+    # Mouse palsu (dummy driver tidak punya kursor) dan delay() tanpa tidur:
+    # delay di flash_wrong_cell / check_auto_restart dicatat, bukan ditunggu.
+    pygame.mouse.get_pos = lambda: cursor[0]
+    def fake_delay(ms):
+        delayed_ms[0] += ms
+    pygame.time.delay = fake_delay
+    for name in TIMED_FUNCS:
+        fn = getattr(jafar, name)
+        func_stats[name] = {'calls': 0, 'total_s': 0.0}
+        def timed(*args, _fn=fn, _st=func_stats[name], **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return _fn(*args, **kwargs)
+            finally:
+                _st['calls'] += 1
+                _st['total_s'] += time.perf_counter() - t0
+        setattr(jafar, name, timed)
+
+# --- Koordinat layar (sama dengan layout di jafar.py) ---
+def cell_pos(r, c):
+    return (jafar.MARGIN_LEFT + c * jafar.CELL + jafar.CELL // 2,
+            jafar.MARGIN_TOP + r * jafar.CELL + jafar.CELL // 2)
+
+def menu_button_pos(index):
+    return (jafar.WINDOW_W // 2, 350 + index * 85 + 32)
+
+def sidebar_button_pos(action):
+    x = jafar.SIDEBAR_X
+    btn_start_y = jafar.MARGIN_TOP - 20 + 100 + 150 + 30 + 70 + 50
+    row2_y = btn_start_y + 50 + 20
+    return {
+        'Solve': (x + 70, btn_start_y + 25),
+        'Hint': (x + 160 + 70, btn_start_y + 25),
+        'Clear': (x + 150, row2_y + 25),
+        'Back': (x + 150, row2_y + 50 + 30 + 27),
+    }[action]
+
+def click(pos):
+    return [pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)),
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)]
+
+def key(k, unicode="", mod=0):
+    return [pygame.event.Event(pygame.KEYDOWN, key=k, unicode=unicode, mod=mod)]
+
+def digit(v):
+    return key(getattr(pygame, f"K_{v}"), str(v))
+
+# --- Skenario ---
+# Generator: setiap yield = (label, event untuk frame itu). Dibaca lazy supaya
+# langkah berikutnya bisa melihat state game (sel kosong, solusi).
+def scenario(rng, hover_frames):
+    for i in range(hover_frames):
+        yield "menu_hover", [pygame.event.Event(pygame.MOUSEMOTION, pos=menu_button_pos(i % 3), rel=(0, 0), buttons=(0, 0, 0))]
+    yield "menu_click", click(menu_button_pos(1))  # Medium
+
+    # Main: beberapa langkah benar, satu salah, hint, undo, clear
+    for _ in range(hover_frames):
+        yield "board_hover", [pygame.event.Event(pygame.MOUSEMOTION, pos=cell_pos(rng.randrange(9), rng.randrange(9)), rel=(0, 0), buttons=(0, 0, 0))]
+    for r, c in jafar.grid.empty_cells()[:10]:
+        yield "select", click(cell_pos(r, c))
+        yield "digit", digit(jafar.solved_board[r, c])
+    r, c = jafar.grid.empty_cells()[0]
+    yield "select", click(cell_pos(r, c))
+    wrong = next(v for v in range(1, 10) if not jafar.grid.can_place(r, c, v))
+    yield "wrong_digit", digit(wrong)
+    yield "hint", click(sidebar_button_pos('Hint'))
+    yield "undo", key(pygame.K_z, mod=pygame.KMOD_LCTRL)
+    yield "redo", key(pygame.K_y, mod=pygame.KMOD_LCTRL)
+    yield "clear", click(sidebar_button_pos('Clear'))
+    yield "solve", click(sidebar_button_pos('Solve'))
+    for _ in range(hover_frames):
+        yield "finished", []
+    yield "back", click(sidebar_button_pos('Back'))
+
+    # Main lagi sampai papan penuh -> check_auto_restart -> game baru
+    yield "menu_click", click(menu_button_pos(0))  # Easy
+    for r, c in jafar.grid.empty_cells():
+        yield "select", click(cell_pos(r, c))
+        yield "digit", digit(jafar.solved_board[r, c])
+    yield "back", click(sidebar_button_pos('Back'))
+
+def run(rounds, hover_frames, seed):
+    func_stats = {}
+    install_hooks(func_stats)
+    jafar.SAVE_PATH = os.path.join(tempfile.mkdtemp(), "savegame.bin")
+    random.seed(seed)
+    rng = random.Random(seed)
+    frames = []
+    by_label = {}
+    for _ in range(rounds):
+        for label, events in scenario(rng, hover_frames):
+            t0 = time.perf_counter()
+            for ev in events:
+                if ev.type == pygame.MOUSEMOTION:
+                    cursor[0] = ev.pos
+                pygame.event.post(ev)
+            for event in pygame.event.get():
+                jafar.handle_event(event)
+            jafar.draw_frame()
+            pygame.display.flip()
+            dt = time.perf_counter() - t0
+            frames.append(dt)
+            by_label.setdefault(label, []).append(dt)
+    return frames, by_label, func_stats
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark frame time UI secara headless")
+    ap.add_argument("--rounds", type=int, default=3, help="berapa kali skenario diulang")
+    ap.add_argument("--hover-frames", type=int, default=60, help="frame idle/hover per fase")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", help="simpan hasil sebagai JSON")
+    args = ap.parse_args()
+
+    frames, by_label, func_stats = run(args.rounds, args.hover_frames, args.seed)
+    ms = lambda v: v * 1000
+    summary = {
+        'frames': len(frames),
+        'p50_ms': ms(percentile(frames, 50)),
+        'p95_ms': ms(percentile(frames, 95)),
+        'p99_ms': ms(percentile(frames, 99)),
+        'max_ms': ms(max(frames)),
+        'over_budget': sum(f > 1.0 / jafar.FPS for f in frames),
+        'skipped_delay_ms': delayed_ms[0],
+        'labels': {k: {'frames': len(v), 'p50_ms': ms(percentile(v, 50)), 'max_ms': ms(max(v))}
+                   for k, v in by_label.items()},
+        'functions': {k: {'calls': v['calls'], 'total_ms': ms(v['total_s']),
+                          'avg_ms': ms(v['total_s'] / v['calls']) if v['calls'] else 0.0}
+                      for k, v in func_stats.items()},
+    }
+
+    print(f"frames {summary['frames']}  p50 {summary['p50_ms']:.2f}ms  p95 {summary['p95_ms']:.2f}ms  "
+          f"p99 {summary['p99_ms']:.2f}ms  max {summary['max_ms']:.2f}ms  "
+          f"over {1000 / jafar.FPS:.1f}ms: {summary['over_budget']}")
+    print(f"(pygame.time.delay skipped: {summary['skipped_delay_ms']}ms)")
+    print(f"\n{'step':<14} {'frames':>7} {'p50':>9} {'max':>9}")
+    for k, v in summary['labels'].items():
+        print(f"{k:<14} {v['frames']:>7} {v['p50_ms']:>7.2f}ms {v['max_ms']:>7.2f}ms")
+    print(f"\n{'function':<24} {'calls':>7} {'total':>10} {'avg':>9}")
+    for k, v in summary['functions'].items():
+        print(f"{k:<24} {v['calls']:>7} {v['total_ms']:>8.1f}ms {v['avg_ms']:>7.3f}ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 import pygame
 import sys
 import random
-import copy
 import time
 import traceback
 import os
@@ -14,205 +13,20 @@ except:
     pass
 
 # ==========================================
-# 1. LOGIKA SOLVER (TIDAK BERUBAH)
+# 1. LOGIKA SOLVER (lihat sudoku_csp.py)
 # ==========================================
-ALL_CELLS = [(r, c) for r in range(9) for c in range(9)]
-
-def peers_of(cell):
-    r, c = cell
-    peers = set()
-    for i in range(9):
-        if i != c: peers.add((r, i))
-        if i != r: peers.add((i, c))
-    br = (r // 3) * 3
-    bc = (c // 3) * 3
-    for rr in range(br, br + 3):
-        for cc in range(bc, bc + 3):
-            if (rr, cc) != (r, c):
-                peers.add((rr, cc))
-    return peers
-
-PEERS = {cell: peers_of(cell) for cell in ALL_CELLS}
-
-def is_consistent_assignment(grid):
-    for r in range(9):
-        seen = set()
-        for c in range(9):
-            v = grid[r][c]
-            if v != 0:
-                if v in seen: return False
-                seen.add(v)
-    for c in range(9):
-        seen = set()
-        for r in range(9):
-            v = grid[r][c]
-            if v != 0:
-                if v in seen: return False
-                seen.add(v)
-    for br in range(0,9,3):
-        for bc in range(0,9,3):
-            seen = set()
-            for r in range(br, br+3):
-                for c in range(bc, bc+3):
-                    v = grid[r][c]
-                    if v != 0:
-                        if v in seen: return False
-                        seen.add(v)
-    return True
+from sudoku_csp import *
+import sudoku_csp
+from sudoku_profile import profiler_from_env
+from sudoku_metrics import MetricsRegistry, exporter_from_env, FRAME_BUCKETS, NODE_BUCKETS
+from sudoku_trace import get_logger, span
 
-def initial_domains(grid):
-    domains = {}
-    for r,c in ALL_CELLS:
-        v = grid[r][c]
-        if v != 0:
-            domains[(r,c)] = {v}
-        else:
-            domains[(r,c)] = set(range(1,10))
-    changed = True
-    while changed:
-        changed = False
-        for cell in ALL_CELLS:
-            if len(domains[cell]) == 1:
-                val = next(iter(domains[cell]))
-                for p in PEERS[cell]:
-                    if val in domains[p]:
-                        domains[p] = domains[p] - {val}
-                        changed = True
-    return domains
-
-def forward_check(domains, cell, val):
-    dom = copy.deepcopy(domains)
-    dom[cell] = {val}
-    stack = [cell]
-    while stack:
-        cur = stack.pop()
-        if len(dom[cur]) == 0:
-            return None
-        if len(dom[cur]) == 1:
-            v = next(iter(dom[cur]))
-            for p in PEERS[cur]:
-                if v in dom[p]:
-                    dom[p] = dom[p] - {v}
-                    if len(dom[p]) == 0:
-                        return None
-                    if len(dom[p]) == 1:
-                        stack.append(p)
-    return dom
-
-def select_unassigned_var(dom):
-    unassigned = [(len(dom[cell]), cell) for cell in ALL_CELLS if len(dom[cell]) > 1]
-    if not unassigned:
-        return None
-    unassigned.sort()
-    return unassigned[0][1]
-
-def order_values(dom, var):
-    vals = list(dom[var])
-    def conflicts_count(v):
-        cnt = 0
-        for p in PEERS[var]:
-            if v in dom[p]:
-                cnt += 1
-        return cnt
-    vals.sort(key=conflicts_count)
-    return vals
-
-def domains_to_grid(dom):
-    grid = [[0]*9 for _ in range(9)]
-    for (r,c), d in dom.items():
-        if len(d) == 1:
-            grid[r][c] = next(iter(d))
-    return grid
-
-def csp_backtrack(dom, limit_nodes=None):
-    nodes = {'count':0}
-    def backtrack(d):
-        if limit_nodes and nodes['count'] > limit_nodes:
-            return None
-        nodes['count'] += 1
-        var = select_unassigned_var(d)
-        if var is None:
-            return d
-        for val in order_values(d, var):
-            newd = forward_check(d, var, val)
-            if newd is not None:
-                res = backtrack(newd)
-                if res is not None:
-                    return res
-        return None
-    return backtrack(dom)
-
-def solve_grid(grid, limit_nodes=None):
-    if not is_consistent_assignment(grid):
-        return None
-    dom = initial_domains(grid)
-    sol_dom = csp_backtrack(dom, limit_nodes=limit_nodes)
-    if sol_dom is None:
-        return None
-    return domains_to_grid(sol_dom)
-
-def count_solutions(grid, max_count=2):
-    if not is_consistent_assignment(grid):
-        return 0
-    dom = initial_domains(grid)
-    count = 0
-    def backtrack(d):
-        nonlocal count
-        if count >= max_count: return
-        var = select_unassigned_var(d)
-        if var is None:
-            count += 1
-            return
-        for val in order_values(d, var):
-            newd = forward_check(d, var, val)
-            if newd is not None:
-                backtrack(newd)
-                if count >= max_count: return
-    backtrack(dom)
-    return count
-
-def generate_solved_board():
-    grid = [[0]*9 for _ in range(9)]
-    def fill(idx=0):
-        if idx == 81:
-            return True
-        r, c = divmod(idx, 9)
-        nums = list(range(1,10))
-        random.shuffle(nums)
-        for n in nums:
-            grid[r][c] = n
-            if is_consistent_assignment(grid):
-                if fill(idx+1):
-                    return True
-        grid[r][c] = 0
-        return False
-    if not fill():
-        raise RuntimeError("failed to generate solved board")
-    return grid
-
-def generate_puzzle(removals=40):
-    print(f"[DEBUG] Generating puzzle with {removals} removals...")
-    solved = generate_solved_board()
-    puzzle = copy.deepcopy(solved)
-    positions = [(r,c) for r in range(9) for c in range(9)]
-    random.shuffle(positions)
-    removed = 0
-    for (r,c) in positions:
-        if removed >= removals: break
-        backup = puzzle[r][c]
-        puzzle[r][c] = 0
-        cnt = count_solutions(puzzle, max_count=2)
-        if cnt != 1:
-            puzzle[r][c] = backup
-        else:
-            removed += 1
-    print("[DEBUG] Puzzle generated successfully.")
-    return puzzle, solved
+log = get_logger("jafar")
 
 # ==========================================
 # 2. UI CONFIG
 # ==========================================
-print("[DEBUG] Initializing Pygame...")
+log.debug("Initializing Pygame...")
 pygame.init()
 FPS = 60
 
@@ -243,7 +57,7 @@ C_MENU_BTN_MED = (241, 196, 15)
 C_MENU_BTN_HARD = (231, 76, 60)
 C_TEXT_LIGHT = (149, 165, 166)
 
-print("[DEBUG] Setting display mode...")
+log.debug("Setting display mode...")
 screen = pygame.display.set_mode((WINDOW_W, WINDOW_H))
 pygame.display.set_caption("Sudoku Modern CSP")
 clock = pygame.time.Clock()
@@ -276,38 +90,75 @@ else:
 
 # Global Variables
 game_state = "MENU"
-puzzle = []
-solved_board = []
-grid = []
-given = []
+puzzle = None
+solved_board = None
+grid = None
+journal = MoveJournal()
 selected = (0,0)
 message = ""
 solved_by_solver = None
 start_time = 0
 
 # Scoring
-BASE_SCORE = 10000
 score = BASE_SCORE
 mistake_penalty_count = 0
 hint_penalty_count = 0
 current_removals = 40
 difficulty_name = "Medium"
 
-def start_game(removals, diff_name):
-    global puzzle, solved_board, grid, given, selected, message, start_time, game_state
+# Setiap game punya puzzle ID (versi, difficulty, seed) yang bisa dibagikan;
+# python jafar.py --puzzle <ID> membuka puzzle yang sama persis
+puzzle_id = None
+gen_stats = {}
+
+# Autosave: snapshot biner ditulis oleh thread terpisah
+SAVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "savegame.bin")
+AUTOSAVE_INTERVAL = 5.0
+snapshot_writer = None
+last_autosave = 0
+has_save = False
+
+# Metrics (lihat sudoku_metrics.py); export aktif lewat SUDOKU_METRICS_FILE / SUDOKU_METRICS_PORT
+METRICS = MetricsRegistry()
+M_GAMES = METRICS.counter("sudoku_games_started_total", "Games started", ("difficulty",))
+M_GEN_SECONDS = METRICS.histogram("sudoku_generation_seconds", "Puzzle generation latency", labels=("difficulty",))
+M_SOLVE_SECONDS = METRICS.histogram("sudoku_solve_seconds", "Auto-solve latency")
+M_SOLVE_NODES = METRICS.histogram("sudoku_solve_nodes", "Search nodes per auto-solve", NODE_BUCKETS)
+M_HINTS = METRICS.counter("sudoku_hints_total", "Hints used")
+M_MOVES = METRICS.counter("sudoku_moves_total", "Accepted digit entries")
+M_MISTAKES = METRICS.counter("sudoku_mistakes_total", "Rejected digit entries")
+M_FRAME_SECONDS = METRICS.histogram("sudoku_frame_seconds", "Main loop work time per frame", FRAME_BUCKETS)
+M_DROPPED_FRAMES = METRICS.counter("sudoku_dropped_frames_total", "Frames whose work exceeded the 1/FPS budget")
+metrics_exporter = None
+
+def start_game(removals, diff_name, pid=None):
+    # pid: puzzle ID yang mau dibuka; removals & difficulty diambil dari ID.
+    # Tanpa pid dibuat ID baru dengan seed acak untuk difficulty ini.
+    global puzzle, solved_board, grid, journal, selected, message, start_time, game_state
     global score, mistake_penalty_count, hint_penalty_count, current_removals, difficulty_name
+    global gen_stats, puzzle_id
 
-    print(f"[DEBUG] Starting game: {diff_name}")
+    if pid is None:
+        pid = make_puzzle_id(diff_name)
+    _, diff_name, removals, _ = parse_puzzle_id(pid)
+    log.info("Starting game: %s (puzzle %s)", diff_name, pid)
     screen.fill(C_BG)
     load_text = FONT_TITLE.render("Generating Puzzle...", True, C_GRID_THICK)
     screen.blit(load_text, ((WINDOW_W - load_text.get_width())//2, WINDOW_H//2))
     pygame.display.flip()
 
+    t0 = time.perf_counter()
+    with span("start_game", difficulty=diff_name, puzzle_id=pid):
+        puzzle, solved_board, gen_stats = puzzle_from_id(pid)
+    # Baru diisi setelah puzzle jadi: kalau puzzle_from_id gagal, state game
+    # yang sedang jalan tidak tercampur ID/difficulty yang baru
     current_removals = removals
     difficulty_name = diff_name
-    puzzle, solved_board = generate_puzzle(removals=current_removals)
-    grid = copy.deepcopy(puzzle)
-    given = [[(puzzle[r][c] != 0) for c in range(9)] for r in range(9)]
+    puzzle_id = pid
+    grid = puzzle.copy()
+    journal = MoveJournal()
+    M_GAMES.inc(labels=(diff_name,))
+    M_GEN_SECONDS.observe(time.perf_counter() - t0, (diff_name,))
     selected = (0,0)
 
     score = BASE_SCORE
@@ -326,8 +177,7 @@ def get_current_score():
     if game_state == "FINISHED":
          elapsed = int(end_time - start_time)
 
-    final_score = BASE_SCORE - (hint_penalty_count * 1000) - (mistake_penalty_count * 500) - (elapsed * 2)
-    return max(0, final_score)
+    return compute_score(hint_penalty_count, mistake_penalty_count, elapsed)
 
 # --- VISUAL HELPERS ---
 def draw_rounded_rect(surface, color, rect, radius=10):
@@ -398,9 +248,9 @@ def draw_board():
     for r in range(9):
         for c in range(9):
             x = MARGIN_LEFT + c*CELL; y = MARGIN_TOP + r*CELL
-            v = grid[r][c]
+            v = grid[r, c]
             if v != 0:
-                color = C_TEXT_GIVEN if given[r][c] else C_TEXT_USER
+                color = C_TEXT_GIVEN if grid.is_given(r, c) else C_TEXT_USER
                 surf = FONT_CELL.render(str(v), True, color)
                 text_rect = surf.get_rect(center=(x + CELL//2, y + CELL//2 + 3))
                 screen.blit(surf, text_rect)
@@ -427,6 +277,9 @@ def draw_board():
 
     info_surf = FONT_SUBTITLE.render(f"{difficulty_name.upper()}  CSP Solver", True, C_TEXT_LIGHT)
     screen.blit(info_surf, (SIDEBAR_X, sidebar_y + 50))
+    if puzzle_id:
+        id_surf = FONT_SCORE_LBL.render(f"Puzzle ID: {puzzle_id}", True, C_TEXT_LIGHT)
+        screen.blit(id_surf, (SIDEBAR_X, sidebar_y + 80))
 
     # --- SCORE CARD ---
     card_y = sidebar_y + 100
@@ -543,33 +396,53 @@ def flash_wrong_cell(r, c):
 def provide_hint():
     global message, hint_penalty_count
     if game_state != "PLAYING": return
-    sol = solved_board if solved_board else solve_grid(grid)
+    sol = solved_board if solved_board is not None else solve_board(grid)
     if sol is None:
         message = "No solution available."
         return
     
-    empty_cells = [(r,c) for r in range(9) for c in range(9) if not given[r][c] and grid[r][c] == 0]
+    empty_cells = grid.empty_cells()
     if not empty_cells:
         message = "Board full."
         return
 
     r, c = random.choice(empty_cells)
-    grid[r][c] = sol[r][c]
+    journal.set_cell(grid, r, c, sol[r, c], 'hint')
     hint_penalty_count += 1
+    M_HINTS.inc()
     message = "Hint used."
     
-    if all(grid[r][c] != 0 for r in range(9) for c in range(9)):
+    if grid.is_full():
          check_auto_restart()
 
 def clear_action():
     global grid, message
     if game_state != "PLAYING": return
-    for r in range(9):
-        for c in range(9):
-            if not given[r][c]:
-                grid[r][c] = 0
+    journal.clear(grid)
     message = "Board cleared."
 
+def undo_action():
+    global message, selected
+    if game_state != "PLAYING": return
+    entry = journal.undo(grid)
+    if entry is None:
+        message = "Nothing to undo."
+        return
+    selected = divmod(entry[1][0][0], 9)
+    message = f"Undo ({entry[0]})."
+
+def redo_action():
+    global message, selected
+    if game_state != "PLAYING": return
+    entry = journal.redo(grid)
+    if entry is None:
+        message = "Nothing to redo."
+        return
+    selected = divmod(entry[1][0][0], 9)
+    message = f"Redo ({entry[0]})."
+    if grid.is_full():
+        check_auto_restart()
+
 def back_action():
     global game_state
     game_state = "MENU"
@@ -580,7 +453,13 @@ def solve_action():
     message = "Solving..."
     draw_board()
     pygame.display.flip()
-    sol = solve_grid(grid)
+    solve_stats = {}
+    t0 = time.perf_counter()
+    with span("solve_action") as sp:
+        sol = solve_board(grid, stats=solve_stats)
+        sp.set(nodes=solve_stats['nodes'])
+    M_SOLVE_SECONDS.observe(time.perf_counter() - t0)
+    M_SOLVE_NODES.observe(solve_stats['nodes'])
     if sol is None:
         message = "Unsolvable configuration."
     else:
@@ -595,7 +474,7 @@ def solve_action():
 def check_auto_restart():
     global message
     # Cek apakah board sudah penuh dan valid
-    if is_consistent_assignment(grid) and all(grid[r][c] != 0 for r in range(9) for c in range(9)):
+    if grid.is_full() and grid.is_consistent():
         
         # 1. Gambar board terakhir agar player melihat langkah terakhirnya
         draw_board()
@@ -639,82 +518,198 @@ def handle_keydown(event):
     if game_state != "PLAYING": return
 
     sr, sc = selected
+    # Ctrl+Z = undo, Ctrl+Y / Ctrl+Shift+Z = redo
+    if event.mod & pygame.KMOD_CTRL:
+        if event.key == pygame.K_z and event.mod & pygame.KMOD_SHIFT: redo_action()
+        elif event.key == pygame.K_z: undo_action()
+        elif event.key == pygame.K_y: redo_action()
+        return
     if event.key == pygame.K_LEFT: selected = (sr, max(sc-1, 0))
     elif event.key == pygame.K_RIGHT: selected = (sr, min(sc+1, 8))
     elif event.key == pygame.K_UP: selected = (max(sr-1,0), sc)
     elif event.key == pygame.K_DOWN: selected = (min(sr+1,8), sc)
     elif event.key in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5, pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9):
-        if given[sr][sc]: return
+        if grid.is_given(sr, sc): return
         try: num = int(event.unicode)
         except: return 
-        temp = grid[sr][sc]
-        grid[sr][sc] = num
-        if is_consistent_assignment(grid):
+        if grid.can_place(sr, sc, num):
+            journal.set_cell(grid, sr, sc, num)
+            M_MOVES.inc()
             message = ""
             check_auto_restart() 
         else:
-            grid[sr][sc] = temp
             mistake_penalty_count += 1
+            M_MISTAKES.inc()
             message = "Wrong move!"
             flash_wrong_cell(sr, sc)
     elif event.key in (pygame.K_BACKSPACE, pygame.K_DELETE):
-        if not given[sr][sc]: grid[sr][sc] = 0
+        if not grid.is_given(sr, sc): journal.set_cell(grid, sr, sc, 0)
+
+# --- SAVE / RESTORE ---
+def game_snapshot():
+    return pack_snapshot({
+        'grid': grid,
+        'solution': solved_board,
+        'removals': current_removals,
+        'difficulty': difficulty_name,
+        'mistakes': mistake_penalty_count,
+        'hints': hint_penalty_count,
+        'elapsed': time.time() - start_time,
+        'journal': journal,
+    })
+
+def autosave(force=False):
+    global last_autosave, has_save
+    now = time.time()
+    if not force and now - last_autosave < AUTOSAVE_INTERVAL: return
+    last_autosave = now
+    if game_state == "PLAYING":
+        # Save gagal tidak boleh menghentikan game; coba lagi di interval berikutnya
+        try:
+            snapshot_writer.submit(game_snapshot())
+        except Exception as e:
+            log.error("Autosave failed: %s", e)
+            return
+        has_save = True
+    elif has_save:
+        # Game selesai / kembali ke menu: save lama tidak dipakai lagi
+        snapshot_writer.discard()
+        has_save = False
+
+def restore_game():
+    global puzzle, solved_board, grid, journal, selected, message, start_time, game_state
+    global mistake_penalty_count, hint_penalty_count, current_removals, difficulty_name, has_save
+    global puzzle_id
+    t0 = time.perf_counter()
+    state = load_snapshot(SAVE_PATH)
+    if state is None: return False
+    puzzle_id = None  # snapshot tidak menyimpan ID
+    puzzle = state['puzzle']
+    solved_board = state['solution']
+    grid = state['grid']
+    journal = state['journal']
+    current_removals = state['removals']
+    difficulty_name = state['difficulty']
+    mistake_penalty_count = state['mistakes']
+    hint_penalty_count = state['hints']
+    start_time = time.time() - state['elapsed']
+    selected = (0,0)
+    message = "Game restored."
+    game_state = "PLAYING"
+    has_save = True
+    log.info("Restored %s game in %.2fms.", difficulty_name, (time.perf_counter() - t0) * 1000)
+    return True
+
+# --- PROFILING (opt-in: SUDOKU_PROFILE=cprofile|sample atau --profile) ---
+# Jalur yang benar-benar dipakai game: puzzle dari ID -> generate_board
+# (fill_board_n + count_solutions_n), hint/solve lewat solve_board.
+# search_n tidak dibungkus karena rekursif (wrapper per node).
+PROFILED_FUNCS = ["start_game", "restore_game", "puzzle_from_id", "generate_board", "fill_board_n",
+                  "count_solutions_n", "solve_board", "provide_hint", "solve_action"]
+profiler = profiler_from_env()
+if profiler:
+    profiler.install(sudoku_csp.__dict__, PROFILED_FUNCS)
+    profiler.install(globals(), PROFILED_FUNCS)
 
 # ==========================================
 # 3. MAIN LOOP
 # ==========================================
+# handle_event & draw_frame dipisah dari main() supaya bisa dipakai
+# harness headless (bench_ui.py) dengan jalur yang sama persis.
+def handle_event(event):
+    # False kalau window ditutup
+    global selected
+    if event.type == pygame.QUIT:
+        autosave(force=True)
+        return False
+    if profiler and event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+        profiler.dump()
+        return True
+
+    if game_state == "MENU":
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            result = check_menu_click(event.pos)
+            if result:
+                removals, name = result
+                start_game(removals, name)
+
+    elif game_state in ["PLAYING", "FINISHED"]:
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            mx, my = event.pos
+            if MARGIN_LEFT <= mx < MARGIN_LEFT + 9*CELL and MARGIN_TOP <= my < MARGIN_TOP + 9*CELL:
+                 if game_state == "PLAYING":
+                    c = (mx - MARGIN_LEFT) // CELL
+                    r = (my - MARGIN_TOP) // CELL
+                    selected = (r,c)
+            else:
+                action = click_button_check_game(event.pos)
+                if action == "Solve": solve_action()
+                elif action == "Hint": provide_hint()
+                elif action == "Clear": clear_action()
+                elif action == "Back": back_action()
+
+        elif event.type == pygame.KEYDOWN:
+            handle_keydown(event)
+    return True
+
+def draw_frame():
+    if game_state == "MENU":
+        draw_menu()
+    else:
+        draw_board()
+        # Overlay Finished untuk Auto-Solver saja (karena manual sudah ditangani check_auto_restart)
+        if game_state == "FINISHED" and solved_by_solver:
+              pass 
+
+def puzzle_id_arg(argv=None):
+    # --puzzle <ID> / --puzzle=<ID> dari command line, atau None
+    argv = sys.argv if argv is None else argv
+    for i, arg in enumerate(argv[1:], 1):
+        if arg == "--puzzle" and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith("--puzzle="):
+            return arg.split("=", 1)[1]
+    return None
+
 def main():
-    global selected, end_time
-    print("[DEBUG] Entering Main Loop...")
+    global end_time, snapshot_writer, metrics_exporter
+    log.debug("Entering Main Loop...")
     running = True
     end_time = 0
+    snapshot_writer = SnapshotWriter(SAVE_PATH)
+    metrics_exporter = exporter_from_env(METRICS)
+    frame_budget = 1.0 / FPS
+    restore_game()
+    pid = puzzle_id_arg()
+    if pid:
+        # Puzzle yang dibagikan menggantikan save lama
+        try:
+            start_game(None, None, pid)
+        except ValueError as e:
+            log.error("Cannot open puzzle %s: %s", pid, e)
     try:
         while running:
             clock.tick(FPS)
+            frame_t0 = time.perf_counter()
+            if profiler: profiler.start("frame")
+            autosave()
             for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+                if not handle_event(event):
                     running = False
-                
-                if game_state == "MENU":
-                    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        result = check_menu_click(event.pos)
-                        if result:
-                            removals, name = result
-                            start_game(removals, name)
-                
-                elif game_state in ["PLAYING", "FINISHED"]:
-                    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        mx, my = event.pos
-                        if MARGIN_LEFT <= mx < MARGIN_LEFT + 9*CELL and MARGIN_TOP <= my < MARGIN_TOP + 9*CELL:
-                             if game_state == "PLAYING":
-                                c = (mx - MARGIN_LEFT) // CELL
-                                r = (my - MARGIN_TOP) // CELL
-                                selected = (r,c)
-                        else:
-                            action = click_button_check_game(event.pos)
-                            if action == "Solve": solve_action()
-                            elif action == "Hint": provide_hint()
-                            elif action == "Clear": clear_action()
-                            elif action == "Back": back_action()
-                    
-                    elif event.type == pygame.KEYDOWN:
-                        handle_keydown(event)
-            
-            # DRAWING
-            if game_state == "MENU":
-                draw_menu()
-            else:
-                draw_board()
-                # Overlay Finished untuk Auto-Solver saja (karena manual sudah ditangani check_auto_restart)
-                if game_state == "FINISHED" and solved_by_solver:
-                      pass 
 
+            draw_frame()
             pygame.display.flip()
+            if profiler: profiler.stop()
+            frame_dt = time.perf_counter() - frame_t0
+            M_FRAME_SECONDS.observe(frame_dt)
+            if frame_dt > frame_budget:
+                M_DROPPED_FRAMES.inc()
             
     except Exception as e:
-        print("\n[CRITICAL ERROR] Program Crashed!")
-        traceback.print_exc()
+        log.error("Program crashed!\n%s", traceback.format_exc().rstrip())
     finally:
+        snapshot_writer.close()
+        if metrics_exporter: metrics_exporter.close()
         pygame.quit()
         sys.exit()
 
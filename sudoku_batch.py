@@ -0,0 +1,134 @@
+# ==========================================
+# VALIDASI & SKOR BATCH (NUMPY)
+# Cek ulang game selesai yang dikirim client dalam jumlah besar:
+# given tidak diubah, semua unit valid, sama dengan solusi, lalu hitung skor.
+# Butuh numpy (hanya modul ini, sudoku_csp.py tetap tanpa numpy).
+# ==========================================
+import numpy as np
+
+from sudoku_csp import UNITS, BASE_SCORE, HINT_PENALTY, MISTAKE_PENALTY, TIME_PENALTY
+
+# Kode verdict per baris (yang pertama gagal yang dilaporkan; bad_values dan
+# negative_penalty dicek paling awal)
+VERDICT_OK = 0
+VERDICT_GIVENS_CHANGED = 1
+VERDICT_INVALID_UNITS = 2
+VERDICT_WRONG_SOLUTION = 3
+VERDICT_BAD_VALUES = 4
+VERDICT_NEGATIVE_PENALTY = 5
+VERDICT_NAMES = ('ok', 'givens_changed', 'invalid_units', 'wrong_solution', 'bad_values', 'negative_penalty')
+
+# (27, 9) indeks sel flat per unit
+UNIT_INDEX = np.array([[r * 9 + c for r, c in unit] for unit in UNITS], dtype=np.intp)
+# Jumlah 1<<v untuk v = 1..9; jumlah 9 pangkat dua cuma bisa 0x3FE kalau semuanya beda
+FULL_UNIT_SUM = sum(1 << v for v in range(1, 10))
+# Baris per potong agar array sementara (n, 27, 9) tidak makan memori
+BATCH_CHUNK = 65536
+
+def _grid_rows(grids):
+    a = np.asarray(grids)
+    if a.ndim == 3:
+        a = a.reshape(a.shape[0], 81)
+    if a.ndim != 2 or a.shape[1] != 81:
+        raise ValueError(f"expected an (N, 81) array of grids, got shape {a.shape}")
+    return a
+
+def cells_in_range(grids):
+    # True per baris kalau semua sel bilangan bulat 0..9. Dicek sebelum cast
+    # ke uint8, karena cast membungkus diam-diam (256 + v jadi v, -1 jadi 255).
+    a = _grid_rows(grids)
+    if a.dtype == bool or not np.issubdtype(a.dtype, np.number):
+        return np.zeros(len(a), dtype=bool)
+    ok = (a >= 0) & (a <= 9)
+    if not np.issubdtype(a.dtype, np.integer):
+        ok &= a == np.floor(a)
+    return ok.all(axis=1)
+
+def as_grid_array(grids):
+    a = _grid_rows(grids)
+    if not cells_in_range(a).all():
+        raise ValueError("grid cells must be integers in 0..9")
+    return a.astype(np.uint8, copy=False)
+
+def _checked_rows(grids):
+    # Seperti as_grid_array, tapi baris di luar 0..9 diganti 0 (bukan error)
+    # dan ditandai lewat mask kedua
+    a = _grid_rows(grids)
+    ok = cells_in_range(a)
+    if ok.all():
+        return a.astype(np.uint8, copy=False), ok
+    return np.where(ok[:, None], a, 0).astype(np.uint8), ok
+
+def units_valid(grids):
+    # True per baris kalau setiap baris/kolom/blok berisi tepat 1..9
+    grids = as_grid_array(grids)
+    out = np.empty(len(grids), dtype=bool)
+    for start in range(0, len(grids), BATCH_CHUNK):
+        chunk = grids[start:start + BATCH_CHUNK]
+        bits = np.left_shift(np.uint16(1), chunk, dtype=np.uint16)
+        sums = bits[:, UNIT_INDEX].sum(axis=2, dtype=np.uint16)
+        out[start:start + len(chunk)] = (sums == FULL_UNIT_SUM).all(axis=1)
+    return out
+
+def batch_scores(hints, mistakes, elapsed):
+    # Versi vektor dari compute_score
+    hints = np.asarray(hints, dtype=np.int64)
+    mistakes = np.asarray(mistakes, dtype=np.int64)
+    elapsed = np.asarray(elapsed).astype(np.int64)
+    score = BASE_SCORE - hints * HINT_PENALTY - mistakes * MISTAKE_PENALTY - elapsed * TIME_PENALTY
+    return np.maximum(score, 0)
+
+def validate_batch(grids, puzzles, solutions=None, hints=0, mistakes=0, elapsed=0):
+    # grids/puzzles/solutions: (N, 81) atau (N, 9, 9), 0 = kosong.
+    # solutions boleh None: puzzle unik, jadi grid valid yang menjaga given
+    # pasti sama dengan solusinya.
+    # Return dict array per baris: verdict, valid, values_ok, penalties_ok,
+    # givens_ok, units_ok, matches_solution, score (0 untuk baris yang tidak
+    # valid). Sel di luar 0..9 -> bad_values; hints/mistakes/elapsed negatif
+    # -> negative_penalty (tidak boleh menaikkan skor di atas BASE_SCORE).
+    grids, values_ok = _checked_rows(grids)
+    puzzles, puzzles_ok = _checked_rows(puzzles)
+    n = len(grids)
+    if len(puzzles) != n:
+        raise ValueError("grids and puzzles must have the same number of rows")
+    values_ok &= puzzles_ok
+
+    givens_ok = ((puzzles == 0) | (grids == puzzles)).all(axis=1)
+    units_ok = units_valid(grids)
+    if solutions is None:
+        matches = units_ok & givens_ok
+    else:
+        solutions, solutions_ok = _checked_rows(solutions)
+        if len(solutions) != n:
+            raise ValueError("grids and solutions must have the same number of rows")
+        values_ok &= solutions_ok
+        matches = (grids == solutions).all(axis=1)
+
+    hints = np.broadcast_to(np.asarray(hints), (n,))
+    mistakes = np.broadcast_to(np.asarray(mistakes), (n,))
+    elapsed = np.broadcast_to(np.asarray(elapsed), (n,))
+    penalties_ok = (hints >= 0) & (mistakes >= 0) & (elapsed >= 0)
+
+    verdict = np.full(n, VERDICT_OK, dtype=np.uint8)
+    verdict[~matches] = VERDICT_WRONG_SOLUTION
+    verdict[~units_ok] = VERDICT_INVALID_UNITS
+    verdict[~givens_ok] = VERDICT_GIVENS_CHANGED
+    verdict[~penalties_ok] = VERDICT_NEGATIVE_PENALTY
+    verdict[~values_ok] = VERDICT_BAD_VALUES
+    valid = verdict == VERDICT_OK
+
+    score = np.where(valid, batch_scores(hints, mistakes, elapsed), 0)
+    return {
+        'verdict': verdict,
+        'valid': valid,
+        'values_ok': values_ok,
+        'penalties_ok': penalties_ok,
+        'givens_ok': givens_ok,
+        'units_ok': units_ok,
+        'matches_solution': matches,
+        'score': score,
+    }
+
+def verdict_counts(result):
+    counts = np.bincount(result['verdict'], minlength=len(VERDICT_NAMES))
+    return {name: int(counts[i]) for i, name in enumerate(VERDICT_NAMES)}
@@ -0,0 +1,2362 @@
+# ==========================================
+# LOGIKA SOLVER & GENERATOR SUDOKU (CSP)
+# Modul ini tidak bergantung pada pygame agar bisa dipakai
+# oleh worker process, benchmark, dan script lain.
+# ==========================================
+import atexit
+import random
+import copy
+import time
+import os
+import multiprocessing
+import json
+import struct
+import threading
+import zlib
+from collections import OrderedDict, Counter
+
+from sudoku_trace import get_logger, span
+
+log = get_logger("sudoku_csp")
+
+ALL_CELLS = [(r, c) for r in range(9) for c in range(9)]
+
+def peers_of(cell):
+    r, c = cell
+    peers = set()
+    for i in range(9):
+        if i != c: peers.add((r, i))
+        if i != r: peers.add((i, c))
+    br = (r // 3) * 3
+    bc = (c // 3) * 3
+    for rr in range(br, br + 3):
+        for cc in range(bc, bc + 3):
+            if (rr, cc) != (r, c):
+                peers.add((rr, cc))
+    return peers
+
+PEERS = {cell: peers_of(cell) for cell in ALL_CELLS}
+
+# 27 unit (9 baris, 9 kolom, 9 kotak) dan indeks unit untuk tiap sel
+UNITS = ([[(r, c) for c in range(9)] for r in range(9)] +
+         [[(r, c) for r in range(9)] for c in range(9)] +
+         [[(br + r, bc + c) for r in range(3) for c in range(3)] for br in range(0,9,3) for bc in range(0,9,3)])
+CELL_UNITS = {cell: [i for i, unit in enumerate(UNITS) if cell in unit] for cell in ALL_CELLS}
+
+def is_consistent_assignment(grid):
+    for r in range(9):
+        seen = set()
+        for c in range(9):
+            v = grid[r][c]
+            if v != 0:
+                if v in seen: return False
+                seen.add(v)
+    for c in range(9):
+        seen = set()
+        for r in range(9):
+            v = grid[r][c]
+            if v != 0:
+                if v in seen: return False
+                seen.add(v)
+    for br in range(0,9,3):
+        for bc in range(0,9,3):
+            seen = set()
+            for r in range(br, br+3):
+                for c in range(bc, bc+3):
+                    v = grid[r][c]
+                    if v != 0:
+                        if v in seen: return False
+                        seen.add(v)
+    return True
+
+def initial_domains(grid, alldiff=None):
+    domains = {}
+    for r,c in ALL_CELLS:
+        v = grid[r][c]
+        if v != 0:
+            domains[(r,c)] = {v}
+        else:
+            domains[(r,c)] = set(range(1,10))
+    changed = True
+    while changed:
+        changed = False
+        for cell in ALL_CELLS:
+            if len(domains[cell]) == 1:
+                val = next(iter(domains[cell]))
+                for p in PEERS[cell]:
+                    if val in domains[p]:
+                        domains[p] = domains[p] - {val}
+                        changed = True
+    if alldiff and all(domains.values()):
+        if not propagate_alldiff(domains, [], set(range(len(UNITS))), alldiff):
+            # Tidak ada solusi: tandai dengan domain kosong
+            return {cell: set() for cell in ALL_CELLS}
+    return domains
+
+def forward_check(domains, cell, val, alldiff=None):
+    if alldiff:
+        return forward_check_alldiff(domains, cell, val, alldiff)
+    dom = copy.deepcopy(domains)
+    dom[cell] = {val}
+    stack = [cell]
+    while stack:
+        cur = stack.pop()
+        if len(dom[cur]) == 0:
+            return None
+        if len(dom[cur]) == 1:
+            v = next(iter(dom[cur]))
+            for p in PEERS[cur]:
+                if v in dom[p]:
+                    dom[p] = dom[p] - {v}
+                    if len(dom[p]) == 0:
+                        return None
+                    if len(dom[p]) == 1:
+                        stack.append(p)
+    return dom
+
+def select_unassigned_var(dom):
+    unassigned = [(len(dom[cell]), cell) for cell in ALL_CELLS if len(dom[cell]) > 1]
+    if not unassigned:
+        return None
+    unassigned.sort()
+    return unassigned[0][1]
+
+def order_values(dom, var):
+    vals = list(dom[var])
+    def conflicts_count(v):
+        cnt = 0
+        for p in PEERS[var]:
+            if v in dom[p]:
+                cnt += 1
+        return cnt
+    vals.sort(key=conflicts_count)
+    return vals
+
+def domains_to_grid(dom):
+    grid = [[0]*9 for _ in range(9)]
+    for (r,c), d in dom.items():
+        if len(d) == 1:
+            grid[r][c] = next(iter(d))
+    return grid
+
+# --- ALL-DIFFERENT GLOBAL (MATCHING) ---
+# PEERS hanya menghapus nilai sel yang sudah pasti. Filter ini melihat satu
+# unit utuh sebagai graf bipartit sel-nilai: kalau tidak ada matching penuh,
+# unit pasti gagal ('check'); dengan 'gac', nilai yang tidak ada di matching
+# maksimum mana pun (dicari lewat SCC graf residual, cara Regin) dihapus.
+# Hanya unit yang domainnya berubah yang diperiksa ulang.
+ALLDIFF_STRENGTHS = (None, 'check', 'gac')
+
+def alldiff_filter(dom, unit, strength='gac'):
+    # Mengembalikan daftar (sel, domain baru), atau None kalau unit gagal
+    n = len(unit)
+    doms = [dom[cell] for cell in unit]
+    match_var = [0] * n
+    match_val = {}
+    def augment(i, seen):
+        for v in doms[i]:
+            if v in seen: continue
+            seen.add(v)
+            j = match_val.get(v)
+            if j is None or augment(j, seen):
+                match_val[v] = i
+                match_var[i] = v
+                return True
+        return False
+    for i in range(n):
+        if not augment(i, set()):
+            return None
+    if strength != 'gac':
+        return []
+    # Graf residual: sel i -> nilai pasangannya, nilai v -> sel lain yang
+    # domainnya memuat v. Simpul sel = 0..n-1, simpul nilai v = n + v.
+    adj = [[] for _ in range(n + 10)]
+    for i in range(n):
+        adj[i].append(n + match_var[i])
+        for v in doms[i]:
+            if v != match_var[i]:
+                adj[n + v].append(i)
+    # Nilai yang bisa dicapai dari nilai bebas (tidak terpakai di matching)
+    all_vals = set().union(*doms)
+    reach = set()
+    todo = [n + v for v in all_vals if v not in match_val]
+    while todo:
+        x = todo.pop()
+        if x in reach: continue
+        reach.add(x)
+        todo.extend(adj[x])
+    # SCC (Tarjan)
+    comp = [-1] * (n + 10)
+    index = [0]
+    idx = [-1] * (n + 10)
+    low = [0] * (n + 10)
+    on_stack = [False] * (n + 10)
+    stack = []
+    def strongconnect(x):
+        idx[x] = low[x] = index[0]
+        index[0] += 1
+        stack.append(x)
+        on_stack[x] = True
+        for y in adj[x]:
+            if idx[y] == -1:
+                strongconnect(y)
+                low[x] = min(low[x], low[y])
+            elif on_stack[y]:
+                low[x] = min(low[x], idx[y])
+        if low[x] == idx[x]:
+            while True:
+                y = stack.pop()
+                on_stack[y] = False
+                comp[y] = x
+                if y == x: break
+    for x in list(range(n)) + [n + v for v in all_vals]:
+        if idx[x] == -1:
+            strongconnect(x)
+    changes = []
+    for i, cell in enumerate(unit):
+        keep = {v for v in doms[i] if v == match_var[i] or n + v in reach or comp[n + v] == comp[i]}
+        if len(keep) < len(doms[i]):
+            changes.append((cell, keep))
+    return changes
+
+def propagate_alldiff(dom, stack, dirty, strength):
+    # Propagasi singleton seperti forward_check, lalu filter all-different
+    # pada unit `dirty`, berulang sampai stabil. Mengubah `dom` di tempat
+    # (hanya mengganti set, tidak memodifikasinya). False kalau gagal.
+    while True:
+        while stack:
+            cur = stack.pop()
+            v = next(iter(dom[cur]))
+            for p in PEERS[cur]:
+                if v in dom[p]:
+                    dom[p] = dom[p] - {v}
+                    if len(dom[p]) == 0:
+                        return False
+                    dirty.update(CELL_UNITS[p])
+                    if len(dom[p]) == 1:
+                        stack.append(p)
+        if not dirty:
+            return True
+        u = dirty.pop()
+        changes = alldiff_filter(dom, UNITS[u], strength)
+        if changes is None:
+            return False
+        for cell, keep in changes:
+            dom[cell] = keep
+            dirty.update(x for x in CELL_UNITS[cell] if x != u)
+            if len(keep) == 1:
+                stack.append(cell)
+
+def forward_check_alldiff(domains, cell, val, strength):
+    dom = dict(domains)
+    dom[cell] = {val}
+    if not propagate_alldiff(dom, [cell], set(CELL_UNITS[cell]), strength):
+        return None
+    return dom
+
+# --- STRATEGI URUTAN VARIABEL / NILAI ---
+# select_unassigned_var dan order_values menghitung ulang semuanya di tiap
+# node. Strategi di bawah menyimpan hitungan pendukung (bucket ukuran domain,
+# degree, jumlah peer yang masih punya nilai v, dst.) sebagai state per node
+# yang di-update setiap kali forward checking mengubah sebuah domain.
+
+class MRVDegree:
+    # MRV, seri dipecah dengan degree (jumlah peer yang belum terisi)
+    name = 'mrv-degree'
+
+    def init_state(self, dom):
+        buckets = [set() for _ in range(10)]
+        for cell in ALL_CELLS:
+            if len(dom[cell]) > 1:
+                buckets[len(dom[cell])].add(cell)
+        degree = {cell: sum(1 for p in PEERS[cell] if len(dom[p]) > 1) for cell in ALL_CELLS}
+        return (buckets, degree)
+
+    def copy_state(self, st):
+        buckets, degree = st
+        return ([set(b) for b in buckets], dict(degree))
+
+    def changed(self, st, dom, cell, old_len, removed):
+        buckets, degree = st
+        new_len = len(dom[cell])
+        if old_len > 1:
+            buckets[old_len].discard(cell)
+        if new_len > 1:
+            buckets[new_len].add(cell)
+        elif old_len > 1:
+            for p in PEERS[cell]:
+                degree[p] -= 1
+
+    def conflict(self, cell, cause):
+        pass
+
+    def select(self, dom, st):
+        buckets, degree = st
+        for n in range(2, 10):
+            if buckets[n]:
+                return min(buckets[n], key=lambda cell: (-degree[cell], cell))
+        return None
+
+class DomWdeg:
+    # dom/wdeg: bobot per unit (baris/kolom/kotak) naik setiap kali unit itu
+    # menyebabkan domain kosong; bobot dipelajari lintas pencarian.
+    # wdeg(x) = jumlah bobot unit x * peer yang masih kosong di unit tsb.
+    name = 'domwdeg'
+
+    def __init__(self):
+        self.weights = [1] * len(UNITS)
+
+    def init_state(self, dom):
+        return [sum(1 for cell in unit if len(dom[cell]) > 1) for unit in UNITS]
+
+    def copy_state(self, st):
+        return st[:]
+
+    def changed(self, st, dom, cell, old_len, removed):
+        if old_len > 1 and len(dom[cell]) == 1:
+            for u in CELL_UNITS[cell]:
+                st[u] -= 1
+
+    def conflict(self, cell, cause):
+        for u in CELL_UNITS[cell]:
+            if u in CELL_UNITS[cause]:
+                self.weights[u] += 1
+
+    def select(self, dom, st):
+        best = None
+        best_score = None
+        w = self.weights
+        for cell in ALL_CELLS:
+            n = len(dom[cell])
+            if n > 1:
+                wdeg = 0
+                for u in CELL_UNITS[cell]:
+                    wdeg += w[u] * (st[u] - 1)
+                score = n / wdeg if wdeg else float(n)
+                if best_score is None or score < best_score:
+                    best, best_score = cell, score
+        return best
+
+class LeastConstrainingValue:
+    # support[cell][v] = jumlah peer yang domainnya masih memuat v
+    name = 'lcv'
+
+    def init_state(self, dom):
+        support = {}
+        for cell in ALL_CELLS:
+            s = [0] * 10
+            for p in PEERS[cell]:
+                for v in dom[p]:
+                    s[v] += 1
+            support[cell] = s
+        return support
+
+    def copy_state(self, st):
+        return {cell: s[:] for cell, s in st.items()}
+
+    def changed(self, st, dom, cell, old_len, removed):
+        for p in PEERS[cell]:
+            s = st[p]
+            for v in removed:
+                s[v] -= 1
+
+    def conflict(self, cell, cause):
+        pass
+
+    def order(self, dom, st, var):
+        s = st[var]
+        return sorted(dom[var], key=lambda v: s[v])
+
+class AscendingValues:
+    name = 'asc'
+
+    def init_state(self, dom):
+        return None
+
+    def copy_state(self, st):
+        return None
+
+    def changed(self, st, dom, cell, old_len, removed):
+        pass
+
+    def conflict(self, cell, cause):
+        pass
+
+    def order(self, dom, st, var):
+        return sorted(dom[var])
+
+VAR_HEURISTICS = {'mrv-degree': MRVDegree, 'domwdeg': DomWdeg}
+VAL_HEURISTICS = {'lcv': LeastConstrainingValue, 'asc': AscendingValues}
+
+class SearchStrategy:
+    def __init__(self, var_heuristic, val_heuristic):
+        self.var_h = var_heuristic
+        self.val_h = val_heuristic
+        self.name = f"{var_heuristic.name}+{val_heuristic.name}"
+        self.nodes = 0
+
+    def init_state(self, dom):
+        return (self.var_h.init_state(dom), self.val_h.init_state(dom))
+
+    def copy_state(self, st):
+        return (self.var_h.copy_state(st[0]), self.val_h.copy_state(st[1]))
+
+    def changed(self, st, dom, cell, old_len, removed):
+        self.var_h.changed(st[0], dom, cell, old_len, removed)
+        self.val_h.changed(st[1], dom, cell, old_len, removed)
+
+    def conflict(self, cell, cause):
+        self.var_h.conflict(cell, cause)
+        self.val_h.conflict(cell, cause)
+
+    def select_var(self, dom, st):
+        self.nodes += 1
+        return self.var_h.select(dom, st[0])
+
+    def order_values(self, dom, st, var):
+        return self.val_h.order(dom, st[1], var)
+
+def make_strategy(name):
+    # Contoh: "mrv-degree+lcv", "domwdeg+lcv", "domwdeg+asc"
+    if isinstance(name, SearchStrategy):
+        return name
+    var_name, _, val_name = name.partition('+')
+    if var_name not in VAR_HEURISTICS or val_name not in VAL_HEURISTICS:
+        raise ValueError(f"unknown strategy: {name}")
+    return SearchStrategy(VAR_HEURISTICS[var_name](), VAL_HEURISTICS[val_name]())
+
+def forward_check_tracked(domains, state, cell, val, strategy):
+    # Sama dengan forward_check, tapi memberi tahu strategi setiap perubahan
+    # domain. Set domain tidak pernah diubah di tempat, jadi cukup salin dict.
+    dom = dict(domains)
+    st = strategy.copy_state(state)
+    old = dom[cell]
+    dom[cell] = {val}
+    strategy.changed(st, dom, cell, len(old), old - {val})
+    stack = [cell]
+    while stack:
+        cur = stack.pop()
+        v = next(iter(dom[cur]))
+        for p in PEERS[cur]:
+            old = dom[p]
+            if v in old:
+                dom[p] = old - {v}
+                if len(dom[p]) == 0:
+                    strategy.conflict(p, cur)
+                    return None
+                strategy.changed(st, dom, p, len(old), (v,))
+                if len(dom[p]) == 1:
+                    stack.append(p)
+    return dom, st
+
+def csp_backtrack_strategy(dom, strategy, limit_nodes=None, stats=None):
+    strategy = make_strategy(strategy)
+    nodes = {'count':0}
+    def backtrack(d, st):
+        if limit_nodes and nodes['count'] > limit_nodes:
+            return None
+        nodes['count'] += 1
+        var = strategy.select_var(d, st)
+        if var is None:
+            return d
+        for val in strategy.order_values(d, st, var):
+            res = forward_check_tracked(d, st, var, val, strategy)
+            if res is not None:
+                found = backtrack(res[0], res[1])
+                if found is not None:
+                    return found
+        return None
+    res = backtrack(dom, strategy.init_state(dom))
+    if stats is not None:
+        stats['nodes'] = nodes['count']
+        stats['limit_hit'] = bool(limit_nodes) and nodes['count'] > limit_nodes
+    return res
+
+def count_solutions_strategy(dom, max_count, strategy):
+    strategy = make_strategy(strategy)
+    count = 0
+    def backtrack(d, st):
+        nonlocal count
+        if count >= max_count: return
+        var = strategy.select_var(d, st)
+        if var is None:
+            count += 1
+            return
+        for val in strategy.order_values(d, st, var):
+            res = forward_check_tracked(d, st, var, val, strategy)
+            if res is not None:
+                backtrack(res[0], res[1])
+                if count >= max_count: return
+    backtrack(dom, strategy.init_state(dom))
+    return count
+
+# --- CONFLICT-DIRECTED BACKJUMPING (CBJ) ---
+# Setiap sel menyimpan `reason`: bitmask level keputusan yang menyebabkan
+# nilai-nilai terhapus dari domainnya (bit k = keputusan di kedalaman k).
+# Saat domain kosong, reason sel itu adalah conflict set; pencarian langsung
+# lompat ke level terdalam di conflict set, bukan mundur satu level.
+# Conflict set kecil disimpan sebagai nogood untuk memotong cabang lain.
+class _NodeLimit(Exception):
+    pass
+
+class NogoodStore:
+    # Nogood = tuple pasangan (sel, nilai) yang tidak mungkin benar bersamaan.
+    # Dibatasi jumlah dan panjangnya; yang paling lama dibuang dulu.
+    def __init__(self, max_size=2000, max_len=4):
+        self.max_size = max_size
+        self.max_len = max_len
+        self.nogoods = OrderedDict()
+        self.by_literal = {}
+        self.next_id = 0
+        self.learned = 0
+        self.prunes = 0
+
+    def add(self, literals):
+        if len(literals) > self.max_len or self.max_size <= 0:
+            return
+        ng_id = self.next_id
+        self.next_id += 1
+        self.nogoods[ng_id] = literals
+        for lit in literals:
+            self.by_literal.setdefault(lit, set()).add(ng_id)
+        self.learned += 1
+        if len(self.nogoods) > self.max_size:
+            old_id, old = self.nogoods.popitem(last=False)
+            for lit in old:
+                self.by_literal[lit].discard(old_id)
+
+    def check(self, dom, reasons, cell, val):
+        # Kalau cell=val melengkapi suatu nogood, kembalikan gabungan reason
+        # literal lainnya (conflict set); kalau tidak, None.
+        ids = self.by_literal.get((cell, val))
+        if not ids:
+            return None
+        for ng_id in ids:
+            why = 0
+            for (c, v) in self.nogoods[ng_id]:
+                if c == cell:
+                    continue
+                if len(dom[c]) != 1 or v not in dom[c]:
+                    break
+                why |= reasons[c]
+            else:
+                self.prunes += 1
+                return why
+        return None
+
+def forward_check_cbj(domains, reasons, cell, val, level):
+    # Mengembalikan (dom, reasons) atau (None, conflict_set)
+    dom = dict(domains)
+    rs = dict(reasons)
+    dom[cell] = {val}
+    rs[cell] = 1 << level
+    stack = [cell]
+    while stack:
+        cur = stack.pop()
+        v = next(iter(dom[cur]))
+        why = rs[cur]
+        for p in PEERS[cur]:
+            if v in dom[p]:
+                dom[p] = dom[p] - {v}
+                rs[p] |= why
+                if len(dom[p]) == 0:
+                    return None, rs[p]
+                if len(dom[p]) == 1:
+                    stack.append(p)
+    return dom, rs
+
+def csp_backtrack_cbj(dom, limit_nodes=None, var_order=select_unassigned_var, val_order=order_values,
+                      stats=None, nogoods=None):
+    if nogoods is None:
+        nogoods = NogoodStore()
+    nodes = {'count':0, 'jumps':0}
+    decisions = [None]
+    def backtrack(d, rs, level):
+        if limit_nodes and nodes['count'] > limit_nodes:
+            raise _NodeLimit()
+        nodes['count'] += 1
+        var = var_order(d)
+        if var is None:
+            return d, 0
+        bit = 1 << level
+        conf = 0
+        decisions.append(None)
+        for val in val_order(d, var):
+            decisions[level] = (var, val)
+            c = nogoods.check(d, rs, var, val)
+            if c is not None:
+                c |= bit
+            else:
+                newd, res = forward_check_cbj(d, rs, var, val, level)
+                if newd is None:
+                    c = res
+                else:
+                    sol, c = backtrack(newd, res, level + 1)
+                    if sol is not None:
+                        return sol, 0
+            if not c & bit:
+                # Konflik tidak bergantung pada keputusan di level ini
+                nodes['jumps'] += 1
+                decisions.pop()
+                return None, c
+            conf |= c & ~bit
+        decisions.pop()
+        conf |= rs[var]
+        # conf = keputusan-keputusan yang bersama-sama membuat `var` buntu
+        nogoods.add(tuple(decisions[l] for l in range(1, conf.bit_length()) if conf >> l & 1))
+        return None, conf
+    limit_hit = False
+    try:
+        res, _ = backtrack(dom, {cell: 0 for cell in ALL_CELLS}, 1)
+    except _NodeLimit:
+        res, limit_hit = None, True
+    if stats is not None:
+        stats.update({
+            'nodes': nodes['count'],
+            'limit_hit': limit_hit,
+            'backjumps': nodes['jumps'],
+            'nogoods_learned': nogoods.learned,
+            'nogood_prunes': nogoods.prunes,
+        })
+    return res
+
+def csp_backtrack(dom, limit_nodes=None, var_order=select_unassigned_var, val_order=order_values, stats=None, strategy=None, backjump=False, alldiff=None):
+    if alldiff and (backjump or strategy is not None):
+        raise ValueError("alldiff cannot be combined with backjump or strategy")
+    if backjump:
+        if strategy is not None:
+            raise ValueError("backjump and strategy cannot be combined")
+        return csp_backtrack_cbj(dom, limit_nodes=limit_nodes, var_order=var_order, val_order=val_order, stats=stats)
+    if strategy is not None:
+        return csp_backtrack_strategy(dom, strategy, limit_nodes=limit_nodes, stats=stats)
+    nodes = {'count':0}
+    def backtrack(d):
+        if limit_nodes and nodes['count'] > limit_nodes:
+            return None
+        nodes['count'] += 1
+        var = var_order(d)
+        if var is None:
+            return d
+        for val in val_order(d, var):
+            newd = forward_check(d, var, val, alldiff)
+            if newd is not None:
+                res = backtrack(newd)
+                if res is not None:
+                    return res
+        return None
+    res = backtrack(dom)
+    if stats is not None:
+        stats['nodes'] = nodes['count']
+        stats['limit_hit'] = bool(limit_nodes) and nodes['count'] > limit_nodes
+    return res
+
+def solve_grid(grid, limit_nodes=None, portfolio=False, strategy=None, backjump=False, alldiff=None, graph=None, stats=None):
+    if graph is not None:
+        return solve_grid_n(grid, graph)
+    if portfolio:
+        return solve_grid_portfolio(grid)
+    if not is_consistent_assignment(grid):
+        return None
+    dom = initial_domains(grid, alldiff)
+    if not all(dom.values()):
+        return None
+    sol_dom = csp_backtrack(dom, limit_nodes=limit_nodes, strategy=strategy, backjump=backjump, alldiff=alldiff, stats=stats)
+    if sol_dom is None:
+        return None
+    return domains_to_grid(sol_dom)
+
+def count_solutions(grid, max_count=2, tt=None, strategy=None, alldiff=None, graph=None, stats=None):
+    # stats['nodes'] hanya diisi oleh jalur default (tanpa tt/strategy/graph)
+    if graph is not None:
+        return count_solutions_n(grid, graph, max_count)
+    if not is_consistent_assignment(grid):
+        return 0
+    if alldiff and (tt is not None or strategy is not None):
+        raise ValueError("alldiff cannot be combined with tt or strategy")
+    dom = initial_domains(grid, alldiff)
+    if not all(dom.values()):
+        return 0
+    if tt is not None:
+        if strategy is not None:
+            raise ValueError("tt and strategy cannot be combined")
+        return count_solutions_tt(dom, max_count, tt)
+    if strategy is not None:
+        return count_solutions_strategy(dom, max_count, strategy)
+    count = 0
+    nodes = 0
+    def backtrack(d):
+        nonlocal count, nodes
+        if count >= max_count: return
+        nodes += 1
+        var = select_unassigned_var(d)
+        if var is None:
+            count += 1
+            return
+        for val in order_values(d, var):
+            newd = forward_check(d, var, val, alldiff)
+            if newd is not None:
+                backtrack(newd)
+                if count >= max_count: return
+    backtrack(dom)
+    if stats is not None:
+        stats['nodes'] = nodes
+    return count
+
+# --- TRANSPOSITION TABLE (ZOBRIST) ---
+# Urutan assignment yang berbeda sering berakhir di state domain yang sama.
+# Hash Zobrist = XOR kunci acak untuk setiap pasangan (sel, nilai) yang masih
+# ada di domain, di-update per nilai yang dihapus oleh forward checking.
+_zobrist_rng = random.Random(0x5D0C)
+ZOBRIST = {cell: {v: _zobrist_rng.getrandbits(64) for v in range(1,10)} for cell in ALL_CELLS}
+
+def zobrist_hash(dom):
+    h = 0
+    for cell in ALL_CELLS:
+        z = ZOBRIST[cell]
+        for v in dom[cell]:
+            h ^= z[v]
+    return h
+
+def forward_check_zobrist(domains, h, cell, val):
+    # Sama dengan forward_check, tapi ikut meng-update hash
+    dom = copy.deepcopy(domains)
+    for v in dom[cell]:
+        if v != val:
+            h ^= ZOBRIST[cell][v]
+    dom[cell] = {val}
+    stack = [cell]
+    while stack:
+        cur = stack.pop()
+        if len(dom[cur]) == 0:
+            return None
+        if len(dom[cur]) == 1:
+            v = next(iter(dom[cur]))
+            for p in PEERS[cur]:
+                if v in dom[p]:
+                    dom[p] = dom[p] - {v}
+                    h ^= ZOBRIST[p][v]
+                    if len(dom[p]) == 0:
+                        return None
+                    if len(dom[p]) == 1:
+                        stack.append(p)
+    return dom, h
+
+class TranspositionTable:
+    # Menyimpan jumlah solusi di bawah suatu state: 0, 1, atau 2 (= ">= 2"),
+    # beserta jumlah node subtree-nya untuk menghitung node yang dihemat.
+    # Ukuran dibatasi; entry yang paling lama tidak dipakai dibuang (LRU).
+    def __init__(self, max_size=200000):
+        self.max_size = max_size
+        self.table = OrderedDict()
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+        self.nodes = 0
+        self.saved_nodes = 0
+
+    def probe(self, h, need):
+        self.probes += 1
+        entry = self.table.get(h)
+        if entry is None:
+            return None
+        value, nodes = entry
+        if value >= 2 and need > 2:
+            return None
+        self.table.move_to_end(h)
+        self.hits += 1
+        self.saved_nodes += nodes
+        return min(value, need)
+
+    def store(self, h, value, nodes):
+        if self.max_size <= 0:
+            return
+        self.table[h] = (min(value, 2), nodes)
+        self.table.move_to_end(h)
+        self.stores += 1
+        if len(self.table) > self.max_size:
+            self.table.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.table.clear()
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def report(self):
+        searched = self.nodes + self.saved_nodes
+        saved_pct = 100.0 * self.saved_nodes / searched if searched else 0.0
+        return (f"TT: {len(self.table)}/{self.max_size} entries, {self.probes} probes, "
+                f"hit rate {100.0 * self.hit_rate():.1f}%, {self.evictions} evictions, "
+                f"nodes {self.nodes} (saved {self.saved_nodes}, {saved_pct:.1f}%)")
+
+def count_solutions_tt(dom, max_count, tt):
+    # Mengembalikan min(jumlah solusi, max_count), sama seperti count_solutions
+    def search(d, h, need):
+        found = tt.probe(h, need)
+        if found is not None:
+            return found
+        nodes_before = tt.nodes
+        tt.nodes += 1
+        var = select_unassigned_var(d)
+        if var is None:
+            tt.store(h, 1, 1)
+            return 1
+        found = 0
+        cut = False
+        for val in order_values(d, var):
+            res = forward_check_zobrist(d, h, var, val)
+            if res is not None:
+                found += search(res[0], res[1], need - found)
+                if found >= need:
+                    cut = True
+                    break
+        # Subtree yang dipotong hanya memberi batas bawah; simpan kalau >= 2
+        if not cut or found >= 2:
+            tt.store(h, found, tt.nodes - nodes_before)
+        return found
+    return search(dom, zobrist_hash(dom), max_count)
+
+def generate_solved_board(rng=None):
+    rng = rng or random
+    grid = [[0]*9 for _ in range(9)]
+    def fill(idx=0):
+        if idx == 81:
+            return True
+        r, c = divmod(idx, 9)
+        nums = list(range(1,10))
+        rng.shuffle(nums)
+        for n in nums:
+            grid[r][c] = n
+            if is_consistent_assignment(grid):
+                if fill(idx+1):
+                    return True
+        grid[r][c] = 0
+        return False
+    if not fill():
+        raise RuntimeError("failed to generate solved board")
+    return grid
+
+# --- HAPUS CLUE (DIPAKAI SEMUA GENERATOR) ---
+class _GridCells:
+    # Grid list-of-list N x N yang diindeks flat (i = r * N + c), supaya
+    # _remove_clues bisa dipakai untuk grid maupun Board.cells
+    __slots__ = ('grid', 'n')
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.n = len(grid)
+
+    def __getitem__(self, i):
+        r, c = divmod(i, self.n)
+        return self.grid[r][c]
+
+    def __setitem__(self, i, v):
+        r, c = divmod(i, self.n)
+        self.grid[r][c] = v
+
+def _remove_clues(cells, positions, removals, is_unique, stall_limit=None, t_end=None):
+    # Kosongkan sel sesuai urutan positions selama is_unique() tetap True,
+    # sampai `removals` sel terhapus. Berhenti lebih awal setelah stall_limit
+    # kegagalan beruntun atau saat time.time() >= t_end.
+    # cells diubah di tempat. Return (jumlah terhapus, kena deadline).
+    removed = 0
+    stall = 0
+    for pos in positions:
+        if removed >= removals: break
+        if stall_limit and stall >= stall_limit: break
+        if t_end is not None and time.time() >= t_end:
+            return removed, True
+        backup = cells[pos]
+        cells[pos] = 0
+        with span("count_solutions"):
+            unique = is_unique()
+        if not unique:
+            cells[pos] = backup
+            stall += 1
+        else:
+            removed += 1
+            stall = 0
+    return removed, False
+
+def generate_puzzle(removals=40, minimal=False, workers=None, tt=None, stats=None, rng=None):
+    # rng: instance random.Random untuk hasil yang bisa diulang (default modul random)
+    rng = rng or random
+    if minimal:
+        puzzle, solved, min_stats = generate_minimal_puzzle(workers=workers, rng=rng)
+        if stats is not None:
+            # Kunci sama dengan jalur biasa; target = sebanyak mungkin, jadi
+            # yang tercapai dianggap target
+            removed = 81 - min_stats['clues']
+            stats.update({
+                'target_removals': removed,
+                'removed': removed,
+                'clues': min_stats['clues'],
+                'attempts': 1,
+                'elapsed': min_stats['elapsed'],
+                'fill_time': min_stats['fill_time'],
+                'removal_time': min_stats['elapsed'] - min_stats['fill_time'],
+                'timed_out': False,
+                'tests': min_stats['tests'],
+                'workers': min_stats['workers'],
+            })
+        return puzzle, solved
+    log.debug("Generating puzzle with %d removals...", removals)
+    with span("generate_puzzle", removals=removals):
+        t0 = time.perf_counter()
+        with span("fill_solved_board"):
+            solved = generate_solved_board(rng)
+        t1 = time.perf_counter()
+        puzzle = copy.deepcopy(solved)
+        positions = list(range(81))
+        rng.shuffle(positions)
+        with span("removal_loop"):
+            removed, _ = _remove_clues(_GridCells(puzzle), positions, removals,
+                                       lambda: count_solutions(puzzle, max_count=2, tt=tt) == 1)
+    if stats is not None:
+        t2 = time.perf_counter()
+        stats.update({
+            'target_removals': removals,
+            'removed': removed,
+            'clues': 81 - removed,
+            'attempts': 1,
+            'elapsed': t2 - t0,
+            'fill_time': t1 - t0,
+            'removal_time': t2 - t1,
+            'timed_out': False,
+        })
+    log.debug("Puzzle generated: %d/%d removals.", removed, removals)
+    return puzzle, solved
+
+# --- PUZZLE MINIMAL ---
+# Menghapus clue hanya bisa menambah jumlah solusi, jadi clue yang sekali
+# terbukti wajib (dihapus -> solusi tidak unik) tetap wajib sampai akhir
+# dan tidak perlu diuji ulang.
+# Selama puzzle masih padat, uji clue murah dan hampir selalu bisa dihapus,
+# jadi dikerjakan berurutan; paralel baru dipakai di bawah batas ini.
+MINIMAL_PARALLEL_CLUES = 40
+
+# Pool dipakai ulang antar panggilan (start worker mahal) dan ditutup saat exit
+_pool = None
+_pool_workers = 0
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        _close_pool()
+        _pool = multiprocessing.Pool(workers)
+        _pool_workers = workers
+    return _pool
+
+def _close_pool():
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+        _pool = None
+        _pool_workers = 0
+
+atexit.register(_close_pool)
+
+def _clue_is_required(args):
+    puzzle, (r, c) = args
+    test = [row[:] for row in puzzle]
+    test[r][c] = 0
+    return count_solutions(test, max_count=2) != 1
+
+def generate_minimal_puzzle(workers=None, solved=None, rng=None):
+    log.debug("Generating minimal puzzle...")
+    rng = rng or random
+    t_start = time.time()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if solved is None:
+        solved = generate_solved_board(rng)
+    fill_time = time.time() - t_start
+    puzzle = copy.deepcopy(solved)
+    candidates = [(r,c) for r in range(9) for c in range(9)]
+    rng.shuffle(candidates)
+    required = set()
+    tests = 0
+    clues = 81
+    while candidates:
+        # Uji beberapa clue sekaligus terhadap puzzle yang sama
+        parallel = workers > 1 and clues <= MINIMAL_PARALLEL_CLUES
+        batch = candidates[:workers] if parallel else candidates[:1]
+        jobs = [(puzzle, pos) for pos in batch]
+        if parallel and len(batch) > 1:
+            results = _get_pool(workers).map(_clue_is_required, jobs)
+        else:
+            results = [_clue_is_required(job) for job in jobs]
+        tests += len(batch)
+        removed = None
+        for pos, is_required in zip(batch, results):
+            if is_required:
+                required.add(pos)
+            elif removed is None:
+                removed = pos
+        # Hanya satu clue yang dihapus per batch; sisa yang lolos diuji ulang
+        # terhadap puzzle baru karena penghapusan bersama belum tentu unik.
+        if removed is not None:
+            r, c = removed
+            puzzle[r][c] = 0
+            clues -= 1
+        candidates = [pos for pos in candidates if pos not in required and pos != removed]
+    stats = {
+        'clues': len(required),
+        'tests': tests,
+        'workers': workers,
+        'elapsed': time.time() - t_start,
+        'fill_time': fill_time,
+    }
+    log.debug("Minimal puzzle generated: %d clues, %d clue tests, %.2fs.",
+              stats['clues'], tests, stats['elapsed'])
+    return puzzle, solved, stats
+
+# --- ENUMERASI SOLUSI YANG BISA DI-RESUME ---
+# Pencarian memakai stack eksplisit (bukan rekursi/closure), jadi frontier
+# bisa disimpan ke file checkpoint kapan saja dan dilanjutkan di proses lain.
+# Tiap frame: domain (bitmask per sel), sel yang sedang dicabangkan, dan
+# nilai yang belum dicoba. Kedalaman stack <= 81, jadi memori terbatas.
+CHECKPOINT_VERSION = 1
+
+def domains_to_masks(dom):
+    masks = []
+    for cell in ALL_CELLS:
+        m = 0
+        for v in dom[cell]:
+            m |= 1 << v
+        masks.append(m)
+    return masks
+
+def masks_to_domains(masks):
+    return {cell: {v for v in range(1,10) if m >> v & 1} for cell, m in zip(ALL_CELLS, masks)}
+
+class SolutionEnumerator:
+    def __init__(self, grid=None):
+        self.stack = []
+        self.found = 0
+        self.nodes = 0
+        if grid is None or not is_consistent_assignment(grid):
+            return
+        dom = initial_domains(grid)
+        if any(len(d) == 0 for d in dom.values()):
+            return
+        var = select_unassigned_var(dom)
+        if var is None:
+            # Grid sudah lengkap: satu-satunya solusi adalah grid itu sendiri
+            self.stack.append([dom, None, []])
+        else:
+            self.stack.append([dom, var, order_values(dom, var)])
+
+    def solutions(self, checkpoint_path=None, checkpoint_every=1000):
+        # Generator solusi (grid 9x9). Kalau checkpoint_path diberikan, frontier
+        # otomatis disimpan tiap `checkpoint_every` node dan saat selesai.
+        # Dihitung dari node saat save terakhir: frame yang tidak menambah node
+        # (pop, solusi) tidak memicu save ulang.
+        last_saved = self.nodes
+        while self.stack:
+            if checkpoint_path and checkpoint_every and self.nodes - last_saved >= checkpoint_every:
+                self.save(checkpoint_path)
+                last_saved = self.nodes
+            frame = self.stack[-1]
+            d, var, vals = frame
+            if var is None:
+                self.stack.pop()
+                self.found += 1
+                yield domains_to_grid(d)
+                continue
+            if not vals:
+                self.stack.pop()
+                continue
+            val = vals.pop(0)
+            self.nodes += 1
+            newd = forward_check(d, var, val)
+            if newd is None:
+                continue
+            nv = select_unassigned_var(newd)
+            if nv is None:
+                self.found += 1
+                yield domains_to_grid(newd)
+            else:
+                self.stack.append([newd, nv, order_values(newd, nv)])
+        if checkpoint_path:
+            self.save(checkpoint_path)
+
+    def __iter__(self):
+        return self.solutions()
+
+    def done(self):
+        return not self.stack
+
+    def to_dict(self):
+        frames = []
+        for d, var, vals in self.stack:
+            frames.append({
+                'dom': domains_to_masks(d),
+                'var': list(var) if var is not None else None,
+                'vals': list(vals),
+            })
+        return {'version': CHECKPOINT_VERSION, 'found': self.found, 'nodes': self.nodes, 'stack': frames}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"unsupported checkpoint version: {data.get('version')}")
+        en = cls()
+        en.found = data['found']
+        en.nodes = data['nodes']
+        for fr in data['stack']:
+            var = tuple(fr['var']) if fr['var'] is not None else None
+            en.stack.append([masks_to_domains(fr['dom']), var, list(fr['vals'])])
+        return en
+
+    def save(self, path):
+        # Tulis ke file sementara lalu rename, agar checkpoint lama tetap utuh
+        # kalau proses mati di tengah penulisan.
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+def enumerate_solutions(grid):
+    return SolutionEnumerator(grid).solutions()
+
+# --- PENGHITUNG SOLUSI PARALEL ---
+# Pohon pencarian dipecah sampai kedalaman `split_depth`; tiap state di
+# kedalaman itu jadi satu subproblem yang dibagikan ke pool satu per satu
+# (imap_unordered, chunksize=1) sehingga worker yang cepat selesai langsung
+# mengambil subproblem berikutnya. Total global dibagi lewat shared Value
+# supaya semua worker berhenti begitu max_count tercapai.
+COUNT_FLUSH_NODES = 256
+SPLIT_TASKS_PER_WORKER = 16
+SPLIT_MAX_DEPTH = 8
+
+_shared_found = None
+_shared_limit = 0
+
+def _init_count_worker(found, limit):
+    global _shared_found, _shared_limit
+    _shared_found = found
+    _shared_limit = limit
+
+def split_subproblems(dom, depth=None, min_tasks=1):
+    # depth=None: pecah sampai ada minimal `min_tasks` subproblem
+    # (paling dalam SPLIT_MAX_DEPTH, agar parent tidak ikut mencari semua)
+    frontier = [dom]
+    solved = 0
+    level = 0
+    if depth is None:
+        keep_going = lambda: level < SPLIT_MAX_DEPTH and len(frontier) < min_tasks
+    else:
+        keep_going = lambda: level < depth
+    while frontier and keep_going():
+        level += 1
+        nxt = []
+        for d in frontier:
+            var = select_unassigned_var(d)
+            if var is None:
+                solved += 1
+                continue
+            for val in order_values(d, var):
+                newd = forward_check(d, var, val)
+                if newd is not None:
+                    nxt.append(newd)
+        frontier = nxt
+    return frontier, solved
+
+def _count_subproblem(masks):
+    dom = masks_to_domains(masks)
+    count = 0
+    pending = 0
+    nodes = 0
+    stop = False
+    def flush():
+        nonlocal pending, stop
+        with _shared_found.get_lock():
+            _shared_found.value += pending
+            total = _shared_found.value
+        pending = 0
+        if _shared_limit and total >= _shared_limit:
+            stop = True
+    def backtrack(d):
+        nonlocal count, pending, nodes
+        if stop: return
+        nodes += 1
+        if nodes % COUNT_FLUSH_NODES == 0:
+            flush()
+            if stop: return
+        var = select_unassigned_var(d)
+        if var is None:
+            count += 1
+            pending += 1
+            if _shared_limit and count >= _shared_limit:
+                flush()
+            return
+        for val in order_values(d, var):
+            newd = forward_check(d, var, val)
+            if newd is not None:
+                backtrack(newd)
+                if stop: return
+    backtrack(dom)
+    flush()
+    return count
+
+def count_solutions_parallel(grid, max_count=None, workers=None, split_depth=None, stats=None):
+    # max_count=None berarti hitung semua solusi
+    t_start = time.time()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not is_consistent_assignment(grid):
+        return 0
+    dom = initial_domains(grid)
+    if any(len(d) == 0 for d in dom.values()):
+        return 0
+    limit = max_count or 0
+    subproblems, total = split_subproblems(dom, split_depth, workers * SPLIT_TASKS_PER_WORKER)
+    jobs = [domains_to_masks(d) for d in subproblems]
+    if limit and total >= limit:
+        jobs = []
+    found = multiprocessing.Value('q', total)
+    if workers > 1 and len(jobs) > 1:
+        # Keluar dari `with` memanggil terminate(), jadi subproblem yang
+        # tersisa dibatalkan saat batas tercapai.
+        with multiprocessing.Pool(workers, initializer=_init_count_worker, initargs=(found, limit)) as pool:
+            for n in pool.imap_unordered(_count_subproblem, jobs, chunksize=1):
+                total += n
+                if limit and total >= limit:
+                    break
+    else:
+        _init_count_worker(found, limit)
+        for masks in jobs:
+            total += _count_subproblem(masks)
+            if limit and total >= limit:
+                break
+    if stats is not None:
+        stats.update({
+            'subproblems': len(jobs),
+            'workers': workers,
+            'split_depth': split_depth,
+            'elapsed': time.time() - t_start,
+        })
+    return min(total, limit) if limit else total
+
+# --- PORTFOLIO SOLVER ---
+# Beberapa konfigurasi (heuristik variabel/nilai, seed, jadwal restart)
+# dijalankan bersamaan di proses terpisah; jawaban pertama dipakai dan
+# proses lain dihentikan. Semua konfigurasi lengkap (restart terakhir
+# selesai tanpa batas node = terbukti), jadi jawaban pertama selalu benar.
+PORTFOLIO_CONFIGS = [
+    {'name': 'mrv-lcv', 'var': 'mrv', 'val': 'lcv'},
+    {'name': 'mrv-asc', 'var': 'mrv', 'val': 'asc'},
+    {'name': 'static-lcv', 'var': 'static', 'val': 'lcv'},
+    {'name': 'rand-luby-1', 'var': 'mrv_random', 'val': 'random', 'seed': 1, 'restart': 'luby', 'restart_base': 100},
+    {'name': 'rand-luby-2', 'var': 'mrv_random', 'val': 'lcv', 'seed': 2, 'restart': 'luby', 'restart_base': 100},
+    {'name': 'rand-geo-3', 'var': 'mrv_random', 'val': 'random', 'seed': 3, 'restart': 'geometric', 'restart_base': 50},
+]
+
+# Berapa kali tiap konfigurasi menang (di proses ini)
+PORTFOLIO_WINS = Counter()
+
+def luby(i):
+    # Deret Luby 1,1,2,1,1,2,4,1,1,2,... (i mulai dari 1)
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while True:
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+
+def first_unassigned_var(dom):
+    for cell in ALL_CELLS:
+        if len(dom[cell]) > 1:
+            return cell
+    return None
+
+def make_var_order(name, rng):
+    if name == 'mrv':
+        return select_unassigned_var
+    if name == 'static':
+        return first_unassigned_var
+    if name == 'mrv_random':
+        def mrv_random(dom):
+            best = []
+            best_len = 10
+            for cell in ALL_CELLS:
+                n = len(dom[cell])
+                if 1 < n < best_len:
+                    best, best_len = [cell], n
+                elif n == best_len:
+                    best.append(cell)
+            return rng.choice(best) if best else None
+        return mrv_random
+    raise ValueError(f"unknown variable ordering: {name}")
+
+def make_val_order(name, rng):
+    if name == 'lcv':
+        return order_values
+    if name == 'asc':
+        return lambda dom, var: sorted(dom[var])
+    if name == 'random':
+        def random_values(dom, var):
+            vals = list(dom[var])
+            rng.shuffle(vals)
+            return vals
+        return random_values
+    raise ValueError(f"unknown value ordering: {name}")
+
+def solve_with_config(grid, config, cancelled=None):
+    # Mengembalikan (solusi atau None, total node). `cancelled`: fungsi yang
+    # dicek tiap node; kalau True pencarian dihentikan dengan _Cancelled.
+    if not is_consistent_assignment(grid):
+        return None, 0
+    dom = initial_domains(grid)
+    if any(len(d) == 0 for d in dom.values()):
+        return None, 0
+    rng = random.Random(config.get('seed', 0))
+    var_order = make_var_order(config.get('var', 'mrv'), rng)
+    val_order = make_val_order(config.get('val', 'lcv'), rng)
+    if cancelled is not None:
+        pick_var = var_order
+        def var_order(dom):
+            if cancelled():
+                raise _Cancelled()
+            return pick_var(dom)
+    restart = config.get('restart')
+    base = config.get('restart_base', 100)
+    total_nodes = 0
+    run = 0
+    while True:
+        run += 1
+        if restart == 'luby':
+            limit = base * luby(run)
+        elif restart == 'geometric':
+            limit = int(base * 1.5 ** (run - 1))
+        else:
+            limit = None
+        st = {}
+        sol_dom = csp_backtrack(dom, limit_nodes=limit, var_order=var_order, val_order=val_order, stats=st)
+        total_nodes += st['nodes']
+        if sol_dom is not None:
+            return domains_to_grid(sol_dom), total_nodes
+        if not st['limit_hit']:
+            return None, total_nodes
+
+class _Cancelled(Exception):
+    pass
+
+# Pool portfolio dipakai ulang antar solve seperti _get_pool. Konfigurasi yang
+# kalah tidak bisa di-terminate tanpa membuang pool, jadi tiap solve diberi
+# nomor race; begitu ada hasil, parent menulis nomor itu ke _portfolio_done
+# dan worker yang masih jalan (atau belum mulai) untuk race itu berhenti
+# sendiri di node berikutnya.
+_portfolio_pool = None
+_portfolio_workers = 0
+_portfolio_done = None
+_portfolio_race = 0
+
+def _init_portfolio_worker(done):
+    global _portfolio_done
+    _portfolio_done = done
+
+def _get_portfolio_pool(workers):
+    global _portfolio_pool, _portfolio_workers, _portfolio_done
+    if _portfolio_pool is None or _portfolio_workers != workers:
+        _close_portfolio_pool()
+        _portfolio_done = multiprocessing.Value('q', _portfolio_race)
+        _portfolio_pool = multiprocessing.Pool(workers, initializer=_init_portfolio_worker,
+                                               initargs=(_portfolio_done,))
+        _portfolio_workers = workers
+    return _portfolio_pool
+
+def _close_portfolio_pool():
+    global _portfolio_pool, _portfolio_workers
+    if _portfolio_pool is not None:
+        _portfolio_pool.terminate()
+        _portfolio_pool.join()
+        _portfolio_pool = None
+        _portfolio_workers = 0
+
+atexit.register(_close_portfolio_pool)
+
+def _portfolio_worker(args):
+    grid, config, race = args
+    t_start = time.time()
+    try:
+        sol, nodes = solve_with_config(grid, config, cancelled=lambda: _portfolio_done.value >= race)
+    except _Cancelled:
+        sol, nodes = None, 0
+    return config['name'], sol, nodes, time.time() - t_start
+
+def solve_grid_portfolio(grid, configs=None, workers=None, timeout=None, stats=None):
+    # Hasil pertama menang: semua konfigurasi lengkap, jadi None dari salah
+    # satunya juga berarti puzzle tidak punya solusi. PORTFOLIO_WINS hanya
+    # dihitung untuk solve yang berhasil.
+    global _portfolio_race
+    if configs is None:
+        configs = PORTFOLIO_CONFIGS
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(configs)))
+    t_start = time.time()
+    pool = _get_portfolio_pool(workers)
+    _portfolio_race += 1
+    race = _portfolio_race
+    jobs = [(grid, cfg, race) for cfg in configs]
+    it = pool.imap_unordered(_portfolio_worker, jobs, chunksize=1)
+    try:
+        name, sol, nodes, _ = it.next(timeout=timeout)
+    except multiprocessing.TimeoutError:
+        if stats is not None:
+            stats.update({'winner': None, 'elapsed': time.time() - t_start})
+        return None
+    finally:
+        _portfolio_done.value = race
+    if sol is not None:
+        PORTFOLIO_WINS[name] += 1
+    if stats is not None:
+        stats.update({'winner': name, 'nodes': nodes, 'elapsed': time.time() - t_start})
+    return sol
+
+def portfolio_report():
+    total = sum(PORTFOLIO_WINS.values())
+    lines = [f"Portfolio wins ({total} solves):"]
+    for name, n in PORTFOLIO_WINS.most_common():
+        lines.append(f"  {name:<14} {n:>6}  {100.0 * n / total:5.1f}%")
+    return "\n".join(lines)
+
+# --- PAPAN N x N & GRAF CONSTRAINT (BITMASK) ---
+# Versi solver/generator untuk ukuran kotak `box` sembarang (3 -> 9x9,
+# 4 -> 16x16, 5 -> 25x25) dan varian Sudoku. Sel diberi indeks datar
+# 0..N*N-1, domain adalah bitmask int (bit d = angka d+1). Semua constraint
+# (unit all-different: baris, kolom, kotak atau region jigsaw, diagonal;
+# cage killer dengan jumlah) dideklarasikan sekali di ConstraintGraph lalu
+# dikompilasi ke tuple indeks datar. Salin domain per node cukup list slice.
+# Di mana pun ada parameter `box`, boleh juga diisi ConstraintGraph.
+class ConstraintGraph:
+    def __init__(self, box=3, regions=None, diagonals=False, cages=()):
+        # regions: N daftar sel (r, c) pengganti kotak (jigsaw)
+        # cages: daftar (jumlah, [(r, c), ...]) untuk killer
+        n = box * box
+        self.box = box
+        self.n = n
+        self.size = n * n
+        self.full = (1 << n) - 1
+        self.standard = regions is None and not diagonals and not cages
+        rows = [[r * n + c for c in range(n)] for r in range(n)]
+        cols = [[r * n + c for r in range(n)] for c in range(n)]
+        if regions is None:
+            blocks = [[(br + r) * n + bc + c for r in range(box) for c in range(box)]
+                      for br in range(0, n, box) for bc in range(0, n, box)]
+        else:
+            blocks = [[r * n + c for (r, c) in region] for region in regions]
+            if len(blocks) != n or sorted(i for b in blocks for i in b) != list(range(self.size)):
+                raise ValueError("regions must split the board into N regions of N cells")
+        units = rows + cols + blocks
+        if diagonals:
+            units.append([i * n + i for i in range(n)])
+            units.append([i * n + (n - 1 - i) for i in range(n)])
+        self.units = [tuple(u) for u in units]
+        self.nunits = len(self.units)
+        self.cages = []
+        for total, cells in cages:
+            idx = tuple(r * n + c for (r, c) in cells)
+            if len(set(idx)) != len(idx) or not 0 < len(idx) <= n:
+                raise ValueError(f"invalid cage: {cells}")
+            self.cages.append((idx, total))
+        # Constraint id: 0..nunits-1 = unit, nunits.. = cage
+        groups = self.units + [idx for idx, _ in self.cages]
+        cell_cons = [[] for _ in range(self.size)]
+        for ci, group in enumerate(groups):
+            for i in group:
+                cell_cons[i].append(ci)
+        self.cell_constraints = [tuple(c) for c in cell_cons]
+        self.peers = [tuple(sorted({j for ci in cell_cons[i] for j in groups[ci]} - {i}))
+                      for i in range(self.size)]
+        self.all_constraints = range(len(groups))
+
+def regions_from_layout(layout, box=3):
+    # layout: string N*N karakter, karakter sama = region sama (spasi/baris baru diabaikan)
+    n = box * box
+    chars = [ch for ch in layout if not ch.isspace()]
+    if len(chars) != n * n:
+        raise ValueError(f"layout must have {n * n} cells")
+    regions = {}
+    for i, ch in enumerate(chars):
+        regions.setdefault(ch, []).append(divmod(i, n))
+    return list(regions.values())
+
+def diagonal_graph(box=3):
+    return ConstraintGraph(box, diagonals=True)
+
+def jigsaw_graph(layout, box=3):
+    return ConstraintGraph(box, regions=regions_from_layout(layout, box))
+
+def killer_graph(cages, box=3):
+    return ConstraintGraph(box, cages=cages)
+
+_board_tables = {}
+
+def get_tables(box=3):
+    if isinstance(box, ConstraintGraph):
+        return box
+    t = _board_tables.get(box)
+    if t is None:
+        t = _board_tables[box] = ConstraintGraph(box)
+    return t
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:
+    def popcount(m):
+        return bin(m).count("1")
+
+def mask_digit(m):
+    return m.bit_length()
+
+def flat_cells(grid):
+    # Board -> bytearray-nya langsung; grid list-of-lists -> list datar
+    if isinstance(grid, Board):
+        return grid.cells
+    return [v for row in grid for v in row]
+
+def grid_to_masks(grid, box=3):
+    t = get_tables(box)
+    full = t.full
+    return [1 << (v - 1) if v else full for v in flat_cells(grid)]
+
+def masks_to_grid(masks, box=3):
+    n = get_tables(box).n
+    return [[mask_digit(m) if m & (m - 1) == 0 else 0 for m in masks[r * n:(r + 1) * n]] for r in range(n)]
+
+def is_consistent_assignment_n(grid, box=3):
+    t = get_tables(box)
+    flat = flat_cells(grid)
+    for group in t.units + [idx for idx, _ in t.cages]:
+        seen = 0
+        for i in group:
+            v = flat[i]
+            if v:
+                if seen >> v & 1: return False
+                seen |= 1 << v
+    for idx, total in t.cages:
+        vals = [flat[i] for i in idx]
+        s = sum(vals)
+        if s > total or (all(vals) and s != total):
+            return False
+    return True
+
+def cage_filter(dom, cells, total):
+    # Sisakan angka yang muncul di paling tidak satu pengisian cage dengan
+    # angka berbeda dan jumlah tepat `total`. None kalau tidak ada.
+    k = len(cells)
+    doms = [dom[i] for i in cells]
+    support = [0] * k
+    chosen = [0] * k
+    dead = set()
+    def dfs(j, used, remaining):
+        if j == k:
+            if remaining:
+                return False
+            for x in range(k):
+                support[x] |= chosen[x]
+            return True
+        if (j, used, remaining) in dead:
+            return False
+        left = k - j - 1
+        ok = False
+        m = doms[j] & ~used
+        while m:
+            b = m & -m
+            m ^= b
+            d = b.bit_length()
+            rest = remaining - d
+            if rest < left * (left + 1) // 2:
+                break
+            chosen[j] = b
+            if dfs(j + 1, used | b, rest):
+                ok = True
+        if not ok:
+            dead.add((j, used, remaining))
+        return ok
+    if not dfs(0, 0, total):
+        return None
+    return [(i, support[x]) for x, i in enumerate(cells) if support[x] != doms[x]]
+
+def propagate_n(t, dom, stack, dirty):
+    # Naked single (hapus angka sel pasti dari peer), hidden single (angka
+    # yang hanya punya satu tempat di unit) dan filter jumlah cage, hanya
+    # untuk constraint `dirty`. `dom` diubah di tempat; False kalau kontradiksi.
+    peers = t.peers
+    cell_cons = t.cell_constraints
+    units = t.units
+    nunits = t.nunits
+    full = t.full
+    while True:
+        while stack:
+            i = stack.pop()
+            m = dom[i]
+            for p in peers[i]:
+                if dom[p] & m:
+                    nm = dom[p] & ~m
+                    if not nm:
+                        return False
+                    dom[p] = nm
+                    dirty.update(cell_cons[p])
+                    if nm & (nm - 1) == 0:
+                        stack.append(p)
+        if not dirty:
+            return True
+        ci = dirty.pop()
+        if ci < nunits:
+            unit = units[ci]
+            once = 0
+            twice = 0
+            for i in unit:
+                m = dom[i]
+                twice |= once & m
+                once |= m
+            if once != full:
+                return False
+            singles = once & ~twice
+            if singles:
+                for i in unit:
+                    m = dom[i] & singles
+                    if m and m != dom[i]:
+                        if m & (m - 1):
+                            return False
+                        dom[i] = m
+                        dirty.update(cell_cons[i])
+                        stack.append(i)
+        else:
+            cells, total = t.cages[ci - nunits]
+            changes = cage_filter(dom, cells, total)
+            if changes is None:
+                return False
+            for i, m in changes:
+                dom[i] = m
+                dirty.update(c for c in cell_cons[i] if c != ci)
+                if m & (m - 1) == 0:
+                    stack.append(i)
+
+def initial_masks(grid, box=3):
+    # None kalau grid sudah kontradiktif
+    t = get_tables(box)
+    dom = grid_to_masks(grid, box)
+    stack = [i for i, m in enumerate(dom) if m & (m - 1) == 0]
+    if not propagate_n(t, dom, stack, set(t.all_constraints)):
+        return None
+    return dom
+
+# Jam dicek sekali per sekian node, bukan tiap node
+DEADLINE_CHECK_NODES = 256
+
+def search_n(t, dom, max_count, solutions, rng=None, nodes=None, deadline=None):
+    # Hitung solusi sampai max_count; solusi yang ditemukan ditambahkan ke
+    # `solutions`. rng (opsional) mengacak urutan angka yang dicoba.
+    # nodes (opsional) = list [n] yang ditambah satu per node.
+    # deadline (opsional, waktu absolut time.time(), butuh nodes): kalau
+    # lewat, _NodeLimit dilempar.
+    if nodes is not None:
+        nodes[0] += 1
+        if deadline is not None and nodes[0] % DEADLINE_CHECK_NODES == 0 and time.time() >= deadline:
+            raise _NodeLimit()
+    best = -1
+    best_n = t.n + 1
+    for i, m in enumerate(dom):
+        if m & (m - 1):
+            k = popcount(m)
+            if k < best_n:
+                best, best_n = i, k
+                if k == 2: break
+    if best < 0:
+        solutions.append(dom)
+        return 1
+    m = dom[best]
+    bits = []
+    while m:
+        b = m & -m
+        bits.append(b)
+        m ^= b
+    if rng is not None:
+        rng.shuffle(bits)
+    found = 0
+    # Semua constraint sel ini (unit + cage) ditandai langsung: mengunci sel
+    # ke satu angka membuang angka lain dari domainnya, jadi unitnya bisa
+    # punya hidden single baru walau tidak ada domain peer yang berubah.
+    cons = t.cell_constraints[best]
+    for b in bits:
+        newd = dom[:]
+        newd[best] = b
+        if propagate_n(t, newd, [best], set(cons)):
+            found += search_n(t, newd, max_count - found, solutions, rng, nodes, deadline)
+            if found >= max_count:
+                break
+    return found
+
+def solve_grid_n(grid, box=3):
+    if not is_consistent_assignment_n(grid, box):
+        return None
+    t = get_tables(box)
+    dom = initial_masks(grid, box)
+    if dom is None:
+        return None
+    solutions = []
+    if not search_n(t, dom, 1, solutions):
+        return None
+    return masks_to_grid(solutions[0], box)
+
+def count_solutions_n(grid, box=3, max_count=2, deadline=None, stats=None):
+    # Dengan deadline: kalau waktu habis, hitungan sejauh ini tidak lengkap
+    # dan stats['limit_hit'] = True. stats selalu diisi (nodes = 0 kalau
+    # grid sudah kontradiktif sebelum pencarian).
+    if stats is not None:
+        stats['nodes'] = 0
+        stats['limit_hit'] = False
+    if not is_consistent_assignment_n(grid, box):
+        return 0
+    t = get_tables(box)
+    dom = initial_masks(grid, box)
+    if dom is None:
+        return 0
+    solutions = []
+    nodes = [0] if stats is not None or deadline is not None else None
+    limit_hit = False
+    try:
+        found = search_n(t, dom, max_count, solutions, nodes=nodes, deadline=deadline)
+    except _NodeLimit:
+        found, limit_hit = len(solutions), True
+    if stats is not None:
+        stats['nodes'] = nodes[0]
+        stats['limit_hit'] = limit_hit
+    return found
+
+def fill_board_n(box=3, rng=None):
+    # Papan penuh acak lewat pencarian dengan urutan angka diacak
+    t = get_tables(box)
+    solutions = []
+    dom = initial_masks([[0] * t.n for _ in range(t.n)], t)
+    if dom is None or not search_n(t, dom, 1, solutions, rng or random):
+        raise RuntimeError("failed to generate solved board")
+    return masks_to_grid(solutions[0], t)
+
+# Sampai ukuran ini papan penuh diisi dengan pencarian acak (semua papan
+# valid bisa keluar); di atasnya pakai pola dasar yang diacak
+FILL_SEARCH_MAX_BOX = 4
+
+def generate_solved_board_n(box=3, rng=None):
+    # Varian dan box <= FILL_SEARCH_MAX_BOX: isi papan kosong dengan pencarian
+    # yang urutan angkanya diacak. Sudoku biasa yang lebih besar: pola dasar
+    # yang valid, lalu diacak (relabel angka, tukar baris dalam band, tukar
+    # band, dan sama untuk kolom/stack) -- cepat, tapi semua hasilnya satu
+    # kelas ekuivalen.
+    rng = rng or random
+    t = get_tables(box)
+    if not t.standard or t.box <= FILL_SEARCH_MAX_BOX:
+        return fill_board_n(t, rng)
+    box = t.box
+    n = t.n
+    digits = list(range(1, n + 1))
+    rng.shuffle(digits)
+    def shuffled_lines():
+        bands = list(range(box))
+        rng.shuffle(bands)
+        lines = []
+        for b in bands:
+            inner = list(range(box))
+            rng.shuffle(inner)
+            lines.extend(b * box + i for i in inner)
+        return lines
+    rows = shuffled_lines()
+    cols = shuffled_lines()
+    return [[digits[(box * (r % box) + r // box + c) % n] for c in cols] for r in rows]
+
+def generate_puzzle_n(box=3, removals=None, deadline=None, rng=None):
+    # Sama seperti generate_puzzle: hapus clue selama solusi tetap unik.
+    # Dengan `deadline` (detik), berhenti dan kembalikan hasil sejauh ini.
+    rng = rng or random
+    t = get_tables(box)
+    if removals is None:
+        removals = t.size // 2
+    t_start = time.time()
+    solved = generate_solved_board_n(box, rng)
+    puzzle = [row[:] for row in solved]
+    positions = list(range(t.size))
+    rng.shuffle(positions)
+    tests = [0]
+    def is_unique():
+        tests[0] += 1
+        return count_solutions_n(puzzle, box, max_count=2) == 1
+    t_end = t_start + deadline if deadline is not None else None
+    removed, timed_out = _remove_clues(_GridCells(puzzle), positions, removals, is_unique, t_end=t_end)
+    stats = {
+        'box': t.box,
+        'removed': removed,
+        'target_removals': removals,
+        'tests': tests[0],
+        'elapsed': time.time() - t_start,
+        'timed_out': timed_out,
+    }
+    return puzzle, solved, stats
+
+# --- PAPAN KOMPAK (Board) ---
+# Satu tipe papan 9x9 untuk UI, solver dan generator: 81 byte nilai sel
+# (0 = kosong) dalam bytearray plus bitmask int untuk sel yang given.
+# Salin = salin 81 byte, bisa di-hash, dan bolak-balik ke string 81 karakter.
+_BOARD_TABLES = get_tables(3)
+_DIGIT_CHARS = bytes.maketrans(bytes(range(10)), b"0123456789")
+
+class Board:
+    __slots__ = ('cells', 'givens')
+
+    def __init__(self, cells=None, givens=0):
+        self.cells = bytearray(81) if cells is None else bytearray(cells)
+        if len(self.cells) != 81:
+            raise ValueError("board must have 81 cells")
+        self.givens = givens
+
+    @classmethod
+    def from_grid(cls, grid, givens=True):
+        board = cls(v for row in grid for v in row)
+        if givens:
+            board.mark_givens()
+        return board
+
+    @classmethod
+    def from_string(cls, text, givens=True):
+        text = "".join(text.split())
+        if len(text) != 81:
+            raise ValueError("board string must have 81 characters")
+        board = cls(0 if ch in ".0" else int(ch) for ch in text)
+        if givens:
+            board.mark_givens()
+        return board
+
+    def to_string(self):
+        return self.cells.translate(_DIGIT_CHARS).decode("ascii")
+
+    def to_grid(self):
+        cells = self.cells
+        return [list(cells[r * 9:r * 9 + 9]) for r in range(9)]
+
+    def copy(self):
+        return Board(self.cells, self.givens)
+
+    def mark_givens(self):
+        # Semua sel yang terisi sekarang dijadikan given
+        mask = 0
+        for i, v in enumerate(self.cells):
+            if v:
+                mask |= 1 << i
+        self.givens = mask
+
+    def __getitem__(self, rc):
+        r, c = rc
+        return self.cells[r * 9 + c]
+
+    def __setitem__(self, rc, v):
+        r, c = rc
+        self.cells[r * 9 + c] = v
+
+    def is_given(self, r, c):
+        return self.givens >> (r * 9 + c) & 1 == 1
+
+    def clear_user(self):
+        givens = self.givens
+        cells = self.cells
+        for i in range(81):
+            if not givens >> i & 1:
+                cells[i] = 0
+
+    def empty_cells(self):
+        return [divmod(i, 9) for i, v in enumerate(self.cells) if v == 0]
+
+    def is_full(self):
+        return 0 not in self.cells
+
+    def can_place(self, r, c, v):
+        # Cukup cek 20 peer, tanpa menyalin papan
+        cells = self.cells
+        return all(cells[p] != v for p in _BOARD_TABLES.peers[r * 9 + c])
+
+    def is_consistent(self):
+        return is_consistent_assignment_n(self, _BOARD_TABLES)
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.cells == other.cells and self.givens == other.givens
+
+    def __hash__(self):
+        return hash((bytes(self.cells), self.givens))
+
+    def __repr__(self):
+        return f"Board('{self.to_string()}')"
+
+    __str__ = to_string
+
+def masks_to_board(masks, givens=0):
+    return Board((mask_digit(m) if m & (m - 1) == 0 else 0 for m in masks), givens)
+
+def solve_board(board, stats=None, deadline=None):
+    # Solusi sebagai Board dengan mask given yang sama, atau None.
+    # deadline = waktu absolut time.time(); kalau lewat, return None dan
+    # stats['limit_hit'] = True. stats selalu diisi, juga kalau papan sudah
+    # kontradiktif sebelum pencarian (nodes = 0).
+    t = _BOARD_TABLES
+    if stats is not None:
+        stats['nodes'] = 0
+        stats['limit_hit'] = False
+    if not is_consistent_assignment_n(board, t):
+        return None
+    dom = initial_masks(board, t)
+    if dom is None:
+        return None
+    solutions = []
+    nodes = [0] if stats is not None or deadline is not None else None
+    limit_hit = False
+    try:
+        found = search_n(t, dom, 1, solutions, nodes=nodes, deadline=deadline)
+    except _NodeLimit:
+        found, limit_hit = 0, True
+    if stats is not None:
+        stats['nodes'] = nodes[0]
+        stats['limit_hit'] = limit_hit
+    if not found:
+        return None
+    return masks_to_board(solutions[0], board.givens)
+
+def count_solutions_board(board, max_count=2, deadline=None, stats=None):
+    return count_solutions_n(board, _BOARD_TABLES, max_count, deadline, stats)
+
+def generate_board(removals=40, deadline=None, rng=None, stall_limit=20, orders_per_board=3, max_attempts=None):
+    # Generator utama untuk game, langsung di atas Board dan solver bitmask.
+    # Dengan `deadline` (detik): ulangi dengan urutan hapus / board baru
+    # sampai target tercapai atau waktu habis, lalu kembalikan yang terbaik.
+    # Tanpa deadline: satu kali jalan seperti generate_puzzle. max_attempts membatasi percobaan tanpa
+    # melihat jam, jadi hasil dengan rng yang sama selalu sama (lihat
+    # puzzle_from_id). Mengembalikan (puzzle, solusi, stats).
+    log.debug("Generating board with %d removals...", removals)
+    rng = rng or random
+    t = _BOARD_TABLES
+    t_start = time.time()
+    t_end = t_start + deadline if deadline is not None else None
+    if deadline is None and max_attempts is None:
+        stall_limit = None
+    best = None
+    best_removed = -1
+    attempts = 0
+    solution = None
+    timed_out = False
+    fill_time = 0.0
+    with span("generate_board", removals=removals) as sp:
+        while True:
+            if solution is None or attempts % orders_per_board == 0:
+                t_fill = time.perf_counter()
+                with span("fill_solved_board"):
+                    solution = Board.from_grid(fill_board_n(t, rng), givens=False)
+                fill_time += time.perf_counter() - t_fill
+            attempts += 1
+            puzzle = solution.copy()
+            positions = list(range(81))
+            rng.shuffle(positions)
+            with span("removal_loop", attempt=attempts):
+                removed, timed_out = _remove_clues(
+                    puzzle.cells, positions, removals,
+                    lambda: count_solutions_n(puzzle, t, 2) == 1, stall_limit, t_end)
+            if removed > best_removed:
+                best, best_removed = (puzzle, solution), removed
+            if max_attempts is not None:
+                if best_removed >= removals or attempts >= max_attempts:
+                    timed_out = best_removed < removals
+                    break
+            elif best_removed >= removals or timed_out or deadline is None or time.time() >= t_end:
+                timed_out = timed_out or best_removed < removals
+                break
+        sp.set(removed=best_removed, attempts=attempts)
+    puzzle, solution = best
+    puzzle.mark_givens()
+    solution.givens = puzzle.givens
+    stats = {
+        'target_removals': removals,
+        'removed': best_removed,
+        'clues': 81 - best_removed,
+        'attempts': attempts,
+        'elapsed': time.time() - t_start,
+        'timed_out': timed_out,
+    }
+    stats['fill_time'] = fill_time
+    stats['removal_time'] = stats['elapsed'] - fill_time
+    log.debug("Board generated: %d/%d removals, %d attempts, %.2fs.",
+              best_removed, removals, attempts, stats['elapsed'])
+    return puzzle, solution, stats
+
+# --- JURNAL LANGKAH (UNDO / REDO) ---
+# Setiap entri = (source, changes) dengan changes tuple (idx, old, new).
+# Langkah user/hint cuma satu perubahan; clear jadi satu entri berisi semua
+# sel user yang dihapus. Undo/redo hanya geser pos, tanpa salin papan.
+JOURNAL_SOURCES = ('user', 'hint', 'clear')
+
+class MoveJournal:
+    __slots__ = ('entries', 'pos')
+
+    def __init__(self, entries=(), pos=None):
+        self.entries = list(entries)
+        self.pos = len(self.entries) if pos is None else pos
+
+    def __len__(self):
+        return self.pos
+
+    def record(self, source, changes):
+        if source not in JOURNAL_SOURCES:
+            raise ValueError(f"unknown journal source: {source}")
+        changes = tuple(changes)
+        if not changes:
+            return None
+        # Langkah baru setelah undo membuang cabang redo
+        del self.entries[self.pos:]
+        entry = (source, changes)
+        self.entries.append(entry)
+        self.pos += 1
+        return entry
+
+    def set_cell(self, board, r, c, v, source='user'):
+        i = r * 9 + c
+        old = board.cells[i]
+        if old == v:
+            return None
+        board.cells[i] = v
+        return self.record(source, ((i, old, v),))
+
+    def clear(self, board):
+        cells = board.cells
+        givens = board.givens
+        changes = [(i, cells[i], 0) for i in range(81) if cells[i] and not givens >> i & 1]
+        for i, _, _ in changes:
+            cells[i] = 0
+        return self.record('clear', changes)
+
+    def can_undo(self):
+        return self.pos > 0
+
+    def can_redo(self):
+        return self.pos < len(self.entries)
+
+    def undo(self, board):
+        if self.pos == 0:
+            return None
+        self.pos -= 1
+        entry = self.entries[self.pos]
+        cells = board.cells
+        for i, old, _ in entry[1]:
+            cells[i] = old
+        return entry
+
+    def redo(self, board):
+        if self.pos == len(self.entries):
+            return None
+        entry = self.entries[self.pos]
+        self.pos += 1
+        cells = board.cells
+        for i, _, new in entry[1]:
+            cells[i] = new
+        return entry
+
+    def replay(self, puzzle):
+        # Bangun ulang papan dari puzzle awal + entri sampai pos
+        board = puzzle.copy()
+        cells = board.cells
+        for _, changes in self.entries[:self.pos]:
+            for i, _, new in changes:
+                cells[i] = new
+        return board
+
+    def counts(self):
+        return Counter(source for source, _ in self.entries[:self.pos])
+
+    # Format biner: [pos:u32][n:u32] lalu per entri [source:u8][k:u8]
+    # dan k x [idx:u8][old<<4|new:u8]. Satu langkah user = 4 byte.
+    # k <= 81 (satu entri paling banyak mengubah semua sel). Snapshot versi 1
+    # memakai pos/n u16 (header_bytes=2 di from_bytes).
+    def to_bytes(self):
+        out = bytearray(self.pos.to_bytes(4, 'little'))
+        out += len(self.entries).to_bytes(4, 'little')
+        for source, changes in self.entries:
+            out.append(JOURNAL_SOURCES.index(source))
+            out.append(len(changes))
+            for i, old, new in changes:
+                out.append(i)
+                out.append(old << 4 | new)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data, header_bytes=4):
+        h = header_bytes
+        pos = int.from_bytes(data[0:h], 'little')
+        n = int.from_bytes(data[h:2 * h], 'little')
+        entries = []
+        k = 2 * h
+        for _ in range(n):
+            source = JOURNAL_SOURCES[data[k]]
+            count = data[k + 1]
+            k += 2
+            changes = tuple((data[k + 2 * j], data[k + 2 * j + 1] >> 4, data[k + 2 * j + 1] & 15)
+                            for j in range(count))
+            k += 2 * count
+            entries.append((source, changes))
+        if k != len(data) or pos > n:
+            raise ValueError("corrupt journal data")
+        return cls(entries, pos)
+
+    def to_dict(self):
+        return {'pos': self.pos,
+                'entries': [[source, [list(ch) for ch in changes]] for source, changes in self.entries]}
+
+    @classmethod
+    def from_dict(cls, data):
+        entries = [(source, tuple(tuple(ch) for ch in changes)) for source, changes in data['entries']]
+        return cls(entries, data['pos'])
+
+# --- SNAPSHOT GAME (SAVE / RESTORE) ---
+# Layout biner (little endian):
+#   header  '<4sBBHHdB' magic, versi, removals, mistakes, hints, elapsed, len(nama)
+#   nama difficulty (utf-8), grid & solusi (2 sel per byte), mask given (11 byte),
+#   panjang jurnal u32 + jurnal, lalu crc32 dari semua byte sebelumnya.
+# Puzzle tidak disimpan: cukup solusi yang di-mask dengan given.
+# Versi 2: pos/jumlah entri jurnal u32 (versi 1: u16, masih bisa dibaca).
+SNAPSHOT_MAGIC = b"SDKS"
+SNAPSHOT_VERSION = 2
+_JOURNAL_HEADER_BYTES = {1: 2, 2: 4}
+_SNAPSHOT_HEADER = struct.Struct('<4sBBHHdB')
+
+def pack_cells(cells):
+    cells = bytes(cells) + b"\0"
+    return bytes(cells[i] << 4 | cells[i + 1] for i in range(0, 81, 2))
+
+def unpack_cells(data):
+    cells = bytearray()
+    for b in data:
+        cells.append(b >> 4)
+        cells.append(b & 15)
+    return cells[:81]
+
+def pack_snapshot(state):
+    name = state['difficulty'].encode('utf-8')
+    journal = state['journal'].to_bytes() if state.get('journal') is not None else b""
+    out = bytearray(_SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, state['removals'],
+        state['mistakes'], state['hints'], state['elapsed'], len(name)))
+    out += name
+    out += pack_cells(state['grid'].cells)
+    out += pack_cells(state['solution'].cells)
+    out += state['grid'].givens.to_bytes(11, 'little')
+    out += struct.pack('<I', len(journal))
+    out += journal
+    out += struct.pack('<I', zlib.crc32(out))
+    return bytes(out)
+
+def unpack_snapshot(data):
+    if len(data) < _SNAPSHOT_HEADER.size + 4 or struct.unpack('<I', data[-4:])[0] != zlib.crc32(data[:-4]):
+        raise ValueError("corrupt snapshot")
+    magic, version, removals, mistakes, hints, elapsed, name_len = _SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or version not in _JOURNAL_HEADER_BYTES:
+        raise ValueError(f"unsupported snapshot version: {version}")
+    k = _SNAPSHOT_HEADER.size
+    difficulty = data[k:k + name_len].decode('utf-8'); k += name_len
+    cells = unpack_cells(data[k:k + 41]); k += 41
+    sol_cells = unpack_cells(data[k:k + 41]); k += 41
+    givens = int.from_bytes(data[k:k + 11], 'little'); k += 11
+    (jlen,) = struct.unpack_from('<I', data, k); k += 4
+    journal = MoveJournal.from_bytes(data[k:k + jlen], _JOURNAL_HEADER_BYTES[version]) if jlen else MoveJournal()
+    solution = Board(sol_cells, givens)
+    puzzle = Board((v if givens >> i & 1 else 0 for i, v in enumerate(sol_cells)), givens)
+    return {
+        'grid': Board(cells, givens),
+        'puzzle': puzzle,
+        'solution': solution,
+        'removals': removals,
+        'difficulty': difficulty,
+        'mistakes': mistakes,
+        'hints': hints,
+        'elapsed': elapsed,
+        'journal': journal,
+    }
+
+def save_snapshot(path, data):
+    # Sama seperti checkpoint enumerator: tulis ke .tmp lalu rename
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def load_snapshot(path):
+    # None kalau file tidak ada atau rusak (game mulai dari menu)
+    try:
+        with open(path, "rb") as f:
+            return unpack_snapshot(f.read())
+    except FileNotFoundError:
+        return None
+    except (ValueError, struct.error) as e:
+        log.warning("Ignoring snapshot %s: %s", path, e)
+        return None
+
+class SnapshotWriter:
+    # Thread penulis di belakang: main loop cukup serahkan bytes, yang
+    # ditulis selalu versi terbaru (versi lama yang belum sempat ditulis dibuang).
+    def __init__(self, path):
+        self.path = path
+        self.pending = None
+        self.closed = False
+        self.writes = 0
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, data):
+        with self.cond:
+            self.pending = data
+            self.cond.notify()
+
+    def discard(self):
+        # Hapus save (misal game selesai / kembali ke menu)
+        self.submit(b"")
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.pending is None and not self.closed:
+                    self.cond.wait()
+                data, self.pending = self.pending, None
+                if data is None and self.closed:
+                    return
+            try:
+                if data:
+                    save_snapshot(self.path, data)
+                elif os.path.exists(self.path):
+                    os.remove(self.path)
+                self.writes += 1
+            except OSError as e:
+                log.error("Snapshot write failed: %s", e)
+
+    def close(self, timeout=2.0):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.thread.join(timeout)
+
+# --- SKOR ---
+# Rumus skor game (dipakai UI dan validasi batch di server)
+BASE_SCORE = 10000
+HINT_PENALTY = 1000
+MISTAKE_PENALTY = 500
+TIME_PENALTY = 2
+
+def compute_score(hints, mistakes, elapsed):
+    score = BASE_SCORE - hints * HINT_PENALTY - mistakes * MISTAKE_PENALTY - int(elapsed) * TIME_PENALTY
+    return max(0, score)
+
+# --- PUZZLE ID (SEED) ---
+# Puzzle ditentukan penuh oleh (versi generator, difficulty, seed). ID pendek
+# seperti "1Hk3x9q2a" cukup untuk membuat ulang puzzle dan solusi yang sama
+# (daily challenge, laporan bug, puzzle yang dibagikan): karakter pertama =
+# versi (base36), kedua = E/M/H, sisanya seed base36. Generasi memakai
+# random.Random(seed) sendiri dan batas percobaan, bukan deadline waktu.
+# Kalau algoritma generator berubah, tambahkan versi baru di
+# PUZZLE_GENERATORS dan biarkan versi lama tetap ada agar ID lama tetap valid.
+PUZZLE_ID_VERSION = 1
+PUZZLE_ID_DIFFICULTIES = {'E': ('Easy', 30), 'M': ('Medium', 45), 'H': ('Hard', 55)}
+# Pengganti deadline untuk start_game: ID tidak boleh bergantung pada jam,
+# jadi latensi dibatasi jumlah percobaan. Diukur (1 CPU, bench_generator.py):
+# Hard selesai dalam 1-2 percobaan (maks ~0.05s dari 60 seed); kasus
+# terburuk semua 50 percobaan habis ~1.8s, masih di bawah deadline 3s lama.
+PUZZLE_ID_ATTEMPTS = 50
+PUZZLE_SEED_BITS = 40
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+def _to_base36(n):
+    out = ""
+    while True:
+        n, d = divmod(n, 36)
+        out = _BASE36[d] + out
+        if n == 0:
+            return out
+
+def make_puzzle_id(difficulty, seed=None, version=PUZZLE_ID_VERSION):
+    # difficulty: "Easy"/"Medium"/"Hard" atau huruf E/M/H; seed acak kalau None
+    code = difficulty[:1].upper()
+    if code not in PUZZLE_ID_DIFFICULTIES:
+        raise ValueError(f"unknown difficulty: {difficulty!r}")
+    if not 0 <= version < 36:
+        raise ValueError("generator version must be between 0 and 35")
+    if seed is None:
+        seed = random.getrandbits(PUZZLE_SEED_BITS)
+    if seed < 0:
+        raise ValueError("seed must not be negative")
+    return f"{_BASE36[version]}{code}{_to_base36(seed)}"
+
+def parse_puzzle_id(puzzle_id):
+    # -> (versi, nama difficulty, removals, seed)
+    text = puzzle_id.strip()
+    version = _BASE36.find(text[:1].lower()) if text else -1
+    code = text[1:2].upper()
+    digits = text[2:].lower()
+    if version < 0 or code not in PUZZLE_ID_DIFFICULTIES or not digits or any(ch not in _BASE36 for ch in digits):
+        raise ValueError(f"invalid puzzle id: {puzzle_id!r}")
+    name, removals = PUZZLE_ID_DIFFICULTIES[code]
+    return version, name, removals, int(digits, 36)
+
+def _generate_v1(removals, seed):
+    # Semua parameter ditulis eksplisit: mengubah default generate_board tidak
+    # boleh mengubah puzzle dari ID versi 1 yang sudah dibagikan
+    return generate_board(removals, deadline=None, rng=random.Random(seed), stall_limit=20,
+                          orders_per_board=3, max_attempts=PUZZLE_ID_ATTEMPTS)
+
+PUZZLE_GENERATORS = {1: _generate_v1}
+
+class PuzzleCache:
+    # ID yang baru dibuat ulang disimpan (LRU), jadi membuka puzzle yang sama
+    # lagi (restart, daily challenge yang dibuka banyak orang di server) tidak
+    # menjalankan generator lagi. Yang dikembalikan selalu salinan.
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, puzzle_id):
+        version, name, removals, seed = parse_puzzle_id(puzzle_id)
+        key = (version, removals, seed)
+        entry = self.table.get(key)
+        if entry is not None:
+            self.table.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            gen = PUZZLE_GENERATORS.get(version)
+            if gen is None:
+                raise ValueError(f"unsupported generator version {version} in puzzle id {puzzle_id!r}")
+            with span("puzzle_from_id", puzzle_id=puzzle_id):
+                entry = gen(removals, seed)
+            if self.max_size > 0:
+                self.table[key] = entry
+                if len(self.table) > self.max_size:
+                    self.table.popitem(last=False)
+        puzzle, solution, stats = entry
+        return puzzle.copy(), solution.copy(), dict(stats)
+
+    def clear(self):
+        self.table.clear()
+
+puzzle_cache = PuzzleCache()
+
+def puzzle_from_id(puzzle_id, cache=None):
+    # (puzzle, solusi, stats) untuk ID; stats dari saat pertama kali dibuat
+    return (puzzle_cache if cache is None else cache).get(puzzle_id)
@@ -0,0 +1,287 @@
+# ==========================================
+# INDEKS DEDUP PUZZLE (BENTUK KANONIK + BLOOM FILTER + FILE HASH TERURUT)
+# Dua puzzle dianggap sama kalau yang satu bisa didapat dari yang lain lewat
+# simetri Sudoku: transpose, tukar band / stack, tukar baris dalam band,
+# tukar kolom dalam stack, dan ganti label angka.
+# - canonical_form: string 81 byte yang sama untuk semua puzzle sekelas.
+# - DedupIndex: hash 64-bit bentuk kanonik dicek di Bloom filter (memori
+#   tetap, O(1)); hanya kalau Bloom bilang "mungkin ada" dicek ke buffer
+#   hash baru dan file hash terurut di disk (binary search lewat mmap).
+#   Buffer di-merge ke file secara streaming, jadi memori tetap terbatas.
+# Contoh: python sudoku_dedup.py --index bank.idx --count 1000 --removals 45 --out bank.txt
+# ==========================================
+import argparse
+import hashlib
+import itertools
+import math
+import os
+import random
+import time
+
+import numpy as np
+
+from sudoku_csp import Board, generate_board, generate_puzzle
+from sudoku_trace import get_logger
+
+log = get_logger("dedup")
+
+DEDUP_FP_RATE = 0.01
+DEDUP_CAPACITY = 10000000
+DEDUP_FLUSH_EVERY = 100000
+MERGE_CHUNK = 1 << 20
+
+# --- BENTUK KANONIK ---
+# 1296 urutan baris (6 urutan band x 6^3 urutan baris dalam band), urutan
+# kolom memakai tabel yang sama.
+_PERM3 = list(itertools.permutations(range(3)))
+LINE_PERMS = np.array([[3 * bands[i] + inner[i][j] for i in range(3) for j in range(3)]
+                       for bands in _PERM3 for inner in itertools.product(_PERM3, repeat=3)], dtype=np.intp)
+_ROW_BAND = np.arange(9) // 3
+
+def _relabel_rows(digits, labels, next_label):
+    # Label ulang satu baris per state: angka yang sudah punya label memakai
+    # labelnya, angka baru diberi label berikutnya sesuai urutan kemunculan.
+    # labels / next_label diubah di tempat. Return nilai baris sebagai int
+    # desimal 9 digit (perbandingan int = perbandingan leksikografis).
+    ar = np.arange(len(digits))
+    val = np.zeros(len(digits), dtype=np.int64)
+    for j in range(9):
+        d = digits[:, j]
+        new = (d > 0) & (labels[ar, d] == 0)
+        labels[ar[new], d[new]] = next_label[new]
+        next_label[new] += 1
+        val = val * 10 + labels[ar, d]
+    return val
+
+def canonical_form(board):
+    # Bentuk kanonik = string terkecil (0 = kosong) dari semua transformasi
+    # yang labelnya diurutkan menurut kemunculan pertama. Label baris k hanya
+    # bergantung pada baris 0..k, jadi pencarian dibangun baris per baris dan
+    # hanya state yang menyamai minimum yang dilanjutkan.
+    # State = (transpose T, urutan baris sejauh ini R, urutan kolom P, label).
+    grid = np.frombuffer(bytes(board.cells), dtype=np.uint8).reshape(9, 9)
+    grids = np.stack([grid, grid.T])
+    rows = grids[:, :, LINE_PERMS]                     # (2, 9, 1296, 9)
+    n_perms = len(LINE_PERMS)
+    T = np.repeat(np.arange(2), 9 * n_perms)
+    R = np.tile(np.repeat(np.arange(9), n_perms), 2)[:, None]
+    P = np.tile(np.arange(n_perms), 18)
+    labels = np.zeros((len(T), 10), dtype=np.uint8)
+    next_label = np.ones(len(T), dtype=np.uint8)
+    out = []
+    for pos in range(9):
+        if pos == 0:
+            idx = np.arange(len(T))
+            nxt = R[:, 0]
+            R = R[:, :0]
+        else:
+            # Baris berikutnya: satu band dengan sebelumnya, atau baris
+            # pertama dari band yang belum dipakai
+            used = (R[:, :, None] == np.arange(9)).any(axis=1)
+            if pos % 3:
+                ok = (_ROW_BAND[None, :] == _ROW_BAND[R[:, -1]][:, None]) & ~used
+            else:
+                ok = ~used.reshape(-1, 3, 3).any(axis=2)[:, _ROW_BAND]
+            idx, nxt = np.nonzero(ok)
+        cand_labels = labels[idx]
+        cand_next = next_label[idx]
+        vals = _relabel_rows(rows[T[idx], nxt, P[idx]], cand_labels, cand_next)
+        best = vals.min()
+        keep = vals == best
+        idx, nxt = idx[keep], nxt[keep]
+        T, P = T[idx], P[idx]
+        R = np.concatenate([R[idx], nxt[:, None]], axis=1)
+        labels, next_label = cand_labels[keep], cand_next[keep]
+        out.append(f"{int(best):09d}")
+    return bytes(int(ch) for ch in "".join(out))
+
+def canonical_hash(board):
+    # 64-bit: peluang tabrakan ~n^2 / 2^65, kecil untuk ratusan juta puzzle
+    return int.from_bytes(hashlib.blake2b(canonical_form(board), digest_size=8).digest(), "little")
+
+# --- BLOOM FILTER ---
+class BloomFilter:
+    # k indeks dari satu hash 64-bit (double hashing h1 + i*h2)
+    def __init__(self, capacity=DEDUP_CAPACITY, fp_rate=DEDUP_FP_RATE):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.m = max(64, int(math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)))
+        self.k = max(1, int(round(self.m / capacity * math.log(2))))
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def _indexes(self, h):
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        m = self.m
+        return [(h1 + i * h2) % m for i in range(self.k)]
+
+    def add(self, h):
+        bits = self.bits
+        for i in self._indexes(h):
+            bits[i >> 3] |= 1 << (i & 7)
+
+    def __contains__(self, h):
+        bits = self.bits
+        return all(bits[i >> 3] >> (i & 7) & 1 for i in self._indexes(h))
+
+    def add_many(self, hashes):
+        # Versi numpy untuk membangun ulang dari file hash
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        view = np.frombuffer(self.bits, dtype=np.uint8)
+        for i in range(self.k):
+            idx = (h1 + np.uint64(i) * h2) % np.uint64(self.m)
+            np.bitwise_or.at(view, idx >> np.uint64(3), (np.uint64(1) << (idx & np.uint64(7))).astype(np.uint8))
+
+# --- INDEKS ---
+class DedupIndex:
+    # File: hash uint64 little-endian, terurut dan unik. Hash baru disimpan di
+    # set pending dan di-merge ke file setiap flush_every hash (atau close()).
+    def __init__(self, path, capacity=DEDUP_CAPACITY, fp_rate=DEDUP_FP_RATE, flush_every=DEDUP_FLUSH_EVERY):
+        self.path = path
+        self.flush_every = flush_every
+        self.bloom = BloomFilter(capacity, fp_rate)
+        self.pending = set()
+        self.disk = None
+        self.checked = 0
+        self.duplicates = 0
+        self.false_positives = 0
+        self._open_disk()
+        if len(self.disk):
+            for start in range(0, len(self.disk), MERGE_CHUNK):
+                self.bloom.add_many(self.disk[start:start + MERGE_CHUNK])
+            if len(self.disk) > capacity:
+                log.warning("Index has %d hashes, more than Bloom capacity %d: false-positive rate will rise",
+                            len(self.disk), capacity)
+            log.info("Loaded dedup index %s (%d hashes)", path, len(self.disk))
+
+    def _open_disk(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= 8:
+            self.disk = np.memmap(self.path, dtype="<u8", mode="r")
+        else:
+            self.disk = np.empty(0, dtype="<u8")
+
+    def __len__(self):
+        return len(self.disk) + len(self.pending)
+
+    def _on_disk(self, h):
+        i = np.searchsorted(self.disk, np.uint64(h))
+        return i < len(self.disk) and int(self.disk[i]) == h
+
+    def contains_hash(self, h):
+        if h not in self.bloom:
+            return False
+        if h in self.pending or self._on_disk(h):
+            return True
+        self.false_positives += 1
+        return False
+
+    def add_hash(self, h):
+        # True kalau hash baru (lalu disimpan), False kalau duplikat
+        self.checked += 1
+        if self.contains_hash(h):
+            self.duplicates += 1
+            return False
+        self.bloom.add(h)
+        self.pending.add(h)
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+        return True
+
+    def add(self, board):
+        return self.add_hash(canonical_hash(board))
+
+    def flush(self):
+        if not self.pending:
+            return
+        new = np.array(sorted(self.pending), dtype="<u8")
+        tmp = self.path + ".tmp"
+        old = self.disk
+        j = 0
+        with open(tmp, "wb") as f:
+            # Merge streaming: potongan file lama + hash baru yang <= ujung potongan
+            for start in range(0, len(old), MERGE_CHUNK):
+                chunk = np.asarray(old[start:start + MERGE_CHUNK])
+                k = int(np.searchsorted(new, chunk[-1], side="right"))
+                part = np.concatenate([chunk, new[j:k]])
+                part.sort(kind="mergesort")
+                f.write(part.tobytes())
+                j = k
+            f.write(new[j:].tobytes())
+        self.disk = None
+        del old
+        os.replace(tmp, self.path)
+        self.pending.clear()
+        self._open_disk()
+
+    def duplicate_rate(self):
+        return self.duplicates / self.checked if self.checked else 0.0
+
+    def stats(self):
+        return {
+            'checked': self.checked,
+            'duplicates': self.duplicates,
+            'duplicate_rate': self.duplicate_rate(),
+            'bloom_false_positives': self.false_positives,
+            'size': len(self),
+            'bloom_bytes': len(self.bloom.bits),
+        }
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+# --- GENERATE BANK TANPA DUPLIKAT ---
+def generate_unique(index, count, removals, generator="board", rng=None, max_attempts=None):
+    # Generator sampai count puzzle baru; return (puzzle baru, jumlah percobaan)
+    rng = rng or random
+    max_attempts = max_attempts or count * 10
+    found = []
+    attempts = 0
+    while len(found) < count and attempts < max_attempts:
+        attempts += 1
+        if generator == "board":
+            puzzle, _, _ = generate_board(removals, rng=rng)
+        else:
+            puzzle = Board.from_grid(generate_puzzle(removals)[0])
+        if index.add(puzzle):
+            found.append(puzzle)
+    return found, attempts
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate bank puzzle tanpa duplikat (sampai simetri)")
+    ap.add_argument("--index", required=True, help="file hash terurut (dibuat kalau belum ada)")
+    ap.add_argument("--count", type=int, default=100, help="jumlah puzzle baru")
+    ap.add_argument("--removals", type=int, default=45)
+    ap.add_argument("--generator", default="board", choices=["board", "legacy"])
+    ap.add_argument("--out", help="tambahkan puzzle baru ke file ini (satu per baris)")
+    ap.add_argument("--capacity", type=int, default=DEDUP_CAPACITY, help="kapasitas Bloom filter")
+    ap.add_argument("--fp-rate", type=float, default=DEDUP_FP_RATE)
+    ap.add_argument("--seed", type=int)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.seed is not None:
+        random.seed(args.seed)
+    t0 = time.perf_counter()
+    with DedupIndex(args.index, args.capacity, args.fp_rate) as index:
+        found, attempts = generate_unique(index, args.count, args.removals, args.generator, rng)
+        if args.out:
+            with open(args.out, "a") as f:
+                f.writelines(p.to_string() + "\n" for p in found)
+        stats = index.stats()
+    elapsed = time.perf_counter() - t0
+    print(f"{len(found)} new puzzles from {attempts} generated in {elapsed:.1f}s")
+    print(f"duplicates {stats['duplicates']} ({stats['duplicate_rate']:.2%}), "
+          f"bloom false positives {stats['bloom_false_positives']}, "
+          f"index size {stats['size']}, bloom {stats['bloom_bytes'] / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
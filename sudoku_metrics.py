@@ -0,0 +1,197 @@
+# ==========================================
+# METRICS (COUNTER & HISTOGRAM, FORMAT PROMETHEUS)
+# Update dari main loop cuma operasi int/float biasa tanpa lock (GIL cukup,
+# hanya main thread yang menulis). Thread exporter membaca salinannya dan
+# menulis file teks Prometheus secara berkala dan/atau melayani
+# http://127.0.0.1:<port>/metrics.
+# Aktif lewat env SUDOKU_METRICS_FILE=<path> dan/atau SUDOKU_METRICS_PORT=<port>.
+# ==========================================
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sudoku_trace import get_logger
+
+log = get_logger("metrics")
+
+METRICS_FILE_ENV = "SUDOKU_METRICS_FILE"
+METRICS_PORT_ENV = "SUDOKU_METRICS_PORT"
+METRICS_INTERVAL = 10.0
+
+# Bucket default (detik) untuk latency
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FRAME_BUCKETS = (0.002, 0.004, 0.008, 0.0167, 0.033, 0.05, 0.1, 0.25, 1.0)
+NODE_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+def _label_str(names, values):
+    if not names:
+        return ""
+    parts = []
+    for n, v in zip(names, values):
+        v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{n}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+def _num(v):
+    if v == float("inf"):
+        return "+Inf"
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return repr(v) if isinstance(v, float) else str(v)
+
+class MetricCounter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        # Counter tanpa label langsung tampil sebagai 0
+        self.values = {} if self.labels else {(): 0}
+
+    def inc(self, amount=1, labels=()):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        return self.values.get(labels, 0)
+
+    def render(self):
+        lines = []
+        for labels, v in sorted(self.values.copy().items()):
+            lines.append(f"{self.name}{_label_str(self.labels, labels)} {_num(v)}")
+        return lines
+
+class MetricHistogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS, labels=()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.labels = tuple(labels)
+        # labels -> [counts per bucket (+Inf terakhir), sum, count]
+        self.series = {}
+
+    def observe(self, value, labels=()):
+        s = self.series.get(labels)
+        if s is None:
+            s = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        s[0][bisect.bisect_left(self.buckets, value)] += 1
+        s[1] += value
+        s[2] += 1
+
+    def count(self, labels=()):
+        s = self.series.get(labels)
+        return s[2] if s else 0
+
+    def render(self):
+        lines = []
+        for labels, (counts, total, n) in sorted(self.series.copy().items()):
+            counts = list(counts)
+            cum = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cum += c
+                lbl = _label_str(self.labels + ("le",), labels + (_num(bound),))
+                lines.append(f"{self.name}_bucket{lbl} {cum}")
+            lbl = _label_str(self.labels, labels)
+            lines.append(f"{self.name}_sum{lbl} {_num(total)}")
+            lines.append(f"{self.name}_count{lbl} {n}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, help_text, labels=()):
+        m = MetricCounter(name, help_text, labels)
+        self.metrics.append(m)
+        return m
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS, labels=()):
+        m = MetricHistogram(name, help_text, buckets, labels)
+        self.metrics.append(m)
+        return m
+
+    def render(self):
+        # Format teks exposition Prometheus 0.0.4
+        lines = []
+        for m in self.metrics:
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        # Atomic: node_exporter textfile collector tidak pernah baca file setengah jadi
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+class MetricsExporter:
+    def __init__(self, registry, path=None, port=None, interval=METRICS_INTERVAL):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.server = None
+        self.threads = []
+        if path:
+            t = threading.Thread(target=self._file_loop, name="metrics-file", daemon=True)
+            t.start()
+            self.threads.append(t)
+        if port is not None:
+            self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+            t = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def _handler(self):
+        registry = self.registry
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+        return Handler
+
+    def _file_loop(self):
+        while not self.stopped.wait(self.interval):
+            self._write_file()
+
+    def _write_file(self):
+        try:
+            self.registry.write(self.path)
+        except OSError as e:
+            log.error("Metrics write failed: %s", e)
+
+    def close(self):
+        self.stopped.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.path:
+            self._write_file()
+
+def exporter_from_env(registry, environ=None):
+    # None kalau tidak ada SUDOKU_METRICS_FILE / SUDOKU_METRICS_PORT
+    environ = os.environ if environ is None else environ
+    path = environ.get(METRICS_FILE_ENV) or None
+    port = environ.get(METRICS_PORT_ENV)
+    port = int(port) if port else None
+    if path is None and port is None:
+        return None
+    exporter = MetricsExporter(registry, path, port)
+    where = " and ".join(w for w in (path and f"file {path}", port is not None and f"http://127.0.0.1:{port}/metrics") if w)
+    log.info("Metrics export enabled: %s", where)
+    return exporter
@@ -0,0 +1,171 @@
+# ==========================================
+# PROFILING OPT-IN (cProfile / SAMPLER)
+# Aktif lewat env SUDOKU_PROFILE=cprofile|sample atau flag --profile[=mode].
+# Kalau tidak aktif tidak ada fungsi yang dibungkus sama sekali, jadi
+# overhead-nya cuma satu cek `if profiler` per frame.
+# Hasil: profiles/profile-<pid>-<n>.pstats (buka dengan pstats / snakeviz)
+# atau .collapsed (untuk flamegraph.pl / speedscope), ditulis saat exit
+# atau saat dump() dipanggil (hotkey F9 di jafar.py).
+# ==========================================
+import atexit
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+from sudoku_trace import get_logger
+
+log = get_logger("profile")
+
+PROFILE_ENV = "SUDOKU_PROFILE"
+PROFILE_DIR_ENV = "SUDOKU_PROFILE_DIR"
+PROFILE_MODES = ("cprofile", "sample")
+SAMPLE_INTERVAL = 0.005
+_THIS_FILE = __file__
+
+class Profiler:
+    def __init__(self, mode="cprofile", out_dir="profiles", interval=SAMPLE_INTERVAL):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"unknown profile mode: {mode}")
+        self.mode = mode
+        self.out_dir = out_dir
+        self.interval = interval
+        self.depth = 0
+        self.phase = None
+        self.t0 = 0.0
+        self.dumps = 0
+        self.calls = Counter()
+        self.wall = Counter()
+        self.closed = False
+        if mode == "cprofile":
+            self.prof = cProfile.Profile()
+        else:
+            self.stacks = Counter()
+            self.thread_id = threading.get_ident()
+            self.sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+            self.sampler.start()
+
+    # Hanya region terluar yang dihitung: frame -> provide_hint -> solve
+    # masuk ke phase "frame", fungsi dalamnya tetap terlihat di stack.
+    def start(self, phase):
+        self.depth += 1
+        if self.depth == 1:
+            self.phase = phase
+            self.t0 = time.perf_counter()
+            if self.mode == "cprofile":
+                self.prof.enable()
+
+    def stop(self):
+        self.depth -= 1
+        if self.depth == 0:
+            if self.mode == "cprofile":
+                self.prof.disable()
+            self.calls[self.phase] += 1
+            self.wall[self.phase] += time.perf_counter() - self.t0
+            self.phase = None
+
+    def wrap(self, name, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            self.start(name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.stop()
+        return wrapper
+
+    def install(self, namespace, names):
+        # Ganti fungsi di namespace (globals() modul) dengan versi terbungkus
+        for name in names:
+            if name in namespace:
+                namespace[name] = self.wrap(name, namespace[name])
+
+    def _sample_loop(self):
+        while not self.closed:
+            time.sleep(self.interval)
+            phase = self.phase
+            if phase is None:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                # Frame wrapper milik modul ini tidak ikut di flame graph
+                if code.co_filename != _THIS_FILE:
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            stack.append(phase)
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def summary(self):
+        lines = [f"{'phase':<20} {'calls':>7} {'total':>10}"]
+        for phase, total in self.wall.most_common():
+            lines.append(f"{phase:<20} {self.calls[phase]:>7} {total * 1000:>8.1f}ms")
+        return "\n".join(lines)
+
+    def dump(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.dumps += 1
+        base = os.path.join(self.out_dir, f"profile-{os.getpid()}-{self.dumps}")
+        if self.mode == "cprofile":
+            path = base + ".pstats"
+            self.prof.dump_stats(path)
+            if self.depth > 0:
+                # dump_stats mematikan profiler; lanjutkan region yang sedang jalan
+                self.prof.enable()
+        else:
+            path = base + ".collapsed"
+            with open(path, "w") as f:
+                for stack, count in sorted(self.stacks.items()):
+                    f.write(f"{stack} {count}\n")
+        with open(base + ".txt", "w") as f:
+            f.write(self.summary() + "\n")
+            if self.mode == "cprofile":
+                out = io.StringIO()
+                pstats.Stats(path, stream=out).sort_stats("cumulative").print_stats(30)
+                f.write(out.getvalue())
+        log.info("Profile written to %s", path)
+        return path
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.dump()
+
+def profile_mode(argv=None, environ=None):
+    # Mode dari flag --profile / --profile=sample, lalu env SUDOKU_PROFILE
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    for arg in argv[1:]:
+        if arg == "--profile":
+            return "cprofile"
+        if arg.startswith("--profile="):
+            return arg.split("=", 1)[1]
+    mode = environ.get(PROFILE_ENV, "").strip().lower()
+    if mode in ("", "0", "off", "no"):
+        return None
+    if mode in ("1", "on", "yes"):
+        return "cprofile"
+    return mode
+
+def profiler_from_env(argv=None, environ=None):
+    # None kalau profiling tidak diminta
+    mode = profile_mode(argv, environ)
+    if mode is None:
+        return None
+    if mode not in PROFILE_MODES:
+        # Salah ketik di env/flag tidak boleh membuat game gagal start
+        log.warning("Unknown profile mode %r (expected one of %s), profiling disabled",
+                    mode, ", ".join(PROFILE_MODES))
+        return None
+    environ = os.environ if environ is None else environ
+    profiler = Profiler(mode, environ.get(PROFILE_DIR_ENV, "profiles"))
+    atexit.register(profiler.close)
+    log.info("Profiling enabled (%s), output in %s/", mode, profiler.out_dir)
+    return profiler
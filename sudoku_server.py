@@ -0,0 +1,485 @@
+# ==========================================
+# SERVICE SOLVER / GENERATOR LOKAL
+# Proses jangka panjang untuk backend web, jadi tidak ada start pygame /
+# import ulang per request. Protokol: satu objek JSON per baris lewat Unix
+# socket atau TCP localhost. Respons membawa "id" yang sama; request boleh
+# di-pipeline dan urutan respons bisa beda dengan urutan request.
+#   {"id": 1, "op": "solve", "puzzle": "<81 karakter, 0/. = kosong>"}
+#   {"id": 2, "op": "count", "puzzle": "...", "max_count": 2}
+#   {"id": 3, "op": "validate", "grid": "...", "puzzle": "...", "solution": "...",
+#    "hints": 0, "mistakes": 0, "elapsed": 120}
+#   {"id": 4, "op": "generate", "difficulty": "Hard"}      (atau "removals": 50)
+#   {"id": 7, "op": "generate", "puzzle_id": "1Hk3x9q2a"}  (atau "difficulty" + "seed": hasil selalu sama)
+#   {"id": 5, "op": "ping"} / {"id": 6, "op": "stats"}     (dijawab langsung)
+# Field opsional "deadline_ms" per request. Respons gagal:
+#   {"id": ..., "ok": false, "error": "busy|deadline_exceeded|bad_request|internal", "message": ...}
+# Request dikumpulkan jadi batch dan dikirim ke pool worker yang di-fork sekali
+# di awal (modul solver di-load sekali per worker). Antrian dibatasi: kalau
+# penuh request langsung dijawab "busy" (backpressure).
+# Contoh: python sudoku_server.py --socket /tmp/sudoku.sock --workers 4
+#         python sudoku_server.py --port 8765
+# ==========================================
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import signal
+import socketserver
+import stat
+import threading
+import time
+
+import numpy as np
+
+from sudoku_csp import (Board, solve_board, count_solutions_board, generate_board, make_puzzle_id, puzzle_from_id,
+                        PUZZLE_ID_DIFFICULTIES)
+from sudoku_batch import validate_batch, VERDICT_NAMES
+from sudoku_metrics import MetricsRegistry, exporter_from_env, NODE_BUCKETS
+from sudoku_trace import get_logger
+
+log = get_logger("server")
+
+DIFFICULTIES = dict(PUZZLE_ID_DIFFICULTIES.values())
+WORKER_OPS = ('solve', 'count', 'validate', 'generate')
+LOCAL_OPS = ('ping', 'stats')
+GEN_DEADLINE = 3.0          # kalau request generate acak tidak memberi deadline
+MAX_COUNT_LIMIT = 1000
+MAX_LINE = 64 * 1024
+BATCH_MAX = 64
+MAX_PENDING = 1024
+DRAIN_TIMEOUT = 30.0
+
+def bad_request(message):
+    return {'ok': False, 'error': 'bad_request', 'message': message}
+
+DEADLINE_EXCEEDED = {'ok': False, 'error': 'deadline_exceeded', 'message': 'deadline passed before a worker started the request'}
+DEADLINE_EXCEEDED_RUNNING = {'ok': False, 'error': 'deadline_exceeded', 'message': 'deadline passed while the request was running'}
+
+def internal_error(exc):
+    return {'ok': False, 'error': 'internal', 'message': str(exc)}
+
+# --- WORKER ---
+# Jalan di proses pool. Satu batch = list (op, params, deadline) dengan
+# deadline waktu absolut time.time() (atau None).
+def _init_worker():
+    # Ctrl+C ditangani proses utama; state random hasil fork harus dipisah
+    # supaya worker tidak menghasilkan puzzle yang sama
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    random.seed()
+
+def _board(params, key):
+    text = params.get(key)
+    if not isinstance(text, str):
+        raise ValueError(f"'{key}' must be an 81-character string")
+    return Board.from_string(text)
+
+# solve/count: deadline request jadi batas waktu pencarian, dicek di dalam
+# search_n; kalau habis, respons deadline_exceeded
+def op_solve(params, deadline):
+    stats = {}
+    solution = solve_board(_board(params, 'puzzle'), stats, deadline)
+    if stats['limit_hit']:
+        return DEADLINE_EXCEEDED_RUNNING
+    return {'ok': True, 'solution': solution.to_string() if solution else None, 'nodes': stats.get('nodes', 0)}
+
+def op_count(params, deadline):
+    max_count = int(params.get('max_count', 2))
+    if not 1 <= max_count <= MAX_COUNT_LIMIT:
+        raise ValueError(f"max_count must be between 1 and {MAX_COUNT_LIMIT}")
+    stats = {}
+    count = count_solutions_board(_board(params, 'puzzle'), max_count, deadline, stats)
+    if stats['limit_hit']:
+        return DEADLINE_EXCEEDED_RUNNING
+    return {'ok': True, 'count': count}
+
+def op_generate(params, deadline):
+    if 'puzzle_id' in params or 'seed' in params:
+        # Puzzle dari ID: deterministik, jadi deadline tidak dipakai
+        pid = params.get('puzzle_id')
+        if pid is None:
+            pid = make_puzzle_id(str(params.get('difficulty', 'Medium')), int(params['seed']))
+        puzzle, solution, stats = puzzle_from_id(str(pid))
+        return {'ok': True, 'puzzle': puzzle.to_string(), 'solution': solution.to_string(),
+                'clues': stats['clues'], 'timed_out': stats['timed_out'], 'puzzle_id': pid}
+    removals = params.get('removals')
+    if removals is None:
+        difficulty = params.get('difficulty', 'Medium')
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"unknown difficulty: {difficulty!r}")
+        removals = DIFFICULTIES[difficulty]
+    removals = int(removals)
+    if not 0 <= removals <= 64:
+        raise ValueError("removals must be between 0 and 64")
+    # Deadline request diteruskan ke generator: hasil terbaik sejauh ini
+    gen_deadline = GEN_DEADLINE if deadline is None else max(0.0, deadline - time.time())
+    puzzle, solution, stats = generate_board(removals, deadline=gen_deadline)
+    return {'ok': True, 'puzzle': puzzle.to_string(), 'solution': solution.to_string(),
+            'clues': stats['clues'], 'timed_out': stats['timed_out']}
+
+def validate_many(jobs):
+    # Semua validate dalam satu batch dicek sekaligus dengan validate_batch (numpy)
+    out = [None] * len(jobs)
+    rows = []
+    for i, params in enumerate(jobs):
+        try:
+            grid = _board(params, 'grid').cells
+            puzzle = _board(params, 'puzzle').cells
+            solution = params.get('solution')
+            solution = _board(params, 'solution').cells if solution is not None else None
+            score_args = (int(params.get('hints', 0)), int(params.get('mistakes', 0)), int(params.get('elapsed', 0)))
+        except (ValueError, TypeError) as e:
+            out[i] = bad_request(str(e))
+            continue
+        rows.append((i, grid, puzzle, solution, score_args))
+    # Dengan dan tanpa solution dipisah karena validate_batch menerima satu mode per panggilan
+    for with_solution in (False, True):
+        group = [row for row in rows if (row[3] is not None) == with_solution]
+        if not group:
+            continue
+        grids = np.frombuffer(b"".join(row[1] for row in group), dtype=np.uint8).reshape(-1, 81)
+        puzzles = np.frombuffer(b"".join(row[2] for row in group), dtype=np.uint8).reshape(-1, 81)
+        solutions = None
+        if with_solution:
+            solutions = np.frombuffer(b"".join(row[3] for row in group), dtype=np.uint8).reshape(-1, 81)
+        hints, mistakes, elapsed = zip(*(row[4] for row in group))
+        try:
+            res = validate_batch(grids, puzzles, solutions, hints, mistakes, elapsed)
+        except Exception as e:
+            log.error("Validate batch failed: %r", e)
+            for row in group:
+                out[row[0]] = internal_error(e)
+            continue
+        for k, row in enumerate(group):
+            out[row[0]] = {'ok': True, 'verdict': VERDICT_NAMES[res['verdict'][k]],
+                           'valid': bool(res['valid'][k]), 'score': int(res['score'][k])}
+    return out
+
+OPS = {'solve': op_solve, 'count': op_count, 'generate': op_generate}
+
+def run_batch(jobs):
+    out = [None] * len(jobs)
+    validates = []
+    for i, (op, params, deadline) in enumerate(jobs):
+        if deadline is not None and time.time() >= deadline:
+            out[i] = DEADLINE_EXCEEDED
+        elif op == 'validate':
+            validates.append(i)
+        else:
+            # Error ditangkap per request: satu request rusak tidak
+            # menggagalkan seluruh batch
+            try:
+                out[i] = OPS[op](params, deadline)
+            except (ValueError, TypeError) as e:
+                out[i] = bad_request(str(e))
+            except Exception as e:
+                log.error("%s request failed: %r", op, e)
+                out[i] = internal_error(e)
+    if validates:
+        for i, res in zip(validates, validate_many([jobs[i][1] for i in validates])):
+            out[i] = res
+    return out
+
+# --- PROSES UTAMA ---
+class BadRequest(Exception):
+    def __init__(self, req_id, message):
+        super().__init__(message)
+        self.req_id = req_id
+        self.message = message
+
+class Request:
+    __slots__ = ('id', 'op', 'params', 'deadline', 't0', 'conn')
+
+    def __init__(self, req_id, op, params, deadline, conn):
+        self.id = req_id
+        self.op = op
+        self.params = params
+        self.deadline = deadline
+        self.t0 = time.perf_counter()
+        self.conn = conn
+
+    def expired(self):
+        return self.deadline is not None and time.time() >= self.deadline
+
+class Connection:
+    # Respons ditulis thread sendiri per koneksi, jadi client yang lambat
+    # membaca tidak menahan thread hasil pool (yang melayani semua koneksi).
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.out = queue.Queue()
+        self.outstanding = 0
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="conn-writer", daemon=True)
+        self.thread.start()
+
+    def begin(self):
+        with self.cond:
+            self.outstanding += 1
+
+    def send(self, msg, finished=False):
+        self.out.put(msg)
+        if finished:
+            with self.cond:
+                self.outstanding -= 1
+                self.cond.notify_all()
+
+    def _run(self):
+        alive = True
+        while True:
+            batch = [self.out.get()]
+            while True:
+                try:
+                    batch.append(self.out.get_nowait())
+                except queue.Empty:
+                    break
+            done = batch[-1] is None
+            if done:
+                batch.pop()
+            if alive and batch:
+                try:
+                    self.wfile.write(b"".join(json.dumps(m, separators=(",", ":")).encode() + b"\n" for m in batch))
+                    self.wfile.flush()
+                except OSError:
+                    # Client sudah pergi: sisa respons dibuang
+                    alive = False
+            if done:
+                return
+
+    def close(self):
+        # Tunggu respons request yang masih jalan (client boleh half-close
+        # setelah mengirim semua request), lalu hentikan writer
+        with self.cond:
+            self.cond.wait_for(lambda: self.outstanding == 0, DRAIN_TIMEOUT)
+        self.out.put(None)
+        self.thread.join(DRAIN_TIMEOUT)
+
+class Dispatcher:
+    # Batch terbentuk sendiri: selama semua slot in-flight terpakai request
+    # menumpuk di antrian, lalu diambil sekaligus (maks batch_max). Saat sepi
+    # batch berisi satu request tanpa menunggu timer.
+    # generate selalu dikirim sendiri karena jauh lebih lama dari solve/validate.
+    def __init__(self, service, workers, batch_max=BATCH_MAX, max_pending=MAX_PENDING):
+        self.service = service
+        self.workers = workers
+        self.batch_max = batch_max
+        self.pool = multiprocessing.Pool(workers, initializer=_init_worker)
+        self.pending = queue.Queue(max_pending)
+        self.slots = threading.BoundedSemaphore(workers * 2)
+        self.carry = None
+        self.thread = threading.Thread(target=self._run, name="dispatcher", daemon=True)
+        self.thread.start()
+
+    def submit(self, req):
+        try:
+            self.pending.put_nowait(req)
+        except queue.Full:
+            self.service.finish(req, {'ok': False, 'error': 'busy', 'message': 'request queue is full, retry later'})
+
+    def _next(self, block):
+        if self.carry is not None:
+            req, self.carry = self.carry, None
+            return req
+        return self.pending.get() if block else self.pending.get_nowait()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._next(True)
+            if first is None:
+                return
+            self.slots.acquire()
+            batch = [first]
+            if first.op != 'generate':
+                while len(batch) < self.batch_max:
+                    try:
+                        req = self._next(False)
+                    except queue.Empty:
+                        break
+                    if req is None:
+                        stopping = True
+                        break
+                    if req.op == 'generate':
+                        self.carry = req
+                        break
+                    batch.append(req)
+            live = []
+            for req in batch:
+                if req.expired():
+                    self.service.finish(req, DEADLINE_EXCEEDED)
+                else:
+                    live.append(req)
+            if live:
+                self._dispatch(live)
+            else:
+                self.slots.release()
+
+    def _dispatch(self, batch):
+        self.service.observe_batch(len(batch))
+        jobs = [(r.op, r.params, r.deadline) for r in batch]
+
+        def done(results):
+            self.slots.release()
+            for req, res in zip(batch, results):
+                self.service.finish(req, res)
+
+        def failed(exc):
+            self.slots.release()
+            log.error("Worker batch failed: %r", exc)
+            for req in batch:
+                self.service.finish(req, internal_error(exc))
+
+        self.pool.apply_async(run_batch, (jobs,), callback=done, error_callback=failed)
+
+    def queue_depth(self):
+        return self.pending.qsize()
+
+    def close(self):
+        self.pending.put(None)
+        self.thread.join(DRAIN_TIMEOUT)
+        self.pool.close()
+        self.pool.join()
+
+class SolverService:
+    def __init__(self, workers, batch_max=BATCH_MAX, max_pending=MAX_PENDING, default_deadline_ms=None):
+        self.default_deadline_ms = default_deadline_ms
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.metrics = MetricsRegistry()
+        self.m_requests = self.metrics.counter("sudoku_server_requests_total", "Requests by op and result", labels=("op", "status"))
+        self.m_latency = self.metrics.histogram("sudoku_server_request_seconds", "Time from receiving a request to queuing its response", labels=("op",))
+        self.m_batch = self.metrics.histogram("sudoku_server_batch_size", "Requests per worker batch", buckets=NODE_BUCKETS)
+        # Pool di-fork sebelum thread server jalan
+        self.dispatcher = Dispatcher(self, workers, batch_max, max_pending)
+        self.exporter = exporter_from_env(self.metrics)
+
+    def parse(self, line, conn):
+        try:
+            msg = json.loads(line)
+        except ValueError as e:
+            raise BadRequest(None, f"invalid JSON: {e}")
+        if not isinstance(msg, dict):
+            raise BadRequest(None, "request must be a JSON object")
+        op = msg.get('op')
+        if op not in WORKER_OPS and op not in LOCAL_OPS:
+            raise BadRequest(msg.get('id'), f"unknown op: {op!r}")
+        deadline_ms = msg.get('deadline_ms', self.default_deadline_ms)
+        deadline = None
+        if deadline_ms is not None:
+            try:
+                deadline = time.time() + float(deadline_ms) / 1000.0
+            except (TypeError, ValueError):
+                raise BadRequest(msg.get('id'), "deadline_ms must be a number")
+        # Hanya field yang dibutuhkan worker yang ikut di-pickle
+        params = {k: v for k, v in msg.items() if k not in ('id', 'op', 'deadline_ms')}
+        return Request(msg.get('id'), op, params, deadline, conn)
+
+    def handle_line(self, line, conn):
+        try:
+            req = self.parse(line, conn)
+        except BadRequest as e:
+            with self.lock:
+                self.m_requests.inc(labels=("invalid", "bad_request"))
+            conn.send(dict(bad_request(e.message), id=e.req_id))
+            return
+        conn.begin()
+        if req.op == 'ping':
+            self.finish(req, {'ok': True})
+        elif req.op == 'stats':
+            self.finish(req, dict(self.stats(), ok=True))
+        else:
+            self.dispatcher.submit(req)
+
+    def finish(self, req, result):
+        msg = dict(result, id=req.id)
+        status = 'ok' if result.get('ok') else result.get('error', 'internal')
+        with self.lock:
+            self.m_requests.inc(labels=(req.op, status))
+            self.m_latency.observe(time.perf_counter() - req.t0, labels=(req.op,))
+        req.conn.send(msg, finished=True)
+
+    def observe_batch(self, n):
+        with self.lock:
+            self.m_batch.observe(n)
+
+    def stats(self):
+        with self.lock:
+            counts = {f"{op}:{status}": v for (op, status), v in sorted(self.m_requests.values.items())}
+            batches = self.m_batch.series.get(())
+            avg_batch = batches[1] / batches[2] if batches else 0.0
+        return {'uptime': time.time() - self.started, 'workers': self.dispatcher.workers,
+                'queue_depth': self.dispatcher.queue_depth(), 'requests': counts, 'avg_batch': avg_batch}
+
+    def close(self):
+        self.dispatcher.close()
+        if self.exporter:
+            self.exporter.close()
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        service = self.server.service
+        conn = Connection(self.wfile)
+        try:
+            while True:
+                line = self.rfile.readline(MAX_LINE)
+                if not line:
+                    break
+                if not line.endswith(b"\n") and len(line) >= MAX_LINE:
+                    conn.send(dict(bad_request(f"request line longer than {MAX_LINE} bytes"), id=None))
+                    break
+                line = line.strip()
+                if line:
+                    service.handle_line(line, conn)
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+class UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+class TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def make_server(service, socket_path=None, host="127.0.0.1", port=None):
+    if socket_path:
+        # Socket sisa proses lama dihapus; file biasa tidak disentuh
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.unlink(socket_path)
+        server = UnixServer(socket_path, Handler)
+    else:
+        server = TCPServer((host, port), Handler)
+    server.service = service
+    return server
+
+def main():
+    ap = argparse.ArgumentParser(description="Service solver/generator Sudoku (JSON per baris)")
+    where = ap.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", help="path Unix socket")
+    where.add_argument("--port", type=int, help="port TCP (hanya 127.0.0.1 kecuali --host)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--batch-max", type=int, default=BATCH_MAX, help="request maksimum per batch worker")
+    ap.add_argument("--max-pending", type=int, default=MAX_PENDING, help="panjang antrian sebelum request ditolak 'busy'")
+    ap.add_argument("--deadline-ms", type=float, help="deadline default untuk request tanpa deadline_ms")
+    args = ap.parse_args()
+
+    service = SolverService(args.workers, args.batch_max, args.max_pending, args.deadline_ms)
+    server = make_server(service, args.socket, args.host, args.port)
+    # SIGTERM -> shutdown() dari thread lain (serve_forever jalan di thread ini)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    log.info("Listening on %s with %d workers", args.socket or f"{args.host}:{server.server_address[1]}", args.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+        log.info("Server stopped")
+
+if __name__ == "__main__":
+    main()
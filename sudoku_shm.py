@@ -0,0 +1,144 @@
+# ==========================================
+# BATCH SOLVE MULTI-PROSES LEWAT SHARED MEMORY
+# Parent menulis puzzle (81 byte per papan) ke satu buffer
+# multiprocessing.shared_memory. Worker membaca potongannya, lalu menulis
+# solusi dan kode status langsung di buffer yang sama. Yang lewat pipe ke
+# worker cuma (nama buffer, kapasitas, start, end), dan yang kembali cuma
+# jumlah puzzle yang terpecahkan.
+# Layout buffer dengan kapasitas N:
+#   [0, 81N)      puzzle
+#   [81N, 162N)   solusi (0 semua kalau tidak ada)
+#   [162N, 163N)  status per puzzle (SHM_*)
+# solve_batch_pickle adalah pembanding: pool.map biasa dengan grid list
+# bersarang yang di-pickle bolak-balik (lihat bench_shm.py).
+# ==========================================
+import multiprocessing
+import os
+from multiprocessing import resource_tracker, shared_memory
+
+from sudoku_csp import Board, solve_board
+from sudoku_trace import get_logger
+
+log = get_logger("shm")
+
+SHM_PENDING = 0
+SHM_SOLVED = 1
+SHM_UNSOLVABLE = 2
+SHM_ROW = 81 + 81 + 1
+# Potongan per task: cukup banyak supaya worker seimbang, cukup besar
+# supaya overhead per task kecil
+CHUNKS_PER_WORKER = 4
+
+# --- WORKER ---
+# Buffer yang sudah di-attach disimpan per nama; kalau parent membuat
+# buffer baru (batch lebih besar), yang lama ditutup.
+_attached = {}
+
+def _attach(name):
+    shm = _attached.get(name)
+    if shm is None:
+        for old in _attached.values():
+            old.close()
+        _attached.clear()
+        shm = _attached[name] = shared_memory.SharedMemory(name=name)
+    return shm
+
+def _solve_range(args):
+    name, capacity, start, end = args
+    buf = _attach(name).buf
+    sol_base = capacity * 81
+    status_base = capacity * 162
+    solved = 0
+    for i in range(start, end):
+        solution = solve_board(Board(buf[i * 81:i * 81 + 81]))
+        if solution is None:
+            buf[status_base + i] = SHM_UNSOLVABLE
+        else:
+            buf[sol_base + i * 81:sol_base + i * 81 + 81] = solution.cells
+            buf[status_base + i] = SHM_SOLVED
+            solved += 1
+    return solved
+
+def _solve_grid_job(grid):
+    solution = solve_board(Board.from_grid(grid))
+    return solution.to_grid() if solution is not None else None
+
+# --- PARENT ---
+def split_ranges(n, workers, chunk=None):
+    if chunk is None:
+        chunk = max(1, -(-n // (workers * CHUNKS_PER_WORKER)))
+    return [(start, min(start + chunk, n)) for start in range(0, n, chunk)]
+
+class ShmBatchSolver:
+    # Pool dan buffer dipakai ulang antar batch; buffer hanya dibuat ulang
+    # kalau batch lebih besar dari kapasitasnya.
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        # Tracker dijalankan sebelum fork supaya worker memakai tracker yang
+        # sama; kalau tidak, tiap worker punya tracker sendiri yang meng-unlink
+        # buffer saat worker keluar
+        resource_tracker.ensure_running()
+        self.pool = multiprocessing.Pool(self.workers)
+        self.shm = None
+        self.capacity = 0
+
+    def _reserve(self, n):
+        if n <= self.capacity:
+            return
+        self._release()
+        self.shm = shared_memory.SharedMemory(create=True, size=max(n, 1) * SHM_ROW)
+        self.capacity = max(n, 1)
+
+    def _release(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+            self.capacity = 0
+
+    def solve_raw(self, cells, chunk=None):
+        # cells: bytes 81*n (atau bytearray/memoryview). Return (solusi 81*n
+        # bytes, status n bytes) disalin dari buffer.
+        n = len(cells) // 81
+        if len(cells) != n * 81:
+            raise ValueError("cells length must be a multiple of 81")
+        self._reserve(n)
+        cap = self.capacity
+        buf = self.shm.buf
+        buf[:n * 81] = cells
+        buf[cap * 162:cap * 162 + n] = bytes(n)
+        tasks = [(self.shm.name, cap, start, end) for start, end in split_ranges(n, self.workers, chunk)]
+        solved = sum(self.pool.imap_unordered(_solve_range, tasks))
+        log.debug("Shared-memory batch: %d puzzles, %d solved, %d tasks", n, solved, len(tasks))
+        return bytes(buf[cap * 81:cap * 81 + n * 81]), bytes(buf[cap * 162:cap * 162 + n])
+
+    def solve(self, boards, chunk=None):
+        # Daftar Board -> (daftar solusi Board atau None, status bytes)
+        solutions, status = self.solve_raw(b"".join(b.cells for b in boards), chunk)
+        out = []
+        for i, board in enumerate(boards):
+            if status[i] == SHM_SOLVED:
+                out.append(Board(solutions[i * 81:i * 81 + 81], board.givens))
+            else:
+                out.append(None)
+        return out, status
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def solve_batch_pickle(pool, grids, workers, chunk=None):
+    # Cara lama: setiap grid dan solusi (list 9x9) di-pickle lewat pipe
+    if chunk is None:
+        chunk = max(1, -(-len(grids) // (workers * CHUNKS_PER_WORKER)))
+    return pool.map(_solve_grid_job, grids, chunksize=chunk)
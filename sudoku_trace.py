@@ -0,0 +1,196 @@
+# ==========================================
+# LOGGING BERLEVEL & TIMING SPAN (CHROME TRACE)
+# Pengganti print("[DEBUG] ...") yang sinkron dan selalu ke stdout:
+# - get_logger(nama) = logger stdlib "sudoku.<nama>", difilter per level
+#   (SUDOKU_LOG_LEVEL, default INFO). Record lewat QueueHandler ke
+#   QueueListener (thread terpisah) yang menulis ke stderr atau
+#   SUDOKU_LOG_FILE, jadi pemanggil tidak menunggu I/O.
+# - Aman setelah fork (worker pool): proses anak tidak mewarisi thread
+#   listener, jadi di anak handler diganti penulis langsung (lihat
+#   _after_fork_child).
+# - span("nama", **args) untuk mengukur blok bersarang. Kalau SUDOKU_TRACE=<path>
+#   di-set, semua span disimpan sebagai Chrome trace-event JSON saat exit
+#   (buka di chrome://tracing atau ui.perfetto.dev). Kalau tidak, span()
+#   mengembalikan objek no-op yang sama terus.
+# ==========================================
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+DEBUG, INFO, WARNING, ERROR = logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+LOG_LEVEL_ENV = "SUDOKU_LOG_LEVEL"
+LOG_FILE_ENV = "SUDOKU_LOG_FILE"
+TRACE_ENV = "SUDOKU_TRACE"
+TRACE_MAX_EVENTS = 1000000
+LOG_FORMAT = "%(asctime)s.%(msecs)03d %(levelname)-7s %(name)s: %(message)s"
+LOG_DATE_FORMAT = "%H:%M:%S"
+
+def parse_level(value, default=INFO):
+    if not value:
+        return default
+    value = value.strip().upper()
+    if value.isdigit():
+        return int(value)
+    for level, name in LEVEL_NAMES.items():
+        if name == value:
+            return level
+    return default
+
+def _output_handler():
+    path = os.environ.get(LOG_FILE_ENV)
+    handler = logging.FileHandler(path, "a", delay=True) if path else logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+    return handler
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    # Listener baru dijalankan saat record pertama, jadi import modul tidak
+    # membuat thread
+    def enqueue(self, record):
+        if _state['listener'] is None:
+            _start_listener()
+        self.queue.put_nowait(record)
+
+_state = {
+    'listener': None,
+    'trace_path': os.environ.get(TRACE_ENV) or None,
+    'dropped': 0,
+}
+_listener_lock = threading.Lock()
+_loggers = {}
+_events = []
+
+_root = logging.getLogger("sudoku")
+_root.setLevel(parse_level(os.environ.get(LOG_LEVEL_ENV)))
+_root.propagate = False
+_handler = _QueueHandler(queue.SimpleQueue())
+_root.addHandler(_handler)
+
+def _start_listener():
+    with _listener_lock:
+        if _state['listener'] is None:
+            listener = logging.handlers.QueueListener(_handler.queue, _output_handler())
+            listener.start()
+            _state['listener'] = listener
+
+def _stop_listener():
+    listener = _state['listener']
+    if listener is not None:
+        listener.stop()
+        for h in listener.handlers:
+            h.close()
+
+def _after_fork_child():
+    # Thread listener tidak ikut ke anak, dan lock/queue bisa terwarisi
+    # dalam keadaan terkunci. Lock baru, span induk dibuang, dan log anak
+    # ditulis langsung (worker pool keluar lewat os._exit, jadi antrian yang
+    # belum ditulis thread akan hilang).
+    global _listener_lock, _handler
+    _listener_lock = threading.Lock()
+    _state['listener'] = None
+    _state['dropped'] = 0
+    del _events[:]
+    _root.removeHandler(_handler)
+    _handler = _output_handler()
+    _root.addHandler(_handler)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_child)
+
+def get_logger(name):
+    log = _loggers.get(name)
+    if log is None:
+        log = _loggers[name] = _root.getChild(name)
+    return log
+
+def set_level(level):
+    _root.setLevel(parse_level(level) if isinstance(level, str) else level)
+
+# --- SPAN ---
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    __slots__ = ('name', 'args', 't0')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.t0 = 0
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        dur = time.perf_counter_ns() - self.t0
+        if len(_events) < TRACE_MAX_EVENTS:
+            _events.append((self.name, self.t0, dur, threading.get_ident(), self.args))
+        else:
+            _state['dropped'] += 1
+        return False
+
+    def set(self, **args):
+        # Tambah argumen yang baru diketahui di akhir blok (mis. hasil)
+        self.args.update(args)
+
+def span(name, **args):
+    if _state['trace_path'] is None:
+        return _NULL_SPAN
+    return Span(name, args)
+
+def tracing():
+    return _state['trace_path'] is not None
+
+def enable_tracing(path):
+    _state['trace_path'] = path
+
+def trace_events():
+    # Format Chrome trace-event: complete event ("X"), waktu dalam mikrodetik
+    pid = os.getpid()
+    out = []
+    for name, t0, dur, tid, args in list(_events):
+        ev = {'name': name, 'ph': 'X', 'ts': t0 / 1000.0, 'dur': dur / 1000.0, 'pid': pid, 'tid': tid}
+        if args:
+            ev['args'] = args
+        out.append(ev)
+    return out
+
+def write_trace(path=None):
+    path = path or _state['trace_path']
+    data = {'traceEvents': trace_events(), 'displayTimeUnit': 'ms'}
+    if _state['dropped']:
+        data['otherData'] = {'dropped_events': _state['dropped']}
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, default=str)
+    os.replace(tmp, path)
+    return path
+
+def _shutdown():
+    if _state['trace_path'] and _events:
+        try:
+            write_trace()
+            get_logger("trace").info("Trace written to %s (%d spans)", _state['trace_path'], len(_events))
+        except OSError as e:
+            get_logger("trace").error("Trace write failed: %s", e)
+    _stop_listener()
+
+atexit.register(_shutdown)
@@ -1,7 +1,6 @@
 import pygame
 import sys
 import random
-import copy
 import time
 import traceback
 import os
@@ -15,123 +14,18 @@ except:
 
 
 # --- LOGIKA CSP & SOLVER (CORE) ---
-ALL_CELLS = [(r, c) for r in range(9) for c in range(9)]
-
-def peers_of(cell):
-    r, c = cell
-    peers = set()
-    for i in range(9):
-        if i != c: peers.add((r, i))
-        if i != r: peers.add((i, c))
-    br = (r // 3) * 3
-    bc = (c // 3) * 3
-    for rr in range(br, br + 3):
-        for cc in range(bc, bc + 3):
-            if (rr, cc) != (r, c):
-                peers.add((rr, cc))
-    return peers
-
-PEERS = {cell: peers_of(cell) for cell in ALL_CELLS}
-
-def is_consistent_assignment(grid):
-    # Cek baris
-    for r in range(9):
-        seen = set()
-        for c in range(9):
-            v = grid[r][c]
-            if v != 0:
-                if v in seen: return False
-                seen.add(v)
-    # Cek kolom
-    for c in range(9):
-        seen = set()
-        for r in range(9):
-            v = grid[r][c]
-            if v != 0:
-                if v in seen: return False
-                seen.add(v)
-    # Cek blok 3x3
-    for br in range(0,9,3):
-        for bc in range(0,9,3):
-            seen = set()
-            for r in range(br, br+3):
-                for c in range(bc, bc+3):
-                    v = grid[r][c]
-                    if v != 0:
-                        if v in seen: return False
-                        seen.add(v)
-    return True
-
-def initial_domains(grid):
-    domains = {}
-    for r,c in ALL_CELLS:
-        v = grid[r][c]
-        if v != 0:
-            domains[(r,c)] = {v}
-        else:
-            domains[(r,c)] = set(range(1,10))
-    # Propagasi Awal
-    changed = True
-    while changed:
-        changed = False
-        for cell in ALL_CELLS:
-            if len(domains[cell]) == 1:
-                val = next(iter(domains[cell]))
-                for p in PEERS[cell]:
-                    if val in domains[p]:
-                        domains[p] = domains[p] - {val}
-                        changed = True
-    return domains
-
-def forward_check(domains, cell, val): # efek domino terhadap domain tetangga ketika suatu sel diisi
-    dom = copy.deepcopy(domains)
-    dom[cell] = {val}
-    stack = [cell]
-    while stack:
-        cur = stack.pop()
-        if len(dom[cur]) == 0:
-            return None
-        if len(dom[cur]) == 1:
-            v = next(iter(dom[cur]))
-            for p in PEERS[cur]:
-                if v in dom[p]:
-                    dom[p] = dom[p] - {v}
-                    if len(dom[p]) == 0:
-                        return None
-                    if len(dom[p]) == 1:
-                        stack.append(p)
-    return dom
-
-def select_unassigned_var(dom): # memilih sel dengan domain terkecil
-    unassigned = [(len(dom[cell]), cell) for cell in ALL_CELLS if len(dom[cell]) > 1]
-    if not unassigned:
-        return None
-    unassigned.sort()
-    return unassigned[0][1]
-
-def order_values(dom, var): # memilih domain mana yang harus dicoba duluan
-    vals = list(dom[var])
-    def conflicts_count(v):
-        cnt = 0
-        for p in PEERS[var]:
-            if v in dom[p]:
-                cnt += 1
-        return cnt
-    vals.sort(key=conflicts_count)
-    return vals
-
-def domains_to_grid(dom):
-    new_grid = [[0]*9 for _ in range(9)]
-    for (r,c), d in dom.items():
-        if len(d) == 1:
-            new_grid[r][c] = next(iter(d))
-    return new_grid
+# solver, generator & Board ada di sudoku_csp.py (dipakai bareng jafar.py)
+from sudoku_csp import *
+from sudoku_trace import get_logger
+
+log = get_logger("tes")
 
 # --- 2. VISUAL SOLVER ---
-def solve_grid_visual(start_grid):
-    if not is_consistent_assignment(start_grid):
+def solve_grid_visual(board):
+    if not board.is_consistent():
         yield "UNSOLVABLE"
         return
+    start_grid = board.to_grid()
 
     # 1. SETUP DOMAIN CERDAS
     dom = {}
@@ -152,8 +46,8 @@ def solve_grid_visual(start_grid):
         temp_grid = domains_to_grid(d)
         for r in range(9):
             for c in range(9):
-                if not given[r][c]: 
-                    grid[r][c] = temp_grid[r][c]
+                if not grid.is_given(r, c):
+                    grid[r, c] = temp_grid[r][c]
         
         yield "RUNNING"
 
@@ -176,65 +70,11 @@ def solve_grid_visual(start_grid):
         final_grid = domains_to_grid(final_result)
         for r in range(9):
             for c in range(9):
-                grid[r][c] = final_grid[r][c]
+                grid[r, c] = final_grid[r][c]
         yield "SOLVED"
     else:
         yield "UNSOLVABLE"
 
-# --- SOLVER CEPAT (Generate Puzzle) ---
-def count_solutions(grid, max_count=2):
-    if not is_consistent_assignment(grid):
-        return 0
-    dom = initial_domains(grid)
-    count = 0
-    def backtrack(d):
-        nonlocal count
-        if count >= max_count: return
-        var = select_unassigned_var(d)
-        if var is None:
-            count += 1
-            return
-        for val in order_values(d, var):
-            newd = forward_check(d, var, val)
-            if newd is not None:
-                backtrack(newd)
-                if count >= max_count: return
-    backtrack(dom)
-    return count
-
-def generate_solved_board():
-    grid = [[0]*9 for _ in range(9)]
-    def fill(idx=0):
-        if idx == 81: return True
-        r, c = divmod(idx, 9)
-        nums = list(range(1,10))
-        random.shuffle(nums)
-        for n in nums:
-            grid[r][c] = n
-            if is_consistent_assignment(grid):
-                if fill(idx+1): return True
-        grid[r][c] = 0
-        return False
-    fill()
-    return grid
-
-def generate_puzzle(removals=40):
-    solved = generate_solved_board()
-    puzzle = copy.deepcopy(solved)
-    positions = [(r,c) for r in range(9) for c in range(9)]
-    random.shuffle(positions)
-    removed = 0
-    for (r,c) in positions:
-        if removed >= removals: break
-        backup = puzzle[r][c]
-        puzzle[r][c] = 0
-        cnt = count_solutions(puzzle, max_count=2)
-        if cnt != 1:
-            puzzle[r][c] = backup
-        else:
-            removed += 1
-    return puzzle, solved
-
 # --- UI & PYGAME SETUP ---
 pygame.init()
 FPS = 60
@@ -297,10 +137,10 @@ else:
 
 # GLOBAL VARIABLES
 game_state = "MENU"
-puzzle = []
-solved_board = []
-grid = []
-given = []
+puzzle = None
+solved_board = None
+grid = None
+journal = MoveJournal()
 selected = (0,0)
 message = ""
 solved_by_solver = None
@@ -308,7 +148,6 @@ start_time = 0
 solver_generator = None
 
 # Score
-BASE_SCORE = 10000
 score = BASE_SCORE
 mistake_penalty_count = 0
 hint_penalty_count = 0
@@ -317,21 +156,26 @@ difficulty_name = "Medium"
 end_time = 0
 
 # --- HELPERS ---
-def start_game(removals, diff_name):
-    global puzzle, solved_board, grid, given, selected, message, start_time, game_state
+def start_game(removals, diff_name, pid=None):
+    # pid: puzzle ID (lihat make_puzzle_id); tanpa pid dibuat ID baru
+    global puzzle, solved_board, grid, journal, selected, message, start_time, game_state
     global score, mistake_penalty_count, hint_penalty_count, current_removals, difficulty_name
     global solved_by_solver, solver_generator
 
+    if pid is None:
+        pid = make_puzzle_id(diff_name)
+    _, diff_name, removals, _ = parse_puzzle_id(pid)
+    log.info("Starting game: %s (puzzle %s)", diff_name, pid)
     screen.fill(C_BG)
     load_text = FONT_TITLE.render("Generating...", True, C_GRID_THICK)
     screen.blit(load_text, ((WINDOW_W - load_text.get_width())//2, WINDOW_H//2))
     pygame.display.flip()
 
+    puzzle, solved_board, _ = puzzle_from_id(pid)
     current_removals = removals
     difficulty_name = diff_name
-    puzzle, solved_board = generate_puzzle(removals=current_removals)
-    grid = copy.deepcopy(puzzle)
-    given = [[(puzzle[r][c] != 0) for c in range(9)] for r in range(9)]
+    grid = puzzle.copy()
+    journal = MoveJournal()
     selected = (0,0)
 
     score = BASE_SCORE
@@ -353,8 +197,7 @@ def get_current_score():
     if game_state == "VISUAL_SOLVE": current_t = start_time
     
     elapsed = int(current_t - start_time)
-    final_score = BASE_SCORE - (hint_penalty_count * 1000) - (mistake_penalty_count * 500) - (elapsed * 2)
-    return max(0, final_score)
+    return compute_score(hint_penalty_count, mistake_penalty_count, elapsed)
 
 def draw_rounded_rect(surface, color, rect, radius=10):
     pygame.draw.rect(surface, color, rect, border_radius=radius)
@@ -416,9 +259,9 @@ def draw_board():
     for r in range(9):
         for c in range(9):
             x = MARGIN_LEFT + c*CELL; y = MARGIN_TOP + r*CELL
-            v = grid[r][c]
+            v = grid[r, c]
             if v != 0:
-                color = C_TEXT_GIVEN if given[r][c] else C_TEXT_USER
+                color = C_TEXT_GIVEN if grid.is_given(r, c) else C_TEXT_USER
                 surf = FONT_CELL.render(str(v), True, color)
                 text_rect = surf.get_rect(center=(x + CELL//2, y + CELL//2 + 3))
                 screen.blit(surf, text_rect)
@@ -525,7 +368,7 @@ def check_menu_click(pos):
 def check_auto_restart():
     global message
     # Cek apakah board sudah penuh dan valid
-    if is_consistent_assignment(grid) and all(grid[r][c] != 0 for r in range(9) for c in range(9)):
+    if grid.is_full() and grid.is_consistent():
         
         # 1. Gambar board terakhir agar player melihat langkah terakhirnya
         draw_board()
@@ -568,28 +411,47 @@ def provide_hint():
     global message, hint_penalty_count
     if game_state != "PLAYING": return
     sol = solved_board
-    empty_cells = [(r,c) for r in range(9) for c in range(9) if not given[r][c] and grid[r][c] == 0]
+    empty_cells = grid.empty_cells()
     if not empty_cells:
         message = "Board full."
         return
     r, c = random.choice(empty_cells)
-    grid[r][c] = sol[r][c]
+    journal.set_cell(grid, r, c, sol[r, c], 'hint')
     hint_penalty_count += 1
     message = "Hint used."
     
     # Cek jika hint menyelesaikan game
-    if all(grid[r][c] != 0 for r in range(9) for c in range(9)):
+    if grid.is_full():
           check_auto_restart()
 
 def clear_action():
     global grid, message
     if game_state != "PLAYING": return
-    for r in range(9):
-        for c in range(9):
-            if not given[r][c]:
-                grid[r][c] = 0
+    journal.clear(grid)
     message = "Board cleared."
 
+def undo_action():
+    global message, selected
+    if game_state != "PLAYING": return
+    entry = journal.undo(grid)
+    if entry is None:
+        message = "Nothing to undo."
+        return
+    selected = divmod(entry[1][0][0], 9)
+    message = f"Undo ({entry[0]})."
+
+def redo_action():
+    global message, selected
+    if game_state != "PLAYING": return
+    entry = journal.redo(grid)
+    if entry is None:
+        message = "Nothing to redo."
+        return
+    selected = divmod(entry[1][0][0], 9)
+    message = f"Redo ({entry[0]})."
+    if grid.is_full():
+        check_auto_restart()
+
 def back_action():
     global game_state
     game_state = "MENU"
@@ -616,18 +478,22 @@ def handle_keydown(event):
     global selected, mistake_penalty_count, message, game_state, end_time
     if game_state != "PLAYING": return
     sr, sc = selected
+    # Ctrl+Z = undo, Ctrl+Y / Ctrl+Shift+Z = redo
+    if event.mod & pygame.KMOD_CTRL:
+        if event.key == pygame.K_z and event.mod & pygame.KMOD_SHIFT: redo_action()
+        elif event.key == pygame.K_z: undo_action()
+        elif event.key == pygame.K_y: redo_action()
+        return
     if event.key == pygame.K_LEFT: selected = (sr, max(sc-1, 0))
     elif event.key == pygame.K_RIGHT: selected = (sr, min(sc+1, 8))
     elif event.key == pygame.K_UP: selected = (max(sr-1,0), sc)
     elif event.key == pygame.K_DOWN: selected = (min(sr+1,8), sc)
     elif event.key in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5, pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9):
-        if given[sr][sc]: return
+        if grid.is_given(sr, sc): return
         try: num = int(event.unicode)
         except: return 
-        temp_grid = copy.deepcopy(grid)
-        temp_grid[sr][sc] = num
-        if is_consistent_assignment(temp_grid):
-            grid[sr][sc] = num
+        if grid.can_place(sr, sc, num):
+            journal.set_cell(grid, sr, sc, num)
             message = ""
             # --- CEK APAKAH GAME SELESAI ---
             check_auto_restart()
@@ -636,14 +502,14 @@ def handle_keydown(event):
             message = "Wrong move!"
             flash_wrong_cell(sr, sc)
     elif event.key in (pygame.K_BACKSPACE, pygame.K_DELETE):
-        if not given[sr][sc]: grid[sr][sc] = 0
+        if not grid.is_given(sr, sc): journal.set_cell(grid, sr, sc, 0)
 
 # ==========================================
 # 4. MAIN LOOP
 # ==========================================
 def main():
     global selected, end_time, game_state, message, solved_by_solver, score
-    print("[DEBUG] Game Started.")
+    log.info("Game started.")
     
     running = True
     try:
@@ -669,7 +535,7 @@ def main():
                 except StopIteration:
                     game_state = "FINISHED"
                 except Exception as e:
-                    print(f"Error Solver: {e}")
+                    log.error("Solver error: %s", e)
                     game_state = "PLAYING"
 
             # --- EVENT HANDLING ---
@@ -714,8 +580,7 @@ def main():
             pygame.display.flip()
             
     except Exception as e:
-        print("\n[CRITICAL ERROR] Program Crashed!")
-        traceback.print_exc()
+        log.error("Program crashed!\n%s", traceback.format_exc().rstrip())
     finally:
         pygame.quit()
         sys.exit()
@@ -0,0 +1,44 @@
+# Test dijalankan dari root repo: python -m pytest -q
+# Modul di root (layout flat), jadi root dimasukkan ke sys.path.
+import copy
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_solver import load_corpus
+from sudoku_csp import solve_grid, count_solutions
+
+# Korpus yang cukup cepat untuk solver baseline (minimal17 / hardest butuh
+# puluhan detik per puzzle dengan solve_grid)
+FAST_CORPORA = ("easy", "hard")
+
+@pytest.fixture(scope="session")
+def corpus():
+    return {name: load_corpus(name) for name in FAST_CORPORA}
+
+@pytest.fixture(scope="session")
+def baseline(corpus):
+    # (nama korpus, indeks) -> solusi dari solve_grid default
+    return {(name, i): solve_grid(copy.deepcopy(g)) for name, grids in corpus.items() for i, g in enumerate(grids)}
+
+def open_up(grid, n):
+    # Kosongkan n given pertama (urutan baris): puzzle dengan banyak solusi
+    g = copy.deepcopy(grid)
+    for r in range(9):
+        for c in range(9):
+            if n and g[r][c]:
+                g[r][c] = 0
+                n -= 1
+    return g
+
+@pytest.fixture(scope="session")
+def multi(corpus):
+    # Puzzle dengan beberapa solusi + jumlah solusi baseline (max 50)
+    out = []
+    for i, g in enumerate(corpus["easy"][:6]):
+        grid = open_up(g, 8 + i)
+        out.append((grid, count_solutions(copy.deepcopy(grid), max_count=50)))
+    return out
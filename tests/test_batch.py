@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from sudoku_batch import (
+    validate_batch, verdict_counts, as_grid_array, VERDICT_OK, VERDICT_GIVENS_CHANGED, VERDICT_INVALID_UNITS,
+    VERDICT_WRONG_SOLUTION, VERDICT_BAD_VALUES, VERDICT_NEGATIVE_PENALTY,
+)
+from sudoku_csp import Board, solve_board, compute_score, BASE_SCORE
+
+@pytest.fixture
+def pair(corpus):
+    puzzle = Board.from_grid(corpus["hard"][0])
+    solution = solve_board(puzzle)
+    return (np.frombuffer(bytes(puzzle.cells), dtype=np.uint8).astype(np.int64),
+            np.frombuffer(bytes(solution.cells), dtype=np.uint8).astype(np.int64))
+
+def rows(base, n):
+    return np.tile(base, (n, 1))
+
+def test_verdicts(pair):
+    puzzle, solution = pair
+    given = int(np.flatnonzero(puzzle)[0])
+    free = int(np.flatnonzero(puzzle == 0)[0])
+    grids = rows(solution, 3)
+    grids[1, given] = grids[1, given] % 9 + 1          # given diubah
+    grids[2, free] = 0                                  # belum lengkap
+    res = validate_batch(grids, rows(puzzle, 3), rows(solution, 3), hints=1, mistakes=2, elapsed=30)
+    assert list(res['verdict']) == [VERDICT_OK, VERDICT_GIVENS_CHANGED, VERDICT_INVALID_UNITS]
+    assert res['score'][0] == compute_score(1, 2, 30)
+    assert list(res['score'][1:]) == [0, 0]
+
+def test_wrong_solution(pair):
+    puzzle, solution = pair
+    # Grid valid lain dengan given kosong: relabel angka 1 <-> 2
+    other = solution.copy()
+    other[solution == 1], other[solution == 2] = 2, 1
+    empty = np.zeros(81, dtype=np.int64)
+    res = validate_batch(other[None], empty[None], solution[None])
+    assert res['verdict'][0] == VERDICT_WRONG_SOLUTION and not res['valid'][0]
+    # Tanpa solution: grid valid yang menjaga given dianggap benar
+    assert validate_batch(other[None], empty[None])['verdict'][0] == VERDICT_OK
+
+@pytest.mark.parametrize("value", [256 + 5, -1, 10, 3.5])
+def test_out_of_range_cells(pair, value):
+    puzzle, solution = pair
+    free = int(np.flatnonzero(puzzle == 0)[0])
+    grids = rows(solution, 2).astype(np.float64 if isinstance(value, float) else np.int64)
+    grids[1, free] = value
+    res = validate_batch(grids, rows(puzzle, 2), rows(solution, 2))
+    assert list(res['verdict']) == [VERDICT_OK, VERDICT_BAD_VALUES]
+    assert res['score'][1] == 0
+    # Nilai di luar 0..9 di puzzle / solution juga ditolak per baris
+    bad_puzzle = rows(puzzle, 2)
+    bad_puzzle[0, free] = 300
+    assert list(validate_batch(rows(solution, 2), bad_puzzle)['verdict']) == [VERDICT_BAD_VALUES, VERDICT_OK]
+    with pytest.raises(ValueError):
+        as_grid_array(grids)
+
+def test_negative_penalties(pair):
+    puzzle, solution = pair
+    res = validate_batch(rows(solution, 4), rows(puzzle, 4), rows(solution, 4),
+                         hints=[0, -1, 0, 0], mistakes=[0, 0, -3, 0], elapsed=[0, 0, 0, -100])
+    assert list(res['verdict']) == [VERDICT_OK] + [VERDICT_NEGATIVE_PENALTY] * 3
+    assert list(res['score']) == [BASE_SCORE, 0, 0, 0]
+    assert res['score'].max() <= BASE_SCORE
+    assert verdict_counts(res)['negative_penalty'] == 3
+
+def test_shape_errors(pair):
+    puzzle, solution = pair
+    with pytest.raises(ValueError):
+        validate_batch(solution[None, :80], puzzle[None, :80])
+    with pytest.raises(ValueError):
+        validate_batch(rows(solution, 2), rows(puzzle, 3))
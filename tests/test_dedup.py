@@ -0,0 +1,44 @@
+# Bentuk kanonik harus sama untuk semua puzzle yang sekelas simetri
+import random
+
+from sudoku_csp import Board
+from sudoku_dedup import canonical_form, canonical_hash, DedupIndex
+
+def transform(grid, rng):
+    # Simetri Sudoku acak: relabel, tukar band/stack, baris/kolom dalam
+    # band/stack, transpose
+    labels = list(range(1, 10))
+    rng.shuffle(labels)
+    relabel = [0] + labels
+    def line_order():
+        bands = rng.sample(range(3), 3)
+        return [3 * b + i for b in bands for i in rng.sample(range(3), 3)]
+    rows, cols = line_order(), line_order()
+    out = [[relabel[grid[r][c]] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        out = [list(col) for col in zip(*out)]
+    return out
+
+def test_canonical_form_invariant(corpus):
+    rng = random.Random(3)
+    for grid in corpus["easy"][:5] + corpus["hard"][:5]:
+        form = canonical_form(Board.from_grid(grid))
+        for _ in range(4):
+            assert canonical_form(Board.from_grid(transform(grid, rng))) == form
+
+def test_canonical_form_separates_puzzles(corpus):
+    grids = corpus["easy"][:10]
+    assert len({canonical_hash(Board.from_grid(g)) for g in grids}) == len(grids)
+
+def test_index_detects_duplicates(corpus, tmp_path):
+    rng = random.Random(5)
+    grids = corpus["hard"][:8]
+    path = str(tmp_path / "bank.idx")
+    with DedupIndex(path, capacity=1000, flush_every=3) as index:
+        assert all(index.add(Board.from_grid(g)) for g in grids)
+        assert not any(index.add(Board.from_grid(transform(g, rng))) for g in grids)
+    # Setelah dibuka ulang, hash dibaca dari file
+    with DedupIndex(path, capacity=1000) as index:
+        assert len(index) == len(grids)
+        assert not index.add(Board.from_grid(transform(grids[0], rng)))
+        assert index.add(Board.from_grid(corpus["easy"][0]))
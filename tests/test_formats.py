@@ -0,0 +1,171 @@
+# Round-trip format yang disimpan / dibagikan: checkpoint enumerator,
+# jurnal langkah, snapshot game, dan puzzle ID.
+import copy
+import random
+import struct
+import zlib
+
+import pytest
+
+import sudoku_csp
+from sudoku_csp import (
+    Board, MoveJournal, SolutionEnumerator, count_solutions, solve_board,
+    pack_cells, pack_snapshot, unpack_snapshot, save_snapshot, load_snapshot,
+    PuzzleCache, make_puzzle_id, parse_puzzle_id, puzzle_from_id, count_solutions_board, PUZZLE_ID_DIFFICULTIES,
+)
+
+def test_enumerator_checkpoint_resume(corpus, tmp_path):
+    grid = copy.deepcopy(corpus["easy"][0])
+    for c in range(9):
+        grid[0][c] = grid[1][c] = 0
+    total = count_solutions(copy.deepcopy(grid), max_count=10000)
+    path = str(tmp_path / "enum.json")
+    first = SolutionEnumerator(grid)
+    it = first.solutions(path, checkpoint_every=20)
+    seen = [next(it) for _ in range(total // 2)]
+    first.save(path)
+    rest = list(SolutionEnumerator.load(path).solutions())
+    assert len(seen) + len(rest) == total
+    assert len({str(s) for s in seen + rest}) == total
+
+def test_enumerator_checkpoint_cadence(corpus, tmp_path, monkeypatch):
+    # Save otomatis tiap checkpoint_every node baru, tidak berulang di node yang sama
+    grid = copy.deepcopy(corpus["easy"][0])
+    for c in range(9):
+        grid[0][c] = grid[1][c] = 0
+    saved = []
+    monkeypatch.setattr(SolutionEnumerator, "save", lambda self, path: saved.append(self.nodes))
+    en = SolutionEnumerator(grid)
+    for _ in en.solutions(str(tmp_path / "enum.json"), checkpoint_every=50):
+        pass
+    assert saved[:-1] == [50 * (i + 1) for i in range(en.nodes // 50)]
+    assert saved[-1] == en.nodes
+
+def play(journal, board, rng, moves):
+    for _ in range(moves):
+        i = rng.randrange(81)
+        if not board.givens >> i & 1:
+            journal.set_cell(board, i // 9, i % 9, rng.randint(0, 9), rng.choice(('user', 'hint')))
+
+@pytest.fixture
+def game(corpus):
+    puzzle = Board.from_grid(corpus["easy"][0])
+    solution = solve_board(puzzle)
+    grid = puzzle.copy()
+    journal = MoveJournal()
+    rng = random.Random(7)
+    play(journal, grid, rng, 40)
+    journal.clear(grid)
+    play(journal, grid, rng, 20)
+    for _ in range(5):
+        journal.undo(grid)
+    return puzzle, solution, grid, journal
+
+def test_journal_undo_redo(game):
+    puzzle, _, grid, journal = game
+    before = grid.copy()
+    pos = journal.pos
+    while journal.can_undo():
+        journal.undo(grid)
+    assert grid == puzzle
+    while journal.can_redo():
+        journal.redo(grid)
+    for _ in range(len(journal.entries) - pos):
+        journal.undo(grid)
+    assert grid == before
+
+def test_journal_bytes_round_trip(game):
+    puzzle, _, grid, journal = game
+    copy_ = MoveJournal.from_bytes(journal.to_bytes())
+    assert copy_.entries == journal.entries and copy_.pos == journal.pos
+    assert copy_.replay(puzzle) == grid
+    assert copy_.counts() == journal.counts()
+
+def test_journal_dict_round_trip(game):
+    _, _, _, journal = game
+    copy_ = MoveJournal.from_dict(journal.to_dict())
+    assert copy_.entries == journal.entries and copy_.pos == journal.pos
+
+def test_journal_corrupt():
+    data = MoveJournal([('user', ((0, 0, 5),))]).to_bytes()
+    with pytest.raises(ValueError):
+        MoveJournal.from_bytes(data + b"\0")
+
+def test_journal_longer_than_u16():
+    board = Board()
+    journal = MoveJournal()
+    for i in range(70000):
+        journal.set_cell(board, 0, 0, i % 9 + 1)
+    journal.undo(board)
+    copy_ = MoveJournal.from_bytes(journal.to_bytes())
+    assert len(copy_.entries) == 70000 and copy_.pos == 69999
+
+def snapshot_state(game):
+    _, solution, grid, journal = game
+    return {'grid': grid, 'solution': solution, 'removals': 30, 'difficulty': 'Easy',
+            'mistakes': 3, 'hints': 1, 'elapsed': 123.5, 'journal': journal}
+
+def test_snapshot_round_trip(game, tmp_path):
+    puzzle = game[0]
+    state = snapshot_state(game)
+    path = str(tmp_path / "save.bin")
+    save_snapshot(path, pack_snapshot(state))
+    out = load_snapshot(path)
+    for key in ('grid', 'solution', 'removals', 'difficulty', 'mistakes', 'hints', 'elapsed'):
+        assert out[key] == state[key], key
+    assert out['puzzle'] == puzzle
+    assert out['journal'].entries == state['journal'].entries
+    assert out['journal'].replay(out['puzzle']) == state['grid']
+
+def test_snapshot_v1_still_loads(game):
+    # Versi 1: header jurnal pos/n u16
+    state = snapshot_state(game)
+    journal = state['journal']
+    jdata = struct.pack('<HH', journal.pos, len(journal.entries)) + journal.to_bytes()[8:]
+    name = state['difficulty'].encode()
+    data = bytearray(sudoku_csp._SNAPSHOT_HEADER.pack(sudoku_csp.SNAPSHOT_MAGIC, 1, state['removals'],
+                                                      state['mistakes'], state['hints'], state['elapsed'], len(name)))
+    data += name + pack_cells(state['grid'].cells) + pack_cells(state['solution'].cells)
+    data += state['grid'].givens.to_bytes(11, 'little') + struct.pack('<I', len(jdata)) + jdata
+    data += struct.pack('<I', zlib.crc32(data))
+    out = unpack_snapshot(bytes(data))
+    assert out['grid'] == state['grid']
+    assert out['journal'].entries == journal.entries and out['journal'].pos == journal.pos
+
+def test_snapshot_corrupt(game, tmp_path):
+    data = bytearray(pack_snapshot(snapshot_state(game)))
+    data[20] ^= 0xFF
+    with pytest.raises(ValueError):
+        unpack_snapshot(bytes(data))
+    path = tmp_path / "save.bin"
+    path.write_bytes(bytes(data))
+    assert load_snapshot(str(path)) is None
+    assert load_snapshot(str(tmp_path / "missing.bin")) is None
+
+def test_puzzle_id_round_trip():
+    for code, (name, removals) in PUZZLE_ID_DIFFICULTIES.items():
+        pid = make_puzzle_id(name, 123456789)
+        assert parse_puzzle_id(pid) == (1, name, removals, 123456789)
+        assert make_puzzle_id(code, 0) == f"1{code}0"
+    for bad in ("", "1X12", "1H", "1H!!", "?H12"):
+        with pytest.raises(ValueError):
+            parse_puzzle_id(bad)
+
+def test_puzzle_from_id_is_reproducible():
+    for name in ("Easy", "Hard"):
+        pid = make_puzzle_id(name, 987654321)
+        a_puzzle, a_solution, stats = puzzle_from_id(pid, PuzzleCache())
+        b_puzzle, b_solution, _ = puzzle_from_id(pid, PuzzleCache())
+        assert a_puzzle == b_puzzle and a_solution == b_solution
+        assert count_solutions_board(a_puzzle) == 1
+        assert solve_board(a_puzzle) == a_solution
+        assert stats['clues'] == sum(1 for v in a_puzzle.cells if v)
+
+def test_puzzle_cache_returns_copies():
+    cache = PuzzleCache()
+    pid = make_puzzle_id("Easy", 42)
+    puzzle, _, _ = cache.get(pid)
+    puzzle.cells[:] = bytes(81)
+    again, _, _ = cache.get(pid)
+    assert any(again.cells)
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,51 @@
+# Generator puzzle: batas waktu / restart di generate_board dan puzzle minimal.
+import random
+import time
+
+import pytest
+
+from sudoku_csp import generate_board, count_solutions_board, generate_minimal_puzzle, count_solutions
+
+STATS_KEYS = {'target_removals', 'removed', 'clues', 'attempts', 'elapsed', 'timed_out',
+              'fill_time', 'removal_time'}
+
+def check_unique(puzzle, solution):
+    assert count_solutions_board(puzzle, 2) == 1
+    assert all(v == 0 or v == s for v, s in zip(puzzle.cells, solution.cells))
+    assert 0 not in solution.cells
+
+def test_generate_board_reaches_target():
+    puzzle, solution, stats = generate_board(40, deadline=10.0, rng=random.Random(1))
+    assert set(stats) == STATS_KEYS
+    assert stats['removed'] == 40 and stats['clues'] == 41
+    assert not stats['timed_out']
+    assert bytes(puzzle.cells).count(0) == 40
+    check_unique(puzzle, solution)
+
+def test_generate_board_deadline_restarts():
+    # 17 clue praktis tidak tercapai: generator harus restart (urutan hapus /
+    # board baru) sampai deadline habis, lalu kembalikan hasil terbaik
+    deadline = 0.5
+    t0 = time.time()
+    puzzle, solution, stats = generate_board(64, deadline=deadline, rng=random.Random(2), stall_limit=5)
+    assert time.time() - t0 < deadline + 0.5
+    assert set(stats) == STATS_KEYS
+    assert stats['attempts'] > 1
+    assert stats['timed_out']
+    assert stats['removed'] < 64 and stats['clues'] == 81 - stats['removed']
+    assert bytes(puzzle.cells).count(0) == stats['removed']
+    assert stats['fill_time'] + stats['removal_time'] == pytest.approx(stats['elapsed'])
+    check_unique(puzzle, solution)
+
+def test_minimal_puzzle_is_minimal():
+    # Unik, dan setiap clue yang tersisa wajib: menghapus satu saja membuat
+    # solusinya tidak unik lagi. workers=2 ikut menguji jalur pool paralel.
+    puzzle, solved, stats = generate_minimal_puzzle(workers=2, rng=random.Random(5))
+    assert count_solutions(puzzle) == 1
+    assert all(v == 0 or v == s for row, srow in zip(puzzle, solved) for v, s in zip(row, srow))
+    clues = [(r, c) for r in range(9) for c in range(9) if puzzle[r][c]]
+    assert stats['clues'] == len(clues)
+    for r, c in clues:
+        test = [row[:] for row in puzzle]
+        test[r][c] = 0
+        assert count_solutions(test, max_count=2) != 1, (r, c)
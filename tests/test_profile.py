@@ -0,0 +1,13 @@
+import logging
+
+from sudoku_profile import profiler_from_env
+
+def test_unknown_profile_mode_is_ignored(caplog):
+    with caplog.at_level(logging.WARNING, logger="sudoku.profile"):
+        assert profiler_from_env(["jafar.py", "--profile=bogus"], {}) is None
+        assert profiler_from_env(["jafar.py"], {"SUDOKU_PROFILE": "nope"}) is None
+    assert [r.levelno for r in caplog.records] == [logging.WARNING, logging.WARNING]
+    assert "bogus" in caplog.records[0].getMessage()
+
+def test_profiling_off_by_default():
+    assert profiler_from_env(["jafar.py"], {}) is None
@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+import sudoku_server
+from sudoku_csp import Board, solve_board
+from sudoku_server import run_batch
+
+@pytest.fixture
+def pair(corpus):
+    puzzle = Board.from_grid(corpus["hard"][0])
+    return puzzle.to_string(), solve_board(puzzle).to_string()
+
+def test_server_batch_isolates_failures(pair, monkeypatch):
+    text, sol_text = pair
+    def boom(params, deadline):
+        raise RuntimeError("boom")
+    monkeypatch.setitem(sudoku_server.OPS, 'boom', boom)
+    out = run_batch([
+        ('solve', {'puzzle': text}, None),
+        ('boom', {}, None),
+        ('count', {'puzzle': '0' * 81, 'max_count': 1000}, time.time() + 0.002),
+        ('solve', {'puzzle': 'x'}, None),
+        ('validate', {'grid': sol_text, 'puzzle': text, 'hints': -1}, None),
+        ('solve', {'puzzle': text}, time.time() - 1),
+        ('solve', {'puzzle': '55' + '0' * 79}, None),
+        ('count', {'puzzle': '55' + '0' * 79}, time.time() + 60),
+    ])
+    assert out[0] == {'ok': True, 'solution': sol_text, 'nodes': out[0]['nodes']}
+    assert out[1]['error'] == 'internal'
+    assert out[2]['error'] == 'deadline_exceeded'
+    assert out[3]['error'] == 'bad_request'
+    assert out[4]['ok'] and out[4]['verdict'] == 'negative_penalty' and out[4]['score'] == 0
+    assert out[5]['error'] == 'deadline_exceeded'
+    assert out[6] == {'ok': True, 'solution': None, 'nodes': 0}
+    assert out[7] == {'ok': True, 'count': 0}
+
+def test_generate_difficulty_and_id():
+    out = run_batch([
+        ('generate', {'difficulty': 'Easy'}, None),
+        ('generate', {'difficulty': 'Hard', 'seed': 5}, None),
+        ('generate', {'difficulty': 'Impossible'}, None),
+    ])
+    assert out[0]['ok'] and out[0]['clues'] == 81 - 30
+    assert out[1]['ok'] and out[1]['puzzle_id'] == '1H5'
+    assert out[2]['error'] == 'bad_request'
@@ -0,0 +1,32 @@
+from multiprocessing import shared_memory
+
+import pytest
+
+from sudoku_csp import Board, solve_board
+from sudoku_shm import ShmBatchSolver, SHM_SOLVED, SHM_UNSOLVABLE
+
+def assert_unlinked(name):
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+def test_shm_batch_round_trip(corpus):
+    boards = [Board.from_grid(g) for g in corpus["hard"][:4]]
+    boards.insert(2, Board.from_string('55' + '0' * 79))
+    expected = [solve_board(b) for b in boards]
+    with ShmBatchSolver(workers=2) as solver:
+        solutions, status = solver.solve(boards, chunk=2)
+        first = solver.shm.name
+        assert solutions == expected
+        assert solutions[2] is None
+        assert list(status) == [SHM_SOLVED, SHM_SOLVED, SHM_UNSOLVABLE, SHM_SOLVED, SHM_SOLVED]
+        assert all(s.givens == b.givens for s, b in zip(solutions, boards) if s is not None)
+        # Batch lebih besar: buffer dibuat ulang dan yang lama di-unlink
+        more = boards + [Board.from_grid(g) for g in corpus["easy"][:6]]
+        solutions, status = solver.solve(more)
+        assert solutions[:5] == expected
+        assert all(s is not None for s in solutions[5:])
+        assert solver.shm.name != first
+        assert_unlinked(first)
+        last = solver.shm.name
+    assert solver.shm is None
+    assert_unlinked(last)
@@ -0,0 +1,138 @@
+# Setiap mode solver harus memberi solusi / jumlah solusi yang sama dengan
+# solver baseline (solve_grid / count_solutions default).
+import copy
+import random
+import time
+
+import pytest
+
+from bench_solver import load_corpus
+import sudoku_csp
+from sudoku_csp import (
+    TranspositionTable, make_strategy, is_consistent_assignment,
+    solve_grid, count_solutions, solve_grid_portfolio, count_solutions_parallel, PORTFOLIO_WINS,
+    solve_grid_n, count_solutions_n, generate_puzzle_n, generate_solved_board_n, Board, solve_board, count_solutions_board,
+)
+
+def solve_board_grid(g):
+    sol = solve_board(Board.from_grid(g))
+    return sol.to_grid() if sol is not None else None
+
+SOLVE_MODES = {
+    'backjump': lambda g: solve_grid(g, backjump=True),
+    'alldiff-check': lambda g: solve_grid(g, alldiff='check'),
+    'alldiff-gac': lambda g: solve_grid(g, alldiff='gac'),
+    'mrv-degree+lcv': lambda g: solve_grid(g, strategy=make_strategy('mrv-degree+lcv')),
+    'domwdeg+lcv': lambda g: solve_grid(g, strategy=make_strategy('domwdeg+lcv')),
+    'domwdeg+asc': lambda g: solve_grid(g, strategy=make_strategy('domwdeg+asc')),
+    'bitmask': lambda g: solve_grid_n(g),
+    'board': solve_board_grid,
+}
+
+COUNT_MODES = {
+    'tt': lambda g, k: count_solutions(g, k, tt=TranspositionTable()),
+    'alldiff-gac': lambda g, k: count_solutions(g, k, alldiff='gac'),
+    'mrv-degree+lcv': lambda g, k: count_solutions(g, k, strategy=make_strategy('mrv-degree+lcv')),
+    'domwdeg+asc': lambda g, k: count_solutions(g, k, strategy=make_strategy('domwdeg+asc')),
+    'bitmask': lambda g, k: count_solutions_n(g, 3, k),
+    'board': lambda g, k: count_solutions_board(Board.from_grid(g), k),
+}
+
+def unsolvable_grid():
+    g = [[0] * 9 for _ in range(9)]
+    g[0][0] = g[0][1] = 5
+    return g
+
+@pytest.mark.parametrize("mode", sorted(SOLVE_MODES))
+def test_solve_modes_match_baseline(mode, corpus, baseline):
+    solve = SOLVE_MODES[mode]
+    for name, grids in corpus.items():
+        for i, g in enumerate(grids):
+            assert solve(copy.deepcopy(g)) == baseline[(name, i)], f"{mode} differs on {name}[{i}]"
+
+@pytest.mark.parametrize("mode", sorted(COUNT_MODES))
+def test_count_modes_match_baseline(mode, corpus, multi):
+    count = COUNT_MODES[mode]
+    for g in corpus["hard"][:10]:
+        assert count(copy.deepcopy(g), 2) == 1
+    for grid, expected in multi:
+        assert count(copy.deepcopy(grid), 50) == expected
+        assert count(copy.deepcopy(grid), 2) == min(expected, 2)
+
+def test_unsolvable_solve():
+    for mode, solve in SOLVE_MODES.items():
+        assert solve(unsolvable_grid()) is None, mode
+
+def test_unsolvable_count():
+    for mode, count in COUNT_MODES.items():
+        assert count(unsolvable_grid(), 2) == 0, mode
+
+def test_parallel_count_matches_baseline(multi):
+    for grid, expected in multi[-2:]:
+        assert count_solutions_parallel(copy.deepcopy(grid), max_count=50, workers=2) == expected
+
+def test_portfolio_matches_baseline(corpus, baseline):
+    for i, g in enumerate(corpus["hard"][:3]):
+        assert solve_grid_portfolio(copy.deepcopy(g), workers=2) == baseline[("hard", i)]
+
+def test_portfolio_reuses_pool_and_counts_only_solves(corpus):
+    # Pool yang sama dipakai di solve berikutnya; puzzle tanpa solusi tidak
+    # menambah PORTFOLIO_WINS
+    solve_grid_portfolio(copy.deepcopy(corpus["hard"][0]), workers=2)
+    pool = sudoku_csp._portfolio_pool
+    wins = sum(PORTFOLIO_WINS.values())
+    stats = {}
+    assert solve_grid_portfolio(unsolvable_grid(), workers=2, stats=stats) is None
+    assert stats['winner'] is not None
+    assert sum(PORTFOLIO_WINS.values()) == wins
+    assert solve_grid_portfolio(copy.deepcopy(corpus["hard"][1]), workers=2) is not None
+    assert sum(PORTFOLIO_WINS.values()) == wins + 1
+    assert sudoku_csp._portfolio_pool is pool
+
+@pytest.mark.parametrize("name", ["minimal17", "hardest"])
+def test_bitmask_solver_on_hard_corpora(name):
+    # Baseline terlalu lambat di sini: cukup cek solusinya valid dan unik
+    for g in load_corpus(name):
+        sol = solve_grid_n(g)
+        assert sol is not None and all(all(row) for row in sol)
+        assert is_consistent_assignment(sol)
+        assert all(v == 0 or v == s for row, srow in zip(g, sol) for v, s in zip(row, srow))
+        assert count_solutions_n(g, 3, 2) == 1
+        assert solve_board_grid(g) == sol
+
+def test_bitmask_nxn():
+    # Papan 4x4 kosong punya tepat 288 solusi
+    empty = [[0] * 4 for _ in range(4)]
+    assert count_solutions_n(empty, 2, max_count=1000) == 288
+    for box in (2, 4):
+        puzzle, solved, stats = generate_puzzle_n(box)
+        assert count_solutions_n(puzzle, box, 2) == 1
+        assert solve_grid_n(puzzle, box) == solved
+
+def test_solved_board_n_not_one_pattern():
+    # Pola dasar yang diacak selalu punya tepat 3 himpunan mini-baris per band;
+    # pengisian dengan pencarian harus bisa keluar dari kelas itu
+    def minirow_sets(g):
+        return len({frozenset(g[r][c:c + 3]) for r in range(3) for c in (0, 3, 6)})
+    boards = [generate_solved_board_n(3, random.Random(seed)) for seed in range(10)]
+    assert all(is_consistent_assignment(g) and all(all(row) for row in g) for g in boards)
+    assert any(minirow_sets(g) > 3 for g in boards)
+
+def test_deadline_stops_search():
+    stats = {}
+    empty = Board()
+    assert count_solutions_board(empty, 1000, deadline=time.time() - 1, stats=stats) < 1000
+    assert stats['limit_hit']
+    assert solve_board(empty, stats, deadline=time.time() + 60) is not None
+    assert not stats['limit_hit']
+
+def test_solve_board_stats_on_early_return(corpus):
+    # 7 di (0,5) sah terhadap peer tapi salah: propagasi awal sudah buntu,
+    # jadi solve_board keluar sebelum pencarian dan stats tetap harus diisi
+    wrong = Board.from_grid(corpus["easy"][0])
+    wrong[0, 5] = 7
+    assert wrong.is_consistent()
+    for board in (wrong, Board.from_string('55' + '0' * 79)):
+        stats = {}
+        assert solve_board(board, stats) is None
+        assert stats == {'nodes': 0, 'limit_hit': False}
@@ -0,0 +1,112 @@
+# Varian lewat ConstraintGraph (diagonal, jigsaw, killer) dibandingkan
+# dengan pencarian brute force sederhana yang langsung memakai unit / cage.
+import random
+
+import pytest
+
+from sudoku_csp import (
+    ConstraintGraph, diagonal_graph, jigsaw_graph, killer_graph, fill_board_n, flat_cells,
+    solve_grid_n, count_solutions_n, generate_puzzle_n,
+)
+
+JIGSAW = """
+AAABBBCCC
+AAABBBCCC
+AADBBECCC
+ADDBEEFFF
+DDDEEEFFF
+DDDEEEFFF
+GGGHHHIII
+GGGHHHIII
+GGGHHHIII
+"""
+
+def reference_count(cells, t, limit):
+    # Backtracking tanpa propagasi: kandidat = angka yang belum ada di unit
+    # sel, cage dicek jumlah parsial dan angka berbeda
+    cells = list(cells)
+    n = t.n
+    cell_units = [[u for u in t.units if i in u] for i in range(t.size)]
+    cell_cages = [[cg for cg in t.cages if i in cg[0]] for i in range(t.size)]
+
+    def ok(i, v):
+        if any(cells[j] == v for u in cell_units[i] for j in u):
+            return False
+        for idx, total in cell_cages[i]:
+            vals = [cells[j] for j in idx if cells[j]] + [v]
+            if len(set(vals)) != len(vals) or sum(vals) > total:
+                return False
+            if len(vals) == len(idx) and sum(vals) != total:
+                return False
+        return True
+
+    def search(limit):
+        best, cands = None, None
+        for i in range(t.size):
+            if cells[i] == 0:
+                c = [v for v in range(1, n + 1) if ok(i, v)]
+                if best is None or len(c) < len(cands):
+                    best, cands = i, c
+                    if len(c) <= 1:
+                        break
+        if best is None:
+            return 1
+        found = 0
+        for v in cands:
+            cells[best] = v
+            found += search(limit - found)
+            cells[best] = 0
+            if found >= limit:
+                break
+        return found
+    return search(limit)
+
+def satisfies(solution, t):
+    cells = flat_cells(solution)
+    return (0 not in cells and all(len({cells[i] for i in u}) == t.n for u in t.units)
+            and all(len({cells[i] for i in idx}) == len(idx) and sum(cells[i] for i in idx) == total
+                    for idx, total in t.cages))
+
+def killer_from(solved):
+    # Cage dua sel mendatar di setiap baris (kolom 0-1, 3-4, 6-7)
+    cages = [(solved[r][c] + solved[r][c + 1], [(r, c), (r, c + 1)]) for r in range(9) for c in (0, 3, 6)]
+    return killer_graph(cages)
+
+def blank(solved, rng, k):
+    puzzle = [row[:] for row in solved]
+    for i in rng.sample(range(81), k):
+        puzzle[i // 9][i % 9] = 0
+    return puzzle
+
+def variant_graphs():
+    rng = random.Random(11)
+    diag = diagonal_graph()
+    jig = jigsaw_graph(JIGSAW)
+    killer_solved = fill_board_n(3, rng)
+    return {
+        'diagonal': (diag, fill_board_n(diag, rng)),
+        'jigsaw': (jig, fill_board_n(jig, rng)),
+        'killer': (killer_from(killer_solved), killer_solved),
+    }
+
+@pytest.mark.parametrize("variant", ["diagonal", "jigsaw", "killer"])
+def test_variant_count_matches_reference(variant):
+    t, solved = variant_graphs()[variant]
+    assert isinstance(t, ConstraintGraph) and not t.standard
+    assert satisfies(solved, t)
+    rng = random.Random(variant)
+    for k in (30, 45, 55):
+        puzzle = blank(solved, rng, k)
+        expected = reference_count(flat_cells(puzzle), t, 20)
+        assert count_solutions_n(puzzle, t, 20) == expected
+        sol = solve_grid_n(puzzle, t)
+        assert sol is not None and satisfies(sol, t)
+        assert all(v == 0 or v == s for row, srow in zip(puzzle, sol) for v, s in zip(row, srow))
+
+@pytest.mark.parametrize("variant", ["diagonal", "jigsaw"])
+def test_variant_generated_puzzle_is_unique(variant):
+    t, _ = variant_graphs()[variant]
+    puzzle, solved, stats = generate_puzzle_n(t, removals=45, rng=random.Random(3))
+    assert satisfies(solved, t)
+    assert count_solutions_n(puzzle, t, 2) == 1
+    assert solve_grid_n(puzzle, t) == solved